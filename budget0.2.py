@@ -1,29 +1,55 @@
 # --- IMPORTY STANDARDOWE I ZEWNĘTRZNE ---
 import tkinter as tk  # główna biblioteka GUI
-from tkinter import ttk, messagebox  # widżety ttk i okna dialogowe
-import csv  # obsługa plików CSV
+from tkinter import ttk, messagebox, filedialog  # widżety ttk, okna dialogowe, wybór pliku
+import calendar  # długość miesiąca (znaczniki kalendarza)
+import csv  # błędy parsera CSV przy imporcie
 import os  # operacje na plikach/ścieżkach
-from datetime import datetime, timedelta  # daty i operacje na nich
-from tkcalendar import DateEntry, Calendar  # kalendarze/wybór daty
-
-import matplotlib  # biblioteka wykresów
-matplotlib.use("TkAgg")  # backend Tkinter dla matplotlib
-import matplotlib.pyplot as plt  # API pyplot
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # osadzanie wykresów w Tk
-
-from cryptography.fernet import Fernet  # szyfrowanie/odszyfrowywanie plików
-
+from datetime import date, datetime  # daty i operacje na nich
 import hashlib  # haszowanie haseł
+import importlib  # wczytywanie ciężkich modułów w tle
 import json     # pliki JSON (użytkownicy, cykliczne)
+import threading  # wątek wstępnego wczytania modułów
 import uuid     # generowanie unikalnych ID dla cyklicznych
 
+# Ciężkie zależności (tkcalendar, cryptography, matplotlib) są importowane dopiero w funkcjach,
+# które ich używają – okno logowania nie czeka na ich wczytanie.
+
+from budget_store import (date_to_ordinal, to_grosze, from_grosze,  # konwersje magazynu transakcji
+                          PERIOD_WEEK, PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR, PERIOD_ALL, PERIODS)  # okresy budżetów
+from budget_recurring import (SCHEDULE_INTERVAL, SCHEDULE_MONTHLY_DAY, SCHEDULE_LAST_BUSINESS_DAY,  # harmonogramy
+                              SCHEDULE_WEEKLY, SCHEDULES, schedule_of, describe, normalize)  # cyklicznych
+from budget_engine import BudgetEngine, load_key, BACKEND_MEMORY, BACKEND_SQLITE  # dane bez GUI (wspólne z budget_cli)
+from budget_import import import_file            # import wyciągów bankowych CSV
+from budget_planning import (PLANNING_PERIODS, planning_report, lifetime_rows, format_report,  # raport budżetów
+                             period_label, previous_period, next_period)  # nawigacja po okresach
+from budget_diagnostics import DIAGNOSTICS, DIAGNOSTICS_LOG, timed  # pomiary ścieżek krytycznych (domyślnie wyłączone)
+
 # --- STAŁE / ŚCIEŻKI PLIKÓW ---
-USER_FILE = "users.json"                               # plik z użytkownikami i hashami
-TRANSACTIONS_FILE_ENCRYPTED = "transactions_encrypted.bin"  # zaszyfrowane transakcje
-TRANSACTIONS_FILE_DECRYPTED = "transactions_temp.csv"       # tymczasowy CSV po odszyfrowaniu
-BUDGETS_FILE = "budgets.csv"                          # budżety (CSV)
-RECURRING_FILE = "recurring.json"                     # transakcje cykliczne (JSON)
-KEY_FILE = "secret.key"                               # klucz do Fernet
+USER_FILE = "users.json"                               # plik z użytkownikami i hashami (pliki danych: budget_engine)
+
+BUDGET_PERIOD_LABELS = {                              # okres budżetu -> etykieta w GUI
+    PERIOD_WEEK: "tydzień", PERIOD_MONTH: "miesiąc", PERIOD_QUARTER: "kwartał", PERIOD_YEAR: "rok", PERIOD_ALL: "całość"
+}
+PRELOAD_MODULES = ("budget_charts",)                  # wczytywane w tle po starcie (matplotlib dla 'Analiz')
+RECURRING_CHECK_MAX_MS = 60 * 60 * 1000              # najdłuższy sen harmonogramu (zmiana zegara, uśpienie)
+CHART_DEBOUNCE_MS = 150                               # seria zmian -> jedno rysowanie wykresów
+SEARCH_DEBOUNCE_MS = 120                              # pisanie w polu wyszukiwania -> jedno zapytanie
+CHART_POLL_MS = 30                                    # jak często sprawdzamy, czy wątek skończył rysować
+CHART_DEFAULT_SIZES = {"line": (600, 250), "pie": (300, 250), "bar": (300, 250), "balance": (600, 250)}  # przed ułożeniem
+BACKEND_LABELS = {                                    # magazyn transakcji -> etykieta w GUI
+    BACKEND_MEMORY: "pamięć (zaszyfrowany plik + dziennik)",
+    BACKEND_SQLITE: "SQLite (jawna baza na dysku w trakcie sesji, zapieczętowana po zamknięciu)"
+}
+SQLITE_PLAINTEXT_NOTE = ("SQLite nie trzyma całej historii w RAM, ale w trakcie sesji baza leży na dysku bez szyfrowania "
+                         "(pieczętowana przy zamknięciu; po awarii – przy następnym logowaniu).")  # ostrzeżenie w Ustawieniach
+CALENDAR_SPEND_COLORS = ("#fde0dd", "#fa9fb5", "#c51b8a")  # tło dni z wydatkami: mało -> najwięcej w miesiącu
+CALENDAR_ACTIVITY_COLOR = "#d9f0d3"                   # tło dni z transakcjami bez wydatków (np. same przychody)
+SCHEDULE_LABELS = {                                   # harmonogram cyklicznej -> etykieta w GUI
+    SCHEDULE_INTERVAL: "co N dni",
+    SCHEDULE_MONTHLY_DAY: "co miesiąc (dzień daty startu)",
+    SCHEDULE_LAST_BUSINESS_DAY: "ost. dzień roboczy miesiąca",
+    SCHEDULE_WEEKLY: "co tydzień (dzień tyg. daty startu)"
+}
 
 # --- FUNKCJE NARZĘDZIOWE: UŻYTKOWNICY I HASŁA ---
 def load_users():
@@ -42,42 +68,119 @@ def hash_password(password: str) -> str:
     """Zwraca SHA256 hasła (hex)."""
     return hashlib.sha256(password.encode('utf-8')).hexdigest()  # oblicz hash
 
-# --- FUNKCJE NARZĘDZIOWE: KLUCZ I SZYFROWANIE ---
-def generate_key():
-    """Generuje klucz Fernet i zapisuje do KEY_FILE; zwraca bytes."""
-    key = Fernet.generate_key()              # wygeneruj losowy klucz
-    with open(KEY_FILE, 'wb') as f:          # zapisz do pliku binarnie
-        f.write(key)                         # zapisz klucz
-    return key                               # zwróć klucz
-
-def load_key() -> bytes:
-    """Wczytuje klucz z KEY_FILE; jeśli brak, tworzy nowy."""
-    if not os.path.exists(KEY_FILE):   # jeśli brak klucza
-        return generate_key()          # wygeneruj nowy
-    with open(KEY_FILE, 'rb') as f:    # wczytaj klucz
-        return f.read()                # zwróć bytes
-
-def encrypt_csv(plaintext_csv_path, encrypted_path, key):
-    """Szyfruje CSV (bytes) do pliku binarnego Fernet."""
-    fernet = Fernet(key)                                    # obiekt Fernet
-    if not os.path.exists(plaintext_csv_path):              # jeśli nie ma CSV
-        return                                              # nie rób nic
-    with open(plaintext_csv_path, 'rb') as file:            # czytaj CSV binarnie
-        data = file.read()                                  # wczytaj treść
-    encrypted_data = fernet.encrypt(data)                   # zaszyfruj
-    with open(encrypted_path, 'wb') as file:                # zapisz binarnie
-        file.write(encrypted_data)                          # zapisz szyfrogram
-
-def decrypt_csv(encrypted_path, plaintext_csv_path, key):
-    """Odszyfrowuje plik binarny Fernet do CSV."""
-    if not os.path.exists(encrypted_path):          # jeśli nie ma szyfrogramu
-        return                                      # pomiń
-    fernet = Fernet(key)                            # obiekt Fernet
-    with open(encrypted_path, 'rb') as file:        # czytaj szyfrogram
-        encrypted_data = file.read()                # wczytaj bytes
-    data = fernet.decrypt(encrypted_data)           # odszyfruj do bytes
-    with open(plaintext_csv_path, 'wb') as file:    # zapisz CSV binarnie
-        file.write(data)                            # zapisz jawny CSV
+# --- WIDŻET: WIRTUALNA TABELA ---
+class VirtualTreeview:
+    """
+    Treeview, który trzyma tylko tyle elementów, ile wierszy mieści się w oknie.
+    Dane to lista kluczy (np. indeksów magazynu); suwak wskazuje przesunięcie w tej liście,
+    a przy przewijaniu istniejące elementy dostają nowe wartości zamiast insert/delete.
+    """
+    DEFAULT_ROW_HEIGHT = 20    # wysokość wiersza przed pierwszym narysowaniem
+
+    def __init__(self, master, columns, row_values):
+        self.tree = ttk.Treeview(master, columns=columns, show="headings", selectmode="browse")  # tabela
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self._on_scrollbar)   # własny suwak
+        self._row_values = row_values    # klucz -> krotka wartości kolumn
+        self._rows = []                  # klucze aktualnego wyniku (np. po filtrze)
+        self._offset = 0                 # pozycja pierwszego widocznego wiersza
+        self._visible = 1                # ile wierszy mieści się w oknie
+        self._items = []                 # pula elementów Treeview (długość = _visible)
+        self._selected = None            # klucz zaznaczonego wiersza (przeżywa przewijanie)
+
+        self.tree.bind("<Configure>", self._on_resize)                        # zmiana rozmiaru
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)                 # zapamiętaj zaznaczenie
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))  # kółko (Win/mac)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))               # kółko w górę (X11)
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))                # kółko w dół (X11)
+        self.tree.bind("<Up>", lambda e: self._step(-1))                      # strzałki
+        self.tree.bind("<Down>", lambda e: self._step(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self._visible))      # PgUp / PgDn
+        self.tree.bind("<Next>", lambda e: self.scroll(self._visible))
+
+    def set_rows(self, rows, keep_offset=False):
+        """Podmienia wynik (lista kluczy); koszt zależy od liczby widocznych wierszy, nie od len(rows)."""
+        self._rows = rows                                  # nowe klucze
+        if not keep_offset:
+            self._offset = 0                               # od początku
+            self._selected = None                          # nowy wynik -> bez zaznaczenia
+        self._render()                                     # przerysuj okno
+
+    def selected(self):
+        """Zwraca klucz zaznaczonego (i widocznego) wiersza albo None."""
+        return self._selected if self.tree.selection() else None
+
+    def scroll(self, delta):
+        """Przesuwa okno o delta wierszy."""
+        self._offset += delta                              # nowe przesunięcie
+        self._render()                                     # przerysuj
+        return "break"                                     # bez domyślnej obsługi Tk
+
+    def _max_offset(self):
+        return max(0, len(self._rows) - self._visible)     # ostatnie pełne okno
+
+    def _render(self):
+        """Dopasowuje pulę elementów do okna i wpisuje wartości widocznych wierszy."""
+        self._offset = min(max(0, self._offset), self._max_offset())  # przytnij przesunięcie
+        count = min(self._visible, len(self._rows) - self._offset)     # ile wierszy do pokazania
+        while len(self._items) < count:                                # za mało elementów?
+            self._items.append(self.tree.insert("", "end"))            # dołóż
+        while len(self._items) > count:                                # za dużo?
+            self.tree.delete(self._items.pop())                        # usuń nadmiar
+        chosen = ()                                                    # element do zaznaczenia
+        for item, key in zip(self._items, self._rows[self._offset:self._offset + count]):
+            self.tree.item(item, values=self._row_values(key))         # nowe wartości
+            if key == self._selected:
+                chosen = (item,)                                       # zaznaczony wiersz widoczny
+        if self.tree.selection() != chosen:
+            self.tree.selection_set(chosen)                            # odtwórz zaznaczenie
+        total = len(self._rows)                                        # długość wyniku
+        if total:
+            self.scrollbar.set(self._offset / total, (self._offset + count) / total)  # pozycja suwaka
+        else:
+            self.scrollbar.set(0.0, 1.0)                               # pusty wynik: pełny suwak
+
+    def _on_scrollbar(self, *args):
+        """Obsługuje suwak: 'moveto ułamek' albo 'scroll n units|pages'."""
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * len(self._rows))       # ułamek -> przesunięcie
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._visible if args[2] == "pages" else 1)  # wiersze albo strony
+            self._offset += step
+        self._render()                                                 # przerysuj
+
+    def _on_resize(self, event):
+        """Przelicza liczbę widocznych wierszy po zmianie wysokości tabeli."""
+        bbox = self.tree.bbox(self._items[0]) if self._items else ""   # rzeczywisty wiersz (jeśli jest)
+        top, height = (bbox[1], bbox[3]) if bbox else (self.DEFAULT_ROW_HEIGHT + 4, self.DEFAULT_ROW_HEIGHT)
+        visible = max(1, (event.height - top) // height)               # pełne wiersze
+        if visible != self._visible:
+            self._visible = visible                                    # nowy rozmiar okna
+            self._render()                                             # przerysuj
+
+    def _on_select(self, event):
+        """Zapamiętuje klucz zaznaczonego wiersza (elementy są wielokrotnie używane)."""
+        selection = self.tree.selection()                              # zaznaczone elementy
+        if selection and selection[0] in self._items:
+            pos = self._offset + self._items.index(selection[0])       # pozycja w wyniku
+            self._selected = self._rows[pos]                           # klucz wiersza
+
+    def _step(self, delta):
+        """Strzałki: przesuwa zaznaczenie, przewijając okno na jego krawędzi."""
+        if not self._rows:
+            return "break"
+        try:
+            pos = self._rows.index(self._selected) + delta             # następna pozycja
+        except ValueError:
+            pos = self._offset                                         # brak zaznaczenia -> pierwszy widoczny
+        pos = min(max(0, pos), len(self._rows) - 1)                    # w granicach
+        self._selected = self._rows[pos]                               # nowe zaznaczenie
+        if pos < self._offset:
+            self._offset = pos                                         # przewiń w górę
+        elif pos >= self._offset + self._visible:
+            self._offset = pos - self._visible + 1                     # przewiń w dół
+        self._render()                                                 # przerysuj
+        self.tree.event_generate("<<TreeviewSelect>>")                 # jak zwykła zmiana zaznaczenia
+        return "break"
 
 # --- LOGIN: OSOBNE OKNO ROOT PRZED STARTEM APLIKACJI ---
 def run_login_dialog(users_dict):
@@ -172,49 +275,59 @@ class BudgetApp(tk.Tk):
         self.current_user = None                        # aktualny użytkownik (ustawiony po logowaniu)
         self.users = load_users()                       # słownik użytkowników
         self.global_key = load_key()                    # klucz Fernet
+        self.chart_renderer = None                      # wątek rysujący + pamięć bitmap (przy pierwszych 'Analizach')
 
         # UWAGA: nie tworzymy UI tutaj — zrobimy to dopiero w init_main_app()  # komentarz
 
     # --- START APLIKACJI PO ZALOGOWANIU ---
     def init_main_app(self):
-        """Inicjuje wszystkie zakładki i dane po zalogowaniu."""
-        decrypt_csv(TRANSACTIONS_FILE_ENCRYPTED, TRANSACTIONS_FILE_DECRYPTED, self.global_key)  # odszyfruj CSV
-
-        self.transactions = []          # lista transakcji
-        self.load_transactions()        # wczytaj transakcje z CSV
+        """Wczytuje dane po zalogowaniu i buduje zakładkę 'Transakcje'; pozostałe przy pierwszym otwarciu."""
+        self.engine = BudgetEngine(self.global_key, self.current_user).open()  # shard użytkownika, budżety, cykliczne
+        self.transactions = self.engine.store   # kolumnowy magazyn transakcji
+        self.budgets = self.engine.budgets      # słownik budżetów
+        self.recurring = self.engine.recurring  # cykliczne (dict)
 
-        self.budgets = {}               # słownik budżetów
-        self.load_budgets()             # wczytaj budżety z CSV
+        self.recurring_job = None               # zaplanowane after() harmonogramu
+        self.engine.post_recurring()            # dopisz zaległe wystąpienia
 
-        self.recurring = self.load_recurring()  # wczytaj cykliczne z JSON
-        self.process_recurring_transactions()   # dopisz zaległe wystąpienia
+        self.search_job = None              # zaplanowane (odroczone) wyszukiwanie
+        self.search_last = ("", None, None)  # ostatnie zapytanie, zakres dat i wynik (zawężanie przy dopisywaniu liter)
+        self.chart_job = None               # zaplanowane (odroczone) rysowanie wykresów
+        self.chart_poll_job = None          # sprawdzanie wyniku z wątku rysującego
 
         self.notebook = ttk.Notebook(self)  # główny notebook z zakładkami
         self.notebook.pack(fill="both", expand=True)  # rozciągnij w oknie
 
         self.tab_transactions = ttk.Frame(self.notebook)       # zakładka transakcji
         self.notebook.add(self.tab_transactions, text="Transakcje")  # dodaj zakładkę
-        self.create_transactions_tab()                         # zbuduj UI zakładki
 
         self.tab_analysis = ttk.Frame(self.notebook)           # zakładka analizy
         self.notebook.add(self.tab_analysis, text="Analizy")   # dodaj
-        self.create_analysis_tab()                             # zbuduj
 
         self.tab_budget = ttk.Frame(self.notebook)             # zakładka budżetu
         self.notebook.add(self.tab_budget, text="Planowanie Budżetu")  # dodaj
-        self.create_budget_tab()                               # zbuduj
 
         self.tab_calendar = ttk.Frame(self.notebook)           # zakładka kalendarza
         self.notebook.add(self.tab_calendar, text="Kalendarz") # dodaj
-        self.create_calendar_tab()                             # zbuduj
 
         self.tab_recurring = ttk.Frame(self.notebook)          # zakładka cyklicznych
         self.notebook.add(self.tab_recurring, text="Cykliczne")# dodaj
-        self.create_recurring_tab()                            # zbuduj
 
         self.tab_settings = ttk.Frame(self.notebook)           # zakładka ustawień
         self.notebook.add(self.tab_settings, text="Ustawienia")# dodaj
-        self.create_settings_tab()                             # zbuduj
+
+        self.tab_builders = {                                  # zakładka -> funkcja budująca UI
+            str(self.tab_transactions): self.create_transactions_tab,
+            str(self.tab_analysis): self.create_analysis_tab,
+            str(self.tab_budget): self.create_budget_tab,
+            str(self.tab_calendar): self.create_calendar_tab,
+            str(self.tab_recurring): self.create_recurring_tab,
+            str(self.tab_settings): self.create_settings_tab,
+        }
+        self.built_tabs = set()                                # już zbudowane zakładki
+        self.ensure_tab(self.tab_transactions)                 # zakładka startowa od razu
+        self.notebook.bind("<<NotebookTabChanged>>",
+                           lambda e: self.ensure_tab(self.notebook.select()))  # reszta przy pierwszym otwarciu
 
         menubar = tk.Menu(self)                                # menu główne
         usermenu = tk.Menu(menubar, tearoff=0)                 # podmenu użytkownika
@@ -223,17 +336,42 @@ class BudgetApp(tk.Tk):
         menubar.add_cascade(label=f"Użytkownik: {self.current_user}", menu=usermenu)  # wstaw do paska
         self.config(menu=menubar)                              # ustaw menubar
 
-        self.update_analysis_charts()                          # odśwież wykresy
+        self.schedule_recurring_check()                        # obudź się przy następnym wystąpieniu
+        threading.Thread(target=self.preload_modules, daemon=True).start()  # matplotlib w tle, nie przy kliknięciu
+
+    def ensure_tab(self, tab):
+        """Buduje UI zakładki przy pierwszym użyciu (tab = widżet albo jego nazwa Tk)."""
+        name = str(tab)                                        # klucz słownika budowniczych
+        if name not in self.built_tabs:
+            self.built_tabs.add(name)                          # przed budową (odświeżenia w trakcie)
+            self.tab_builders[name]()                          # zbuduj
+
+    def tab_built(self, tab) -> bool:
+        """Czy zakładka została już zbudowana (odświeżenia niezbudowanych pomijamy)."""
+        return str(tab) in self.built_tabs
+
+    def preload_modules(self):
+        """Wczytuje ciężkie moduły w tle, gdy użytkownik pracuje już z danymi."""
+        for name in PRELOAD_MODULES:
+            importlib.import_module(name)                      # kolejny import to tylko odczyt z sys.modules
 
     # --- WYJŚCIE / WYLOGOWANIE ---
     def exit_app(self):
         """Zapisuje, szyfruje i zamyka aplikację."""
-        self.save_and_encrypt_on_exit()  # zapisz i zaszyfruj
+        self.cancel_recurring_check()    # zatrzymaj harmonogram
+        self.cancel_chart_jobs()         # zatrzymaj odświeżanie wykresów
+        self.cancel_search_job()         # zatrzymaj odroczone wyszukiwanie
+        self.engine.save_all()           # zapisz i zaszyfruj
+        if self.chart_renderer is not None:
+            self.chart_renderer.shutdown()  # zatrzymaj wątek rysujący
         self.destroy()                   # zamknij okno aplikacji
 
     def logout(self):
         """Wylogowuje użytkownika i wraca do ekranu logowania."""
-        self.save_and_encrypt_on_exit()  # zapisz i zaszyfruj
+        self.cancel_recurring_check()    # zatrzymaj harmonogram
+        self.cancel_chart_jobs()         # zatrzymaj odświeżanie wykresów
+        self.cancel_search_job()         # zatrzymaj odroczone wyszukiwanie
+        self.engine.save_all()           # zapisz i zaszyfruj
         self.current_user = None         # wyczyść użytkownika
         if hasattr(self, "notebook"):    # jeśli notebook istnieje
             self.notebook.destroy()      # zniszcz UI
@@ -245,111 +383,42 @@ class BudgetApp(tk.Tk):
         self.current_user = user                       # ustaw zalogowanego
         self.init_main_app()                           # ponownie zbuduj UI
 
-    def save_and_encrypt_on_exit(self):
-        """Zapisuje dane i szyfruje CSV, usuwa tymczasowy plik."""
-        self.save_transactions()  # zapisz CSV jawny
-        encrypt_csv(TRANSACTIONS_FILE_DECRYPTED, TRANSACTIONS_FILE_ENCRYPTED, self.global_key)  # zaszyfruj
-        if os.path.exists(TRANSACTIONS_FILE_DECRYPTED):  # jeśli istnieje tymczasowy CSV
-            os.remove(TRANSACTIONS_FILE_DECRYPTED)       # usuń go
-        self.save_budgets()      # zapisz budżety
-        self.save_recurring()    # zapisz cykliczne
-
-    # --- ODCZYT / ZAPIS TRANSAKCJI ---
-    def load_transactions(self):
-        """Wczytuje transakcje z CSV do listy self.transactions."""
-        self.transactions.clear()                                           # wyczyść listę
-        if not os.path.exists(TRANSACTIONS_FILE_DECRYPTED):                 # jeśli brak CSV
-            return                                                          # pomiń
-        with open(TRANSACTIONS_FILE_DECRYPTED, 'r', newline='', encoding='utf-8') as f:  # otwórz CSV
-            reader = csv.DictReader(f)                                      # czytnik wierszy
-            for row in reader:                                              # iteruj wiersze
-                row["kwota"] = float(row["kwota"])                          # rzutuj kwotę
-                self.transactions.append(row)                               # dodaj do listy
-
-    def save_transactions(self):
-        """Zapisuje listę transakcji do CSV jawnego (tymczasowego)."""
-        fieldnames = ["user", "data", "rodzaj", "kategoria", "opis", "kwota"]    # nagłówki
-        with open(TRANSACTIONS_FILE_DECRYPTED, 'w', newline='', encoding='utf-8') as f:  # otwórz do zapisu
-            writer = csv.DictWriter(f, fieldnames=fieldnames)                      # pisarz CSV
-            writer.writeheader()                                                   # nagłówek
-            for t in self.transactions:                                            # iteruj transakcje
-                writer.writerow(t)                                                 # zapisz wiersz
-
-    # --- ODCZYT / ZAPIS BUDŻETÓW ---
-    def load_budgets(self):
-        """Wczytuje budżety z CSV do self.budgets (dict)."""
-        self.budgets.clear()                                           # wyczyść dict
-        if not os.path.exists(BUDGETS_FILE):                           # jeśli brak pliku
-            return                                                     # pomiń
-        with open(BUDGETS_FILE, 'r', newline='', encoding='utf-8') as f:  # otwórz do odczytu
-            reader = csv.reader(f)                                         # czytnik CSV
-            for row in reader:                                             # iteruj wiersze
-                if len(row) == 2:                                          # spodziewamy się 2 kolumn
-                    cat, limit_str = row                                   # odczytaj
-                    try:
-                        self.budgets[cat] = float(limit_str)               # rzutuj na float
-                    except ValueError:
-                        pass                                               # pomiń błędne
-
-    def save_budgets(self):
-        """Zapisuje self.budgets (dict) do CSV."""
-        with open(BUDGETS_FILE, 'w', newline='', encoding='utf-8') as f:  # otwórz do zapisu
-            writer = csv.writer(f)                                         # pisarz CSV
-            for cat, limit_ in self.budgets.items():                       # iteruj po dict
-                writer.writerow([cat, limit_])                             # zapisz wiersz
-
-    # --- ODCZYT / ZAPIS CYKLICZNYCH ---
-    def load_recurring(self):
-        """Wczytuje transakcje cykliczne z JSON (dict)."""
-        if not os.path.exists(RECURRING_FILE):         # jeśli brak pliku
-            return {}                                   # zwróć pusty dict
-        with open(RECURRING_FILE, 'r', encoding='utf-8') as f:  # wczytaj JSON
-            return json.load(f)                         # zwróć dict
-
-    def save_recurring(self):
-        """Zapisuje self.recurring (dict) do JSON (ładny format)."""
-        with open(RECURRING_FILE, 'w', encoding='utf-8') as f:       # otwórz do zapisu
-            json.dump(self.recurring, f, indent=2, ensure_ascii=False)  # zapisz pretty
-
-    def process_recurring_transactions(self):
-        """Dopisuje zaległe wystąpienia transakcji cyklicznych do self.transactions."""
-        today_str = datetime.today().strftime("%Y-%m-%d")      # dzisiejsza data jako string
-        today_date = datetime.strptime(today_str, "%Y-%m-%d")  # obiekt datetime dzisiejszy
-        changed = False                                        # flaga zmian
-
-        for rec_id, rec_data in self.recurring.items():        # iteruj po cyklicznych
-            next_date_str = rec_data.get("next_date", "")      # data kolejnego wystąpienia
-            interval_days = rec_data.get("interval_days", 0)   # odstęp w dniach
-            try:
-                next_date_obj = datetime.strptime(next_date_str, "%Y-%m-%d")  # parsuj datę
-            except ValueError:
-                continue                                       # błędna data -> pomiń
-
-            while next_date_obj <= today_date:                 # dopóki „zalega”
-                t = {                                          # zbuduj transakcję
-                    "user": rec_data["user"],                  # użytkownik
-                    "data": next_date_obj.strftime("%Y-%m-%d"),# data wystąpienia
-                    "rodzaj": rec_data["rodzaj"],              # rodzaj (Przychód/Wydatek)
-                    "kategoria": rec_data["kategoria"],        # kategoria
-                    "opis": f"[Cykliczna] {rec_data.get('opis','')}",  # opis z prefiksem
-                    "kwota": float(rec_data["kwota"])          # kwota (float)
-                }
-                self.transactions.append(t)                    # dopisz do listy
-                changed = True                                 # ustaw flagę
-                next_date_obj += timedelta(days=interval_days) # przesuń na kolejną datę
-
-            self.recurring[rec_id]["next_date"] = next_date_obj.strftime("%Y-%m-%d")  # zaktualizuj next_date
-
-        if changed:                         # jeśli były dopisane
-            self.save_transactions()        # zapisz CSV
+    def schedule_recurring_check(self):
+        """Planuje after() na północ dnia najbliższego wystąpienia (od razu, jeśli już należne)."""
+        self.cancel_recurring_check()                          # najwyżej jedno zaplanowane
+        due = self.engine.scheduler.next_due()              # wierzch kopca, O(1)
+        if due is None:                                        # brak reguł
+            return
+        wait = (datetime.fromordinal(due) - datetime.now()).total_seconds()  # do północy dnia wystąpienia
+        delay = min(max(0, int(wait * 1000)), RECURRING_CHECK_MAX_MS)      # ms, z górnym limitem
+        self.recurring_job = self.after(delay, self.on_recurring_due)      # obudź się tylko wtedy
+
+    def cancel_recurring_check(self):
+        """Anuluje zaplanowane sprawdzenie harmonogramu."""
+        if self.recurring_job is not None:
+            self.after_cancel(self.recurring_job)              # usuń timer Tk
+            self.recurring_job = None
+
+    @timed("gui.recurring_due")
+    def on_recurring_due(self):
+        """Dopisuje wystąpienia, które stały się należne w trakcie sesji, i odświeża widoki."""
+        self.recurring_job = None                              # timer już się wykonał
+        if self.engine.post_recurring():                       # coś dopisano?
+            self.apply_filter(keep_offset=True)                # odśwież tabelę w tym samym miejscu
+            self.update_analysis_charts()                      # odśwież wykresy
+            self.update_budget_text()                          # odśwież raport budżetu
+            self.update_calendar()                             # odśwież znaczniki kalendarza
+            self.update_recurring_table()                      # nowe daty następnych wystąpień
+        self.schedule_recurring_check()                        # zaplanuj kolejne
 
     # --- ZAKŁADKA: TRANSAKCJE ---
     def create_transactions_tab(self):
         """Buduje UI zakładki 'Transakcje'."""
+        from tkcalendar import DateEntry                  # import odroczony (po oknie logowania)
         self.tab_transactions.rowconfigure(2, weight=1)   # rozciąganie wiersza tabeli
         self.tab_transactions.columnconfigure(0, weight=1)  # rozciąganie kolumny
 
-        filter_frame = ttk.LabelFrame(self.tab_transactions, text="Filtry dat")  # ramka filtrów
+        filter_frame = ttk.LabelFrame(self.tab_transactions, text="Filtry")      # ramka filtrów
         filter_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=5)          # umieść na siatce
 
         ttk.Label(filter_frame, text="Od (data):").grid(row=0, column=0, padx=5)  # etykieta od
@@ -362,7 +431,16 @@ class BudgetApp(tk.Tk):
         self.filter_to_date = DateEntry(filter_frame, textvariable=self.filter_to_var, date_pattern="yyyy-mm-dd")  # wybór daty
         self.filter_to_date.grid(row=0, column=3, padx=5)                         # pozycja
 
-        ttk.Button(filter_frame, text="Zastosuj filtr", command=self.apply_filter).grid(row=0, column=4, padx=5)  # przycisk filtra
+        self.filter_dates_var = tk.BooleanVar(value=False)                        # zakres dat włączony? (domyślnie cała historia)
+        ttk.Checkbutton(filter_frame, text="Filtruj po dacie", variable=self.filter_dates_var,
+                        command=self.apply_filter).grid(row=0, column=4, padx=5)  # przełącznik zakresu
+        ttk.Button(filter_frame, text="Zastosuj filtr", command=self.apply_date_filter).grid(row=0, column=5, padx=5)  # przycisk filtra
+        ttk.Button(filter_frame, text="Wyczyść daty", command=self.clear_date_filter).grid(row=0, column=6, padx=5)   # cała historia
+
+        ttk.Label(filter_frame, text="Szukaj:").grid(row=0, column=7, padx=5)    # etykieta wyszukiwania
+        self.search_var = tk.StringVar()                                          # zapytanie (opis, kategoria)
+        ttk.Entry(filter_frame, textvariable=self.search_var, width=30).grid(row=0, column=8, padx=5)  # pole wyszukiwania
+        self.search_var.trace_add("write", self.on_search_changed)                # wyniki w trakcie pisania
 
         form_frame = ttk.LabelFrame(self.tab_transactions, text="Dodaj / Edytuj transakcję")  # ramka formularza
         form_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=5)                         # pozycja na siatce
@@ -399,13 +477,17 @@ class BudgetApp(tk.Tk):
         self.save_edit_button.grid(row=0, column=8, rowspan=2, padx=5, pady=5, sticky="ns")                         # pozycja
         self.save_edit_button["state"] = "disabled"                                                                  # nieaktywny na start
 
+        self.import_button = ttk.Button(form_frame, text="Importuj CSV", command=self.import_transactions)  # przycisk importu
+        self.import_button.grid(row=0, column=9, rowspan=2, padx=5, pady=5, sticky="ns")                    # pozycja
+
         table_frame = ttk.Frame(self.tab_transactions)                   # ramka tabeli
         table_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=5) # pozycja ramki
         table_frame.rowconfigure(0, weight=1)                            # rozciągaj w pionie
         table_frame.columnconfigure(0, weight=1)                         # rozciągaj w poziomie
 
         columns = ("data","rodzaj","kategoria","opis","kwota")           # kolumny tabeli
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")  # tabela
+        self.tree_view = VirtualTreeview(table_frame, columns, self.transaction_row_values)  # wirtualna tabela
+        self.tree = self.tree_view.tree                                  # sam widżet Treeview
         self.tree.heading("data", text="Data")                           # nagłówek kolumny
         self.tree.heading("rodzaj", text="Rodzaj")                       # j.w.
         self.tree.heading("kategoria", text="Kategoria")                 # j.w.
@@ -418,47 +500,78 @@ class BudgetApp(tk.Tk):
         self.tree.column("opis", width=300, anchor="w")                  # j.w.
         self.tree.column("kwota", width=80, anchor="e")                  # j.w.
 
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)  # scrollbar pionowy
-        self.tree.configure(yscrollcommand=scrollbar.set)                                    # powiąż scroll
-
         self.tree.grid(row=0, column=0, sticky="nsew")                # umieść tabelę
-        scrollbar.grid(row=0, column=1, sticky="ns")                  # umieść scroll
+        self.tree_view.scrollbar.grid(row=0, column=1, sticky="ns")   # umieść scroll (sterowany przez VirtualTreeview)
 
         self.delete_button = ttk.Button(table_frame, text="Usuń zaznaczoną transakcję", command=self.remove_transaction)  # przycisk Usuń
         self.delete_button.grid(row=1, column=0, pady=5, sticky="we")                                                      # pozycja
 
-        self.show_transactions_in_tree(self.transactions)             # pokaż dane w tabeli
+        self.show_transactions_in_tree(self.transactions.user_indices(self.current_user))  # pokaż dane w tabeli
 
-    def show_transactions_in_tree(self, trans_list):
-        """Wyświetla przekazaną listę transakcji w tabeli (tylko bieżącego usera)."""
-        for row_id in self.tree.get_children():                   # iteruj istniejące wiersze
-            self.tree.delete(row_id)                              # usuń każdy (czyszczenie)
-        for t in trans_list:                                      # iteruj transakcje
-            if t["user"] == self.current_user:                    # filtruj po userze
-                self.tree.insert("", "end", values=(              # dodaj wiersz
-                    t["data"], t["rodzaj"], t["kategoria"], t["opis"], f"{t['kwota']:.2f}"
-                ))
+    def transaction_row_values(self, idx):
+        """Zwraca wartości kolumn tabeli dla wiersza magazynu."""
+        t = self.transactions.view(idx)                               # widok wiersza
+        return (t.data, t.rodzaj, t.kategoria, t.opis, f"{t.kwota:.2f}")  # jak w kolumnach
 
-    def apply_filter(self):
-        """Filtruje transakcje po zakresie dat i odświeża tabelę."""
+    @timed("gui.show_transactions")
+    def show_transactions_in_tree(self, indices, keep_offset=False):
+        """Wyświetla przekazaną listę indeksów magazynu w tabeli (renderowane jest tylko widoczne okno)."""
+        self.tree_view.set_rows(indices, keep_offset)             # O(widoczne wiersze)
+
+    @timed("gui.apply_filter")
+    def apply_filter(self, keep_offset=False, narrow=False):
+        """
+        Filtruje transakcje po tekście wyszukiwania i – gdy włączono 'Filtruj po dacie' – po zakresie dat.
+        'narrow': zapytanie tylko wydłużono – szukamy w poprzednim wyniku zamiast w całej historii.
+        """
         from_date_str = self.filter_from_var.get().strip()            # data od
         to_date_str = self.filter_to_var.get().strip()                # data do
-        if not from_date_str or not to_date_str:                      # jeśli brak dat
-            self.show_transactions_in_tree(self.transactions)         # pokaż wszystko
-            return                                                    # wyjdź
-        try:
-            from_date = datetime.strptime(from_date_str, "%Y-%m-%d")  # parsuj od
-            to_date = datetime.strptime(to_date_str, "%Y-%m-%d")      # parsuj do
-        except ValueError:
-            messagebox.showwarning("Błąd", "Niepoprawny format daty.")  # ostrzeżenie
-            return
-        filtered = []                                                # lista wyników
-        for t in self.transactions:                                  # iteruj transakcje
-            if t["user"] == self.current_user:                       # filtr user
-                t_date = datetime.strptime(t["data"], "%Y-%m-%d")    # parsuj datę
-                if from_date <= t_date <= to_date:                   # sprawdź zakres
-                    filtered.append(t)                               # dodaj do wyniku
-        self.show_transactions_in_tree(filtered)                     # pokaż przefiltrowane
+        from_ord = to_ord = None                                      # brak dat = bez zakresu
+        if self.filter_dates_var.get() and from_date_str and to_date_str:  # zakres tylko na życzenie
+            try:
+                from_ord = date_to_ordinal(from_date_str)             # parsuj od (ordinal)
+                to_ord = date_to_ordinal(to_date_str)                 # parsuj do (ordinal)
+            except ValueError:
+                messagebox.showwarning("Błąd", "Niepoprawny format daty.")  # ostrzeżenie
+                return
+        query = self.search_var.get().strip()                         # tekst wyszukiwania
+        if not query:
+            filtered = self.transactions.user_indices(self.current_user, from_ord, to_ord)  # zapytanie zakresowe (bisect)
+        else:
+            last_query, last_range, last_found = self.search_last
+            within = None
+            if narrow and last_query and query.startswith(last_query) and last_range == (from_ord, to_ord):
+                within = last_found                                   # wydłużone zapytanie, te same daty
+            filtered = self.transactions.search(self.current_user, query, from_ord, to_ord, within)  # indeks słów
+        self.search_last = (query, (from_ord, to_ord), filtered if query else None)  # baza do zawężania
+        self.show_transactions_in_tree(filtered, keep_offset)        # pokaż przefiltrowane
+
+    def apply_date_filter(self):
+        """Przycisk 'Zastosuj filtr': włącza zakres dat z pól Od/Do i odświeża tabelę."""
+        self.filter_dates_var.set(True)                               # zakres obowiązuje od teraz
+        self.apply_filter()                                           # odśwież
+
+    def clear_date_filter(self):
+        """Przycisk 'Wyczyść daty': wyłącza zakres dat (tabela i wyszukiwanie obejmują całą historię)."""
+        self.filter_dates_var.set(False)                              # bez zakresu
+        self.apply_filter()                                           # odśwież
+
+    def on_search_changed(self, *_):
+        """Zmiana tekstu wyszukiwania: odracza zapytanie, żeby szybkie pisanie dało jedno odświeżenie."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)                        # przesuń poprzednie
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.run_search)  # odrocz
+
+    def cancel_search_job(self):
+        """Anuluje odroczone wyszukiwanie (wylogowanie, wyjście)."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)                        # usuń timer Tk
+        self.search_job = None
+
+    def run_search(self):
+        """Wykonuje odroczone wyszukiwanie (zawężając poprzedni wynik, gdy dopisano litery)."""
+        self.search_job = None                                        # timer już się wykonał
+        self.apply_filter(narrow=True)                                # tylko tu wolno zawężać
 
     def add_transaction(self):
         """Dodaje transakcję z formularza i odświeża."""
@@ -469,82 +582,102 @@ class BudgetApp(tk.Tk):
         kwota_str = self.amount_var.get().strip()                # kwota (tekst)
         try:
             kwota = float(kwota_str)                             # rzutuj na float
+            to_grosze(kwota)                                     # inf/nan/poza zakresem -> ValueError
         except ValueError:
             messagebox.showwarning("Błąd", "Niepoprawna kwota.") # ostrzeżenie
             return
         if not date_val:                                         # pusta data?
             messagebox.showwarning("Błąd", "Data nie może być pusta.")  # ostrzeżenie
             return
-        transaction = {                                          # słownik transakcji
-            "user": self.current_user,                           # user
-            "data": date_val,                                    # data
-            "rodzaj": rodzaj,                                    # rodzaj
-            "kategoria": kategoria if kategoria else "Brak",     # kategoria
-            "opis": opis if opis else "Brak",                    # opis
-            "kwota": kwota                                       # kwota
-        }
-        self.transactions.append(transaction)                    # dodaj do listy
-        self.save_transactions()                                 # zapisz CSV
+        kategoria = kategoria if kategoria else "Brak"           # kategoria domyślna
+        opis = opis if opis else "Brak"                          # opis domyślny
+        try:
+            idx = self.engine.add_transaction(self.current_user, date_val, rodzaj, kategoria, opis, kwota)  # magazyn + dziennik
+        except ValueError:
+            messagebox.showwarning("Błąd", "Niepoprawny format daty.")  # ostrzeżenie
+            return
 
         self.apply_filter()                                      # odśwież tabelę (z filtrami)
-
-        if rodzaj == "Wydatek" and transaction["kategoria"] in self.budgets:  # jeśli kontrolujemy budżet
-            limit = self.budgets[transaction["kategoria"]]                    # limit kategorii
-            spent = sum(t["kwota"] for t in self.transactions                 # suma wydatków w kat.
-                        if t["user"]==self.current_user and t["rodzaj"]=="Wydatek"
-                        and t["kategoria"]==transaction["kategoria"])
-            if spent > limit:                                                 # przekroczono?
-                messagebox.showwarning("Przekroczenie budżetu!",
-                    f"Kategoria '{transaction['kategoria']}' przekroczyła limit {limit:.2f} zł.\n"
-                    f"Obecnie wydano: {spent:.2f} zł.")                      # ostrzeżenie
+        self.check_budget(self.transactions.view(idx))           # ostrzeżenie o przekroczeniu limitu
 
         self.update_analysis_charts()                          # odśwież wykresy
+        self.update_budget_text()                              # odśwież raport budżetu
+        self.update_calendar()                                 # odśwież znaczniki kalendarza
 
         self.category_var.set("")                              # wyczyść pola
         self.desc_var.set("")                                  # j.w.
         self.amount_var.set("")                                # j.w.
 
+    def import_transactions(self):
+        """Importuje wyciąg bankowy CSV dla bieżącego użytkownika: jeden zapis i jedno odświeżenie na końcu."""
+        path = filedialog.askopenfilename(title="Importuj wyciąg CSV",
+                                          filetypes=[("CSV", "*.csv"), ("Wszystkie pliki", "*.*")])  # wybór pliku
+        if not path:                                             # anulowano
+            return
+
+        def progress(count):                                     # po każdej partii
+            self.import_button.config(text=f"Import: {count}")   # licznik na przycisku
+            self.update_idletasks()                              # przerysuj (bez obsługi kliknięć)
+
+        self.config(cursor="watch")                              # kursor oczekiwania
+        try:
+            report = import_file(self.engine, path, self.current_user, progress=progress)  # potok + partie
+        except (OSError, ValueError, csv.Error) as exc:          # plik/nagłówek/format
+            messagebox.showwarning("Błąd", f"Import nieudany: {exc}")  # nic nie zostało dodane
+            return
+        finally:
+            self.config(cursor="")                               # zwykły kursor
+            self.import_button.config(text="Importuj CSV")       # przywróć napis
+
+        self.apply_filter()                                      # odśwież tabelę raz
+        self.update_analysis_charts()                            # odśwież wykresy
+        self.update_budget_text()                                # odśwież raport budżetu
+        self.update_calendar()                                   # odśwież znaczniki kalendarza
+        messagebox.showinfo("Import", report.summary())          # podsumowanie
+
     def remove_transaction(self):
-        """Usuwa zaznaczoną transakcję z tabeli i listy."""
-        selection = self.tree.selection()                                  # pobierz zaznaczenie
-        if not selection:                                                  # jeśli brak
+        """Usuwa zaznaczoną transakcję z tabeli i magazynu."""
+        idx = self.tree_view.selected()                                    # wiersz magazynu pod zaznaczeniem
+        if idx is None:                                                    # jeśli brak
             return                                                         # wyjdź
-        item_id = selection[0]                                             # id wiersza
-        values = self.tree.item(item_id, "values")                         # pobierz wartości
-        self.tree.delete(item_id)                                          # usuń wiersz z tabeli
-
-        data_str, rodzaj, kategoria, opis, kwota_str = values              # rozpakuj wartości
-        kwota = float(kwota_str)                                           # rzutuj kwotę
-        for t in self.transactions:                                        # szukaj w liście
-            if (t["user"]==self.current_user and t["data"]==data_str and t["rodzaj"]==rodzaj
-                and t["kategoria"]==kategoria and t["opis"]==opis
-                and abs(t["kwota"] - kwota)<1e-9):                         # dopasowanie po polach
-                self.transactions.remove(t)                                # usuń z listy
-                break                                                      # zakończ
-        self.save_transactions()                                           # zapisz CSV
+        self.engine.remove_transaction(idx)                                # znacznik usunięcia + dziennik
+        self.apply_filter(keep_offset=True)                                # odśwież tabelę w tym samym miejscu
         self.update_analysis_charts()                                      # odśwież wykresy
+        self.update_budget_text()                                          # odśwież raport budżetu
+        self.update_calendar()                                             # odśwież znaczniki kalendarza
+
+    def check_budget(self, t):
+        """Ostrzega, gdy wydatek t przekroczył limit swojej kategorii w okresie limitu (licznik O(1))."""
+        budget = self.budgets.get(t.kategoria)                             # limit kategorii
+        if t.rodzaj != "Wydatek" or budget is None:                        # nie kontrolujemy?
+            return
+        spent = from_grosze(self.transactions.spent_in_period(
+            self.current_user, t.kategoria, budget["period"], t.ordinal))  # wydano w okresie transakcji
+        if spent > budget["limit"]:                                        # przekroczono?
+            messagebox.showwarning("Przekroczenie budżetu!",
+                f"Kategoria '{t.kategoria}' przekroczyła limit {budget['limit']:.2f} zł "
+                f"({BUDGET_PERIOD_LABELS[budget['period']]}).\n"
+                f"Obecnie wydano: {spent:.2f} zł.")                       # ostrzeżenie
 
     def edit_transaction(self):
         """Ładuje zaznaczoną transakcję do formularza do edycji."""
-        selection = self.tree.selection()                          # zaznaczenie
-        if not selection:                                          # jeśli brak
+        idx = self.tree_view.selected()                            # wiersz magazynu pod zaznaczeniem
+        if idx is None:                                            # jeśli brak
             return                                                 # wyjdź
-        item_id = selection[0]                                     # id wiersza
-        values = self.tree.item(item_id, "values")                 # wartości wiersza
-        data_str, rodzaj, kategoria, opis, kwota_str = values      # rozpakuj
+        t = self.transactions.view(idx)                            # widok wiersza
 
-        self.date_var.set(data_str)                                # ustaw datę
-        self.type_var.set(rodzaj)                                  # ustaw rodzaj
-        self.category_var.set(kategoria)                           # ustaw kategorię
-        self.desc_var.set(opis)                                    # ustaw opis
-        self.amount_var.set(kwota_str)                             # ustaw kwotę
+        self.date_var.set(t.data)                                  # ustaw datę
+        self.type_var.set(t.rodzaj)                                # ustaw rodzaj
+        self.category_var.set(t.kategoria)                         # ustaw kategorię
+        self.desc_var.set(t.opis)                                  # ustaw opis
+        self.amount_var.set(f"{t.kwota:.2f}")                      # ustaw kwotę
 
-        self.current_edit_item_id = item_id                        # zapamiętaj edytowany wiersz
+        self.current_edit_tid = t.tid                              # zapamiętaj ID edytowanej transakcji
         self.save_edit_button["state"] = "normal"                  # włącz przycisk zapisu
 
     def save_edited_transaction(self):
         """Zapisuje edytowaną transakcję (formularz -> lista -> tabela)."""
-        if not hasattr(self, 'current_edit_item_id'):  # brak aktywnej edycji?
+        if not hasattr(self, 'current_edit_tid'):      # brak aktywnej edycji?
             return                                    # wyjdź
         new_date = self.date_var.get().strip()        # nowa data
         rodzaj = self.type_var.get()                  # nowy rodzaj
@@ -553,120 +686,156 @@ class BudgetApp(tk.Tk):
         kwota_str = self.amount_var.get().strip()     # nowa kwota (tekst)
         try:
             kwota = float(kwota_str)                  # rzutuj
+            to_grosze(kwota)                          # inf/nan/poza zakresem -> ValueError
         except ValueError:
+            messagebox.showwarning("Błąd", "Niepoprawna kwota.")  # ostrzeżenie
             return                                    # wyjdź przy błędzie
 
-        old_values = self.tree.item(self.current_edit_item_id, "values")  # stare wartości wiersza
-        old_date, old_rodzaj, old_kat, old_opis, old_kwota_str = old_values  # rozpakuj
-        old_kwota = float(old_kwota_str)                                    # rzutuj
-
-        for t in self.transactions:                                         # znajdź transakcję
-            if (t["user"]==self.current_user and t["data"]==old_date and t["rodzaj"]==old_rodzaj
-                and t["kategoria"]==old_kat and t["opis"]==old_opis
-                and abs(t["kwota"] - old_kwota)<1e-9):
-                t["data"] = new_date                                       # zaktualizuj pola
-                t["rodzaj"] = rodzaj                                       # j.w.
-                t["kategoria"] = kat                                        # j.w.
-                t["opis"] = opis                                            # j.w.
-                t["kwota"] = kwota                                          # j.w.
-                break                                                       # zakończ pętlę
-
-        self.save_transactions()                                            # zapisz CSV
-        self.tree.item(self.current_edit_item_id, values=(new_date,rodzaj,kat,opis,f"{kwota:.2f}"))  # odśwież wiersz
+        idx = self.transactions.index_of(self.current_edit_tid)             # wiersz po ID (słownik, O(1))
+        if idx is not None:                                                 # nadal istnieje?
+            try:
+                self.engine.update_transaction(idx, data=new_date, rodzaj=rodzaj,
+                                               kategoria=kat, opis=opis, kwota=kwota)  # pola + dziennik
+            except ValueError:
+                messagebox.showwarning("Błąd", "Niepoprawny format daty.")  # ostrzeżenie
+                return
+            self.check_budget(self.transactions.view(idx))                  # ostrzeżenie o przekroczeniu limitu
+        self.apply_filter(keep_offset=True)                                 # odśwież widoczne okno tabeli
         self.save_edit_button["state"] = "disabled"                         # wyłącz zapis
-        del self.current_edit_item_id                                       # usuń znacznik edycji
+        del self.current_edit_tid                                           # usuń znacznik edycji
 
         self.category_var.set("")                                           # wyczyść pola
         self.desc_var.set("")
         self.amount_var.set("")
         self.update_analysis_charts()                                       # odśwież wykresy
+        self.update_budget_text()                                           # odśwież raport budżetu
+        self.update_calendar()                                              # odśwież znaczniki kalendarza
 
     # --- ZAKŁADKA: ANALIZY ---
     def create_analysis_tab(self):
-        """Buduje UI zakładki 'Analizy' (3 wykresy)."""
-        self.tab_analysis.rowconfigure(1, weight=1)               # rozciąganie w pionie
+        """Buduje UI zakładki 'Analizy' (4 wykresy i zestawienie krzyżowe)."""
+        self.tab_analysis.rowconfigure(0, weight=1)               # rozciąganie w pionie (saldo miesięczne)
+        self.tab_analysis.rowconfigure(1, weight=1)               # j.w. (kołowy+słupkowy)
+        self.tab_analysis.rowconfigure(2, weight=1)               # j.w. (saldo dzienne)
+        self.tab_analysis.rowconfigure(3, weight=1)               # j.w. (zestawienie krzyżowe)
         self.tab_analysis.columnconfigure(0, weight=1)            # rozciąganie w poziomie
 
-        self.fig_line = plt.Figure(figsize=(6,3), dpi=100)        # figura wykresu liniowego
-        self.ax_line = self.fig_line.add_subplot(111)             # osie do linii
-        self.canvas_line = FigureCanvasTkAgg(self.fig_line, master=self.tab_analysis)  # płótno Tk
-        self.canvas_line.get_tk_widget().grid(row=0, column=0, sticky="nsew")         # umieść
-
         bottom_frame = ttk.Frame(self.tab_analysis)               # dolna ramka (kołowy+słupkowy)
         bottom_frame.grid(row=1, column=0, sticky="nsew")         # pozycja
         bottom_frame.columnconfigure(0, weight=1)                 # rozciąganie kolumn
         bottom_frame.columnconfigure(1, weight=1)                 # j.w.
         bottom_frame.rowconfigure(0, weight=1)                    # rozciąganie wiersza
 
-        self.fig_pie = plt.Figure(figsize=(3,3), dpi=100)         # figura kołowa
-        self.ax_pie = self.fig_pie.add_subplot(111)               # osie
-        self.canvas_pie = FigureCanvasTkAgg(self.fig_pie, master=bottom_frame)  # płótno
-        self.canvas_pie.get_tk_widget().grid(row=0, column=0, sticky="nsew")   # umieść
-
-        self.fig_bar = plt.Figure(figsize=(3,3), dpi=100)         # figura słupkowa
-        self.ax_bar = self.fig_bar.add_subplot(111)               # osie
-        self.canvas_bar = FigureCanvasTkAgg(self.fig_bar, master=bottom_frame) # płótno
-        self.canvas_bar.get_tk_widget().grid(row=0, column=1, sticky="nsew")   # umieść
+        from budget_charts import CHART_NAMES, ChartRenderer      # import odroczony (matplotlib)
+        if self.chart_renderer is None:
+            self.chart_renderer = ChartRenderer()                 # przeżywa wylogowanie (pamięć bitmap)
+
+        self.chart_canvases = {}                                  # nazwa -> tk.Canvas z bitmapą wykresu
+        self.chart_images = {}                                    # nazwa -> PhotoImage (referencja przed GC)
+        placement = {"line": (self.tab_analysis, 0, 0), "pie": (bottom_frame, 0, 0), "bar": (bottom_frame, 0, 1),
+                     "balance": (self.tab_analysis, 2, 0)}
+        for name in CHART_NAMES:
+            master, row, column = placement[name]                 # gdzie leży płótno
+            width, height = CHART_DEFAULT_SIZES[name]             # rozmiar początkowy
+            canvas = tk.Canvas(master, width=width, height=height, highlightthickness=0, bg="white")  # płótno Tk
+            canvas.grid(row=row, column=column, sticky="nsew")    # umieść
+            canvas.bind("<Configure>", lambda e: self.update_analysis_charts())  # zmiana rozmiaru -> nowe bitmapy
+            self.chart_canvases[name] = canvas
+
+        from budget_analytics import DIMENSIONS, MEASURES, DIM_CATEGORY, DIM_MONTH, MEASURE_EXPENSE  # import odroczony (numpy)
+        crosstab_frame = ttk.LabelFrame(self.tab_analysis, text="Zestawienie krzyżowe")  # dowolne dwa wymiary
+        crosstab_frame.grid(row=3, column=0, sticky="nsew", padx=5, pady=5)
+        crosstab_frame.rowconfigure(1, weight=1)                  # rozciąganie pola tekstowego
+        crosstab_frame.columnconfigure(0, weight=1)
+        choice_frame = ttk.Frame(crosstab_frame)                  # wybór wymiarów i miary
+        choice_frame.grid(row=0, column=0, sticky="w")
+        self.crosstab_rows_var = tk.StringVar(value=DIM_CATEGORY)      # wiersze
+        self.crosstab_columns_var = tk.StringVar(value=DIM_MONTH)      # kolumny
+        self.crosstab_measure_var = tk.StringVar(value=MEASURE_EXPENSE)  # miara
+        for label, var, values in (("Wiersze:", self.crosstab_rows_var, DIMENSIONS),
+                                   ("Kolumny:", self.crosstab_columns_var, DIMENSIONS),
+                                   ("Miara:", self.crosstab_measure_var, MEASURES)):
+            ttk.Label(choice_frame, text=label).pack(side="left", padx=5)  # etykieta
+            combo = ttk.Combobox(choice_frame, textvariable=var, width=14, state="readonly", values=list(values))
+            combo.pack(side="left", padx=5)
+            combo.bind("<<ComboboxSelected>>", lambda e: self.update_crosstab())  # nowe zestawienie od razu
+        self.crosstab_text = tk.Text(crosstab_frame, wrap="none", height=8)  # tabela (czcionka jak w raporcie budżetu)
+        self.crosstab_text.grid(row=1, column=0, sticky="nsew")
+        scroll_x = ttk.Scrollbar(crosstab_frame, orient="horizontal", command=self.crosstab_text.xview)  # scroll poziomy
+        scroll_y = ttk.Scrollbar(crosstab_frame, orient="vertical", command=self.crosstab_text.yview)    # scroll pionowy
+        self.crosstab_text.configure(xscrollcommand=scroll_x.set, yscrollcommand=scroll_y.set)
+        scroll_x.grid(row=2, column=0, sticky="ew")
+        scroll_y.grid(row=1, column=1, sticky="ns")
+        self.update_analysis_charts()                             # pierwsze rysowanie
 
     def update_analysis_charts(self):
-        """Aktualizuje wszystkie 3 wykresy na podstawie danych usera."""
-        user_trans = [t for t in self.transactions if t["user"]==self.current_user]  # filtr user
-
-        total_income = sum(t["kwota"] for t in user_trans if t["rodzaj"]=="Przychód")  # suma przychodów
-        total_expense = sum(t["kwota"] for t in user_trans if t["rodzaj"]=="Wydatek")  # suma wydatków
-
-        self.ax_pie.clear()                                                       # wyczyść kołowy
-        if total_income==0 and total_expense==0:                                  # brak danych?
-            self.ax_pie.text(0.5, 0.5, "Brak danych", ha="center", va="center")   # tekst
-        else:
-            values = [total_income, total_expense]                                # wartości
-            labels = ["Przychody","Wydatki"]                                      # etykiety
-            colors = ["green","red"]                                              # kolory
-            self.ax_pie.pie(values, labels=labels, autopct="%1.1f%%", colors=colors, startangle=90)  # wykres
-        self.ax_pie.set_title("Przychody vs Wydatki")                             # tytuł
-        self.ax_pie.axis("equal")                                                 # koło jako okrąg
-        self.canvas_pie.draw()                                                    # narysuj
-
-        self.ax_bar.clear()                                                       # wyczyść słupkowy
-        expenses_by_cat = {}                                                      # słownik sum per kategoria
-        for t in user_trans:                                                      # iteruj transakcje
-            if t["rodzaj"]=="Wydatek":                                           # tylko wydatki
-                cat = t["kategoria"]                                             # kategoria
-                expenses_by_cat[cat] = expenses_by_cat.get(cat,0)+t["kwota"]     # sumuj
-        if not expenses_by_cat:                                                  # brak?
-            self.ax_bar.text(0.5,0.5,"Brak wydatków", ha="center", va="center")  # komunikat
-        else:
-            cats = list(expenses_by_cat.keys())                                  # nazwy kategorii
-            sums = list(expenses_by_cat.values())                                # sumy
-            self.ax_bar.bar(cats, sums, color="orange")                          # słupki
-            self.ax_bar.set_xticklabels(cats, rotation=45, ha="right")           # etykiety pod kątem
-            self.ax_bar.set_title("Wydatki wg kategorii")                         # tytuł
-        self.fig_bar.tight_layout()                                               # dopasuj
-        self.canvas_bar.draw()                                                    # rysuj
-
-        self.ax_line.clear()                                                      # wyczyść liniowy
-        monthly_data = {}                                                         # słownik saldo miesięczne
-        for t in user_trans:                                                      # iteruj transakcje
-            month_key = t["data"][:7]                                            # YYYY-MM
-            monthly_data.setdefault(month_key, 0)                                 # init 0
-            if t["rodzaj"]=="Przychód":                                          # jeśli przychód
-                monthly_data[month_key]+=t["kwota"]                               # dodaj
-            else:
-                monthly_data[month_key]-=t["kwota"]                               # odejmij
-        if not monthly_data:                                                      # brak?
-            self.ax_line.text(0.5,0.5,"Brak danych", ha="center", va="center")    # komunikat
-        else:
-            sorted_months = sorted(monthly_data.keys())                           # posortuj miesiące
-            x_vals = range(len(sorted_months))                                    # oś X
-            y_vals = [monthly_data[m] for m in sorted_months]                     # salda
-            self.ax_line.plot(x_vals,y_vals,marker='o')                           # wykres linii
-            self.ax_line.set_xticks(x_vals)                                       # ticki
-            self.ax_line.set_xticklabels(sorted_months, rotation=45, ha="right")  # etykiety X
-            self.ax_line.set_title("Saldo miesięczne (Przychody - Wydatki)")      # tytuł
-            self.ax_line.set_xlabel("Miesiąc")                                    # podpis X
-            self.ax_line.set_ylabel("Saldo")                                      # podpis Y
-        self.fig_line.tight_layout()                                              # dopasuj
-        self.canvas_line.draw()                                                   # rysuj
+        """Planuje odświeżenie wykresów – seria zmian w krótkim czasie daje jedno rysowanie."""
+        if not self.tab_built(self.tab_analysis):                                 # zakładka jeszcze niezbudowana?
+            return                                                                # narysuje się przy otwarciu
+        if self.chart_job is not None:
+            self.after_cancel(self.chart_job)                                     # przesuń poprzednie
+        self.chart_job = self.after(CHART_DEBOUNCE_MS, self.render_analysis_charts)  # odrocz
+
+    @timed("gui.update_analysis_charts")
+    def render_analysis_charts(self):
+        """Zleca narysowanie wykresów w wątku roboczym (albo bierze gotowe bitmapy z pamięci)."""
+        from budget_charts import chart_key, downsample_days                      # już wczytany przez zakładkę
+        self.chart_job = None                                                     # timer już się wykonał
+        self.update_crosstab()                                                    # tabela z tych samych danych
+        sizes = {}                                                                # rozmiary płócien w pikselach
+        for name, canvas in self.chart_canvases.items():
+            width, height = canvas.winfo_width(), canvas.winfo_height()           # bieżący rozmiar
+            sizes[name] = (width, height) if width > 1 and height > 1 else CHART_DEFAULT_SIZES[name]  # przed ułożeniem
+        totals = self.transactions.user_totals(self.current_user)                 # sumy przyrostowe (bez skanu)
+        timeline = self.transactions.balance_timeline(self.current_user)          # oś salda (sumy prefiksowe)
+        span = timeline.span()                                                    # pierwszy i ostatni dzień z ruchem
+        balance = downsample_days(span[0], timeline.daily_balance(*span)) if span else ([], [])  # saldo dzienne
+        key = chart_key(self.current_user, totals, balance, sizes)                # wersja danych wykresów
+        self.chart_key = key                                                      # najnowsze zlecenie
+        images = self.chart_renderer.cached(key)                                  # już narysowane?
+        if images is not None:
+            self.show_chart_images(images)                                        # bez rysowania
+            return
+        future = self.chart_renderer.submit(key, totals, balance, sizes)          # rysuj w tle (Agg)
+        self.poll_chart_future(future, key)                                       # czekaj bez blokowania GUI
+
+    @timed("gui.update_crosstab")
+    def update_crosstab(self):
+        """Wyświetla zestawienie krzyżowe wybranych wymiarów (zestawienie bazy z pamięci + zmiany od zbudowania ramki)."""
+        from budget_analytics import crosstab, format_crosstab                    # już wczytany przez zakładkę
+        rows, columns = self.crosstab_rows_var.get(), self.crosstab_columns_var.get()
+        measure = self.crosstab_measure_var.get()
+        tab = crosstab(self.transactions.analytics_frame(self.current_user), rows, columns, measure)  # ramka aktualizowana przyrostowo
+        self.crosstab_text.config(state="normal")                                 # włącz edycję
+        self.crosstab_text.delete("1.0", tk.END)                                  # wyczyść
+        self.crosstab_text.insert("1.0", format_crosstab(tab, f"{measure.capitalize()}: {rows} × {columns}"))  # całość naraz
+        self.crosstab_text.config(state="disabled")                               # zablokuj edycję
+
+    def poll_chart_future(self, future, key):
+        """Sprawdza, czy wątek skończył rysować; wynik pokazuje tylko dla najnowszego zlecenia."""
+        self.chart_poll_job = None
+        if not future.done():
+            self.chart_poll_job = self.after(CHART_POLL_MS, self.poll_chart_future, future, key)  # sprawdź później
+            return
+        if key == self.chart_key:                                                 # nie nadeszły nowsze dane?
+            self.show_chart_images(future.result())                               # błąd rysowania -> wyjątek Tk
+
+    @timed("gui.show_chart_images")
+    def show_chart_images(self, images):
+        """Wstawia gotowe bitmapy (PPM) na płótna wykresów."""
+        for name, ppm in images.items():
+            image = tk.PhotoImage(data=ppm, format="PPM")                         # obraz Tk z pikseli
+            canvas = self.chart_canvases[name]
+            canvas.delete("all")                                                  # poprzednia bitmapa
+            canvas.create_image(0, 0, image=image, anchor="nw")                   # nowa bitmapa
+            self.chart_images[name] = image                                       # trzymaj referencję
+
+    def cancel_chart_jobs(self):
+        """Anuluje zaplanowane rysowanie i sprawdzanie wyniku (wylogowanie, wyjście)."""
+        for job in (self.chart_job, self.chart_poll_job):
+            if job is not None:
+                self.after_cancel(job)                                            # usuń timer Tk
+        self.chart_job = self.chart_poll_job = None
 
     # --- ZAKŁADKA: BUDŻET ---
     def create_budget_tab(self):
@@ -682,8 +851,29 @@ class BudgetApp(tk.Tk):
         self.budget_limit_var = tk.StringVar()                               # zmienna limit
         ttk.Entry(top_frame, textvariable=self.budget_limit_var, width=10).pack(side="left", padx=5)  # pole
 
+        ttk.Label(top_frame, text="Okres:").pack(side="left", padx=5)       # etykieta
+        self.budget_period_var = tk.StringVar(value=BUDGET_PERIOD_LABELS[PERIOD_MONTH])  # domyślnie miesiąc
+        ttk.Combobox(top_frame, textvariable=self.budget_period_var, width=10, state="readonly",
+                     values=[BUDGET_PERIOD_LABELS[p] for p in PERIODS]).pack(side="left", padx=5)  # wybór okresu
+
         ttk.Button(top_frame, text="Ustaw / Zmień limit", command=self.set_budget).pack(side="left", padx=5)  # przycisk
 
+        view_frame = ttk.Frame(self.tab_budget)                      # ramka wyboru okresu raportu
+        view_frame.pack(side="top", fill="x", padx=5)                # umieść
+        ttk.Label(view_frame, text="Zestawienie:").pack(side="left", padx=5)  # etykieta
+        self.planning_period = PERIOD_MONTH                          # okres widoku
+        self.planning_day = datetime.today().toordinal()             # dzień w wyświetlanym okresie
+        self.planning_period_var = tk.StringVar(value=BUDGET_PERIOD_LABELS[PERIOD_MONTH])  # domyślnie miesiąc
+        period_combo = ttk.Combobox(view_frame, textvariable=self.planning_period_var, width=10, state="readonly",
+                                    values=[BUDGET_PERIOD_LABELS[p] for p in PLANNING_PERIODS])  # miesiąc/kwartał/rok
+        period_combo.pack(side="left", padx=5)
+        period_combo.bind("<<ComboboxSelected>>", lambda e: self.set_planning_period())  # zmiana okresu
+        ttk.Button(view_frame, text="◀", width=3, command=lambda: self.shift_planning_period(-1)).pack(side="left")  # poprzedni
+        self.planning_label = ttk.Label(view_frame, width=10, anchor="center")  # etykieta okresu
+        self.planning_label.pack(side="left", padx=5)
+        ttk.Button(view_frame, text="▶", width=3, command=lambda: self.shift_planning_period(1)).pack(side="left")   # następny
+        ttk.Button(view_frame, text="Bieżący", command=self.reset_planning_period).pack(side="left", padx=5)  # dziś
+
         self.budget_text = tk.Text(self.tab_budget, wrap="none")     # pole tekstowe
         self.budget_text.pack(side="left", fill="both", expand=True, padx=5, pady=5)  # umieść
 
@@ -701,46 +891,58 @@ class BudgetApp(tk.Tk):
             return                                              # wyjdź
         try:
             limit_val = float(limit_str)                        # rzutuj
+            to_grosze(limit_val)                                # inf/nan/poza zakresem -> ValueError
         except ValueError:
             messagebox.showwarning("Błąd", "Niepoprawna wartość limitu.")  # ostrzeżenie
             return
-        self.budgets[cat] = limit_val                           # ustaw w dict
-        self.save_budgets()                                     # zapisz CSV
+        period = next(p for p, label in BUDGET_PERIOD_LABELS.items()
+                      if label == self.budget_period_var.get())  # etykieta -> okres
+        self.budgets[cat] = {"limit": limit_val, "period": period}  # ustaw w dict
+        self.engine.save_budgets()                              # zapisz CSV
         self.budget_cat_var.set("")                             # wyczyść pola
         self.budget_limit_var.set("")
         self.update_budget_text()                               # odśwież widok
 
-    def update_budget_text(self):
-        """Wyświetla podsumowanie budżetów i wydatków w Text."""
-        self.budget_text.config(state="normal")                                              # włącz edycję
-        self.budget_text.delete("1.0", tk.END)                                               # wyczyść
-
-        self.budget_text.insert(tk.END, f"{'Kategoria':15s} | {'Limit':>10s} | {'Wydano':>10s} | {'Różnica':>10s}\n")  # nagłówek
-        self.budget_text.insert(tk.END, "-"*60 + "\n")                                       # linia
-
-        user_trans = [t for t in self.transactions if t["user"]==self.current_user and t["rodzaj"]=="Wydatek"]  # wydatki usera
-        expenses_by_cat = {}                                                                 # sumy per kategoria
-        for t in user_trans:                                                                 # iteruj wydatki
-            cat = t["kategoria"]                                                             # kategoria
-            expenses_by_cat[cat] = expenses_by_cat.get(cat,0)+t["kwota"]                    # sumuj
+    def set_planning_period(self):
+        """Zmienia okres zestawienia (miesiąc/kwartał/rok) i odświeża raport."""
+        self.planning_period = next(p for p in PLANNING_PERIODS
+                                    if BUDGET_PERIOD_LABELS[p] == self.planning_period_var.get())  # etykieta -> okres
+        self.update_budget_text()
 
-        all_cats = set(self.budgets.keys())|set(expenses_by_cat.keys())                     # unia kategorii
+    def shift_planning_period(self, step):
+        """Przechodzi do poprzedniego (-1) albo następnego (1) okresu zestawienia."""
+        move = next_period if step > 0 else previous_period                # w którą stronę
+        self.planning_day = move(self.planning_period, self.planning_day)  # dzień w sąsiednim okresie
+        self.update_budget_text()
 
-        for cat in sorted(all_cats):                                                         # iteruj kategorie
-            limit_val = self.budgets.get(cat, 0.0)                                          # limit
-            spent = expenses_by_cat.get(cat, 0.0)                                           # wydano
-            diff = limit_val - spent                                                        # różnica
-            line = f"{cat:15s} | {limit_val:10.2f} | {spent:10.2f} | {diff:10.2f}"          # zbuduj linię
-            if diff<0:                                                                       # przekroczono?
-                line+="  (Przekroczono!)"                                                   # dopisz ostrzeżenie
-            line+="\n"                                                                       # nowa linia
-            self.budget_text.insert(tk.END, line)                                           # wstaw linię
+    def reset_planning_period(self):
+        """Wraca do okresu zawierającego dzisiejszy dzień."""
+        self.planning_day = datetime.today().toordinal()
+        self.update_budget_text()
 
+    @timed("gui.update_budget_text")
+    def update_budget_text(self):
+        """Wyświetla zestawienie budżetów wybranego okresu z sum per (kategoria, okres) – jedno wstawienie tekstu."""
+        if not self.tab_built(self.tab_budget):                                              # zakładka niezbudowana?
+            return                                                                           # wypełni się przy otwarciu
+        period, day = self.planning_period, self.planning_day                               # wybrany okres
+        rows = planning_report(self.transactions, self.current_user, self.budgets, period, day)  # O(kategorii * okresów roku)
+        report = format_report(rows, period, day, lifetime_rows(self.transactions, self.current_user, self.budgets))
+        from budget_analytics import crosstab, format_crosstab, DIM_CATEGORY, DIM_MONTH  # import odroczony (numpy)
+        year = date.fromordinal(day).year                                                    # rok wybranego okresu
+        tab = crosstab(self.transactions.analytics_frame(self.current_user), DIM_CATEGORY, DIM_MONTH,
+                       from_ord=date(year, 1, 1).toordinal(), to_ord=date(year, 12, 31).toordinal())  # wydatki roku
+        report += "\n" + format_crosstab(tab, f"Wydatki {year:04d} wg kategorii i miesięcy:")
+        self.planning_label.config(text=period_label(period, day))                          # etykieta okresu
+        self.budget_text.config(state="normal")                                              # włącz edycję
+        self.budget_text.delete("1.0", tk.END)                                               # wyczyść
+        self.budget_text.insert("1.0", report)                                               # cały raport naraz
         self.budget_text.config(state="disabled")                                           # zablokuj edycję
 
     # --- ZAKŁADKA: KALENDARZ ---
     def create_calendar_tab(self):
         """Buduje UI zakładki 'Kalendarz'."""
+        from tkcalendar import Calendar                               # import odroczony
         self.tab_calendar.rowconfigure(0, weight=1)                   # rozciąganie w pionie
         self.tab_calendar.columnconfigure(1, weight=1)                # kolumna tekstu rozciągana
 
@@ -748,6 +950,10 @@ class BudgetApp(tk.Tk):
         self.calendar.grid(row=0, column=0, sticky="ns", padx=5, pady=5)                          # pozycja
 
         self.calendar.bind("<<CalendarSelected>>", self.on_calendar_day_selected)  # obsługa kliknięcia dnia
+        self.calendar.bind("<<CalendarMonthChanged>>", lambda e: self.mark_calendar_month())  # znaczniki nowego miesiąca
+        for level, color in enumerate(CALENDAR_SPEND_COLORS):                    # tagi intensywności wydatków
+            self.calendar.tag_config(f"spend{level}", background=color, foreground="black")
+        self.calendar.tag_config("activity", background=CALENDAR_ACTIVITY_COLOR, foreground="black")
 
         self.calendar_text = tk.Text(self.tab_calendar, wrap="none")           # pole tekstowe
         self.calendar_text.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)  # umieść
@@ -756,8 +962,34 @@ class BudgetApp(tk.Tk):
         self.calendar_text.configure(yscrollcommand=scroll_y.set)                  # powiąż scroll
         scroll_y.grid(row=0, column=2, sticky="ns")                                # umieść
 
+        self.mark_calendar_month()                                                 # znaczniki bieżącego miesiąca
         self.show_calendar_day_transactions(datetime.today().strftime("%Y-%m-%d")) # pokaż dzisiejsze
 
+    def mark_calendar_month(self):
+        """Oznacza dni wyświetlanego miesiąca kolorem wg wydatków (jeden przebieg po słowniku dni)."""
+        month, year = self.calendar.get_displayed_month()                      # wyświetlany miesiąc
+        first = date(year, month, 1)                                           # pierwszy dzień
+        last = first.replace(day=calendar.monthrange(year, month)[1])          # ostatni dzień
+        activity = self.transactions.day_activity(self.current_user, first.toordinal(), last.toordinal())  # O(dni)
+        self.calendar.calevent_remove("all")                                   # znaczniki poprzedniego miesiąca
+        top = max((spent for _, spent in activity.values()), default=0)        # najwyższe wydatki dnia w miesiącu
+        levels = len(CALENDAR_SPEND_COLORS)
+        for ordinal, (count, spent) in activity.items():
+            if spent > 0:
+                tag = f"spend{min(levels - 1, spent * levels // top)}"        # próg względem maksimum miesiąca
+                text = f"Wydatki: {from_grosze(spent):.2f} zł, transakcji: {count}"  # podpowiedź dnia
+            else:
+                tag, text = "activity", f"Transakcji: {count}"
+            self.calendar.calevent_create(date.fromordinal(ordinal), text, tag)
+
+    @timed("gui.update_calendar")
+    def update_calendar(self):
+        """Odświeża znaczniki miesiąca i listę wybranego dnia po zmianie transakcji."""
+        if not self.tab_built(self.tab_calendar):          # zakładka niezbudowana?
+            return
+        self.mark_calendar_month()                         # nowe sumy dni
+        self.show_calendar_day_transactions(self.calendar.get_date())  # wybrany dzień
+
     def on_calendar_day_selected(self, event):
         """Obsługuje wybór dnia w kalendarzu."""
         date_str = self.calendar.get_date()                # pobierz datę
@@ -765,7 +997,8 @@ class BudgetApp(tk.Tk):
 
     def show_calendar_day_transactions(self, date_str):
         """Wstawia do pola tekstowego transakcje z wybranego dnia."""
-        user_trans = [t for t in self.transactions if t["user"]==self.current_user and t["data"]==date_str]  # filtr
+        day = date_to_ordinal(date_str)                     # dzień jako ordinal
+        user_trans = self.transactions.for_day(self.current_user, day)  # słownik dni (bez wyszukiwania)
         self.calendar_text.config(state="normal")           # włącz edycję
         self.calendar_text.delete("1.0", tk.END)            # czyść
         self.calendar_text.insert(tk.END, f"Transakcje z dnia {date_str}:\n")  # nagłówek
@@ -774,13 +1007,14 @@ class BudgetApp(tk.Tk):
             self.calendar_text.insert(tk.END, "Brak transakcji.\n")            # info
         else:
             for t in user_trans:                            # iteruj transakcje
-                line = f"{t['rodzaj']} | {t['kategoria']} | {t['opis']} | {t['kwota']:.2f} zł\n"  # linia
+                line = f"{t.rodzaj} | {t.kategoria} | {t.opis} | {t.kwota:.2f} zł\n"  # linia
                 self.calendar_text.insert(tk.END, line)     # wstaw
         self.calendar_text.config(state="disabled")         # zablokuj
 
     # --- ZAKŁADKA: CYKLICZNE ---
     def create_recurring_tab(self):
         """Buduje UI zakładki 'Cykliczne'."""
+        from tkcalendar import DateEntry                           # import odroczony
         self.tab_recurring.rowconfigure(1, weight=1)               # rozciąganie w pionie
         self.tab_recurring.columnconfigure(0, weight=1)            # rozciąganie w poziomie
 
@@ -813,14 +1047,19 @@ class BudgetApp(tk.Tk):
         self.rec_desc_var = tk.StringVar()                                                            # zmienna opis
         ttk.Entry(form_frame, textvariable=self.rec_desc_var, width=30).grid(row=1, column=5, padx=5, sticky="w")  # pole
 
+        ttk.Label(form_frame, text="Harmonogram:").grid(row=2, column=0, padx=5, sticky="e")         # etykieta harmonogram
+        self.rec_schedule_var = tk.StringVar(value=SCHEDULE_LABELS[SCHEDULE_INTERVAL])               # domyślnie co N dni
+        ttk.Combobox(form_frame, textvariable=self.rec_schedule_var, width=32, state="readonly",
+                     values=[SCHEDULE_LABELS[s] for s in SCHEDULES]).grid(row=2, column=1, columnspan=3, padx=5, sticky="w")  # wybór
+
         self.rec_add_button = ttk.Button(form_frame, text="Dodaj", command=self.add_recurring)        # przycisk dodaj
-        self.rec_add_button.grid(row=0, column=6, rowspan=2, padx=5, pady=5, sticky="ns")             # pozycja
+        self.rec_add_button.grid(row=0, column=6, rowspan=3, padx=5, pady=5, sticky="ns")             # pozycja
 
         self.rec_edit_button = ttk.Button(form_frame, text="Edytuj zazn.", command=self.edit_recurring)  # przycisk edytuj
-        self.rec_edit_button.grid(row=0, column=7, rowspan=2, padx=5, pady=5, sticky="ns")               # pozycja
+        self.rec_edit_button.grid(row=0, column=7, rowspan=3, padx=5, pady=5, sticky="ns")               # pozycja
 
         self.rec_save_button = ttk.Button(form_frame, text="Zapisz zmiany", command=self.save_edited_recurring)  # przycisk zapisz
-        self.rec_save_button.grid(row=0, column=8, rowspan=2, padx=5, pady=5, sticky="ns")                       # pozycja
+        self.rec_save_button.grid(row=0, column=8, rowspan=3, padx=5, pady=5, sticky="ns")                       # pozycja
         self.rec_save_button["state"] = "disabled"                                                                # nieaktywny
 
         table_frame = ttk.Frame(self.tab_recurring)                    # ramka tabeli
@@ -831,7 +1070,7 @@ class BudgetApp(tk.Tk):
         rec_columns = ("next_date", "interval", "rodzaj", "kategoria", "kwota", "opis", "id")  # kolumny
         self.rec_tree = ttk.Treeview(table_frame, columns=rec_columns, show="headings")        # tabela
         self.rec_tree.heading("next_date", text="Nast. Data")                                  # nagłówek
-        self.rec_tree.heading("interval", text="Odstęp(dni)")                                  # j.w.
+        self.rec_tree.heading("interval", text="Harmonogram")                                  # j.w.
         self.rec_tree.heading("rodzaj", text="Rodzaj")                                         # j.w.
         self.rec_tree.heading("kategoria", text="Kategoria")                                   # j.w.
         self.rec_tree.heading("kwota", text="Kwota")                                           # j.w.
@@ -839,7 +1078,7 @@ class BudgetApp(tk.Tk):
         self.rec_tree.heading("id", text="ID")                                                 # j.w.
 
         self.rec_tree.column("next_date", width=100, anchor="center")                          # kolumny parametry
-        self.rec_tree.column("interval", width=80, anchor="center")                            # j.w.
+        self.rec_tree.column("interval", width=150, anchor="center")                           # j.w.
         self.rec_tree.column("rodzaj", width=80, anchor="center")                              # j.w.
         self.rec_tree.column("kategoria", width=120, anchor="w")                               # j.w.
         self.rec_tree.column("kwota", width=80, anchor="e")                                    # j.w.
@@ -859,13 +1098,15 @@ class BudgetApp(tk.Tk):
 
     def update_recurring_table(self):
         """Odświeża tabelę cyklicznych (tylko bieżącego usera)."""
+        if not self.tab_built(self.tab_recurring):                  # zakładka niezbudowana?
+            return                                                  # wypełni się przy otwarciu
         for row_id in self.rec_tree.get_children():                 # usuń stare wiersze
             self.rec_tree.delete(row_id)                            # kasuj
         for rec_id, rec_data in self.recurring.items():             # iteruj cykliczne
             if rec_data["user"] == self.current_user:               # filtr user
                 self.rec_tree.insert("", "end", values=(            # wstaw wiersz
                     rec_data["next_date"],
-                    rec_data["interval_days"],
+                    describe(rec_data),
                     rec_data["rodzaj"],
                     rec_data["kategoria"],
                     f"{rec_data['kwota']:.2f}",
@@ -886,25 +1127,29 @@ class BudgetApp(tk.Tk):
             messagebox.showwarning("Błąd", "Wypełnij wymagane pola (data, odstęp, kwota).")  # ostrzeżenie
             return
         try:
-            interval_days = int(interval_str)                  # rzutuj odstęp
+            schedule = self.recurring_schedule_fields(next_date_str, interval_str)  # harmonogram z formularza
             kwota = float(kwota_str)                           # rzutuj kwotę
+            to_grosze(kwota)                                   # inf/nan/poza zakresem -> ValueError
         except ValueError:
-            messagebox.showwarning("Błąd", "Niepoprawne wartości (odstęp, kwota).")  # ostrzeżenie
+            messagebox.showwarning("Błąd", "Niepoprawne wartości (data, odstęp, kwota).")  # ostrzeżenie
             return
 
         rec_id = uuid.uuid4().hex                              # unikalne ID
         new_data = {                                           # dane cyklicznej
             "user": self.current_user,
             "next_date": next_date_str,
-            "interval_days": interval_days,
+            **schedule,
             "rodzaj": rodzaj,
             "kategoria": kat if kat else "Brak",
             "kwota": kwota,
             "opis": opis
         }
+        normalize(new_data)                                    # pierwsze wystąpienie zgodne z harmonogramem
         self.recurring[rec_id] = new_data                      # zapisz w dict
-        self.save_recurring()                                  # zapisz plik
+        self.engine.save_recurring()                           # zapisz plik
         self.update_recurring_table()                          # odśwież tabelę
+        self.engine.scheduler.push(rec_id)                     # do kopca harmonogramu
+        self.schedule_recurring_check()                        # może być należna wcześniej niż inne
 
         self.rec_next_date_var.set("")                         # wyczyść pola
         self.rec_interval_var.set("30")
@@ -912,6 +1157,22 @@ class BudgetApp(tk.Tk):
         self.rec_amount_var.set("")
         self.rec_desc_var.set("")
 
+    def recurring_schedule_fields(self, start_str, interval_str):
+        """Zwraca pola harmonogramu z formularza (dzień/dzień tygodnia z daty startu); ValueError przy błędzie."""
+        schedule = next(s for s, label in SCHEDULE_LABELS.items()
+                        if label == self.rec_schedule_var.get())      # etykieta -> harmonogram
+        start = datetime.strptime(start_str, "%Y-%m-%d")              # data startu
+        if schedule == SCHEDULE_INTERVAL:
+            interval_days = int(interval_str)                         # rzutuj odstęp
+            if interval_days <= 0:
+                raise ValueError(interval_str)                        # 0 dni = pętla bez końca
+            return {"schedule": schedule, "interval_days": interval_days}
+        if schedule == SCHEDULE_MONTHLY_DAY:
+            return {"schedule": schedule, "day": start.day}           # dzień miesiąca
+        if schedule == SCHEDULE_WEEKLY:
+            return {"schedule": schedule, "weekday": start.weekday()} # dzień tygodnia
+        return {"schedule": schedule}                                 # ostatni dzień roboczy
+
     def remove_recurring(self):
         """Usuwa zaznaczoną transakcję cykliczną."""
         selection = self.rec_tree.selection()        # zaznaczenie
@@ -924,7 +1185,7 @@ class BudgetApp(tk.Tk):
 
         if rec_id in self.recurring:                 # jeśli istnieje w dict
             del self.recurring[rec_id]               # usuń
-            self.save_recurring()                    # zapisz plik
+            self.engine.save_recurring()             # zapisz plik
 
     def edit_recurring(self):
         """Ładuje zaznaczoną cykliczną do formularza do edycji."""
@@ -933,10 +1194,12 @@ class BudgetApp(tk.Tk):
             return                                           # wyjdź
         item_id = selection[0]                               # id wiersza
         values = self.rec_tree.item(item_id, "values")       # wartości (krotka)
-        next_date, interval_str, rodzaj, kat, kwota_str, opis, rec_id = values  # rozpakuj
+        next_date, _, rodzaj, kat, kwota_str, opis, rec_id = values  # rozpakuj
+        rule = self.recurring.get(rec_id, {})                # pełna reguła (pola harmonogramu)
 
         self.rec_next_date_var.set(next_date)                # ustaw datę
-        self.rec_interval_var.set(interval_str)              # ustaw odstęp
+        self.rec_interval_var.set(str(rule.get("interval_days", 30)))  # ustaw odstęp
+        self.rec_schedule_var.set(SCHEDULE_LABELS[schedule_of(rule)])  # ustaw harmonogram
         self.rec_type_var.set(rodzaj)                        # ustaw rodzaj
         self.rec_cat_var.set(kat)                            # ustaw kategorię
         self.rec_amount_var.set(kwota_str)                   # ustaw kwotę
@@ -959,37 +1222,44 @@ class BudgetApp(tk.Tk):
         new_opis = self.rec_desc_var.get().strip()           # nowy opis
 
         try:
-            new_interval = int(new_interval_str)             # rzutuj odstęp
+            new_schedule = self.recurring_schedule_fields(new_date, new_interval_str)  # nowy harmonogram
             new_kwota = float(new_kwota_str)                 # rzutuj kwotę
+            to_grosze(new_kwota)                             # inf/nan/poza zakresem -> ValueError
         except ValueError:
             messagebox.showwarning("Błąd", "Niepoprawne wartości.")  # ostrzeżenie
             return
 
         if rec_id in self.recurring:                         # jeśli ID istnieje
+            for field in ("interval_days", "day", "weekday"):
+                self.recurring[rec_id].pop(field, None)      # pola poprzedniego harmonogramu
             self.recurring[rec_id]["next_date"] = new_date   # zapisz nową datę
-            self.recurring[rec_id]["interval_days"] = new_interval  # nowy odstęp
+            self.recurring[rec_id].update(new_schedule)      # nowy harmonogram
             self.recurring[rec_id]["rodzaj"] = new_rodzaj    # nowy rodzaj
             self.recurring[rec_id]["kategoria"] = new_kat if new_kat else "Brak"  # nowa kat
             self.recurring[rec_id]["kwota"] = new_kwota      # nowa kwota
             self.recurring[rec_id]["opis"] = new_opis        # nowy opis
+            normalize(self.recurring[rec_id])                # wyrównaj datę do harmonogramu
 
-        self.save_recurring()                                 # zapisz plik
+        self.engine.save_recurring()                          # zapisz plik
         self.update_recurring_table()                         # odśwież tabelę
+        self.engine.scheduler.push(rec_id)                    # stary wpis kopca stanie się nieaktualny
+        self.schedule_recurring_check()                       # nowa data może być najbliższa
 
         self.rec_save_button["state"] = "disabled"            # wyłącz przycisk
         del self.current_edit_rec_id                          # usuń znacznik
 
         self.rec_next_date_var.set("")                        # wyczyść formularz
         self.rec_interval_var.set("30")
+        self.rec_schedule_var.set(SCHEDULE_LABELS[SCHEDULE_INTERVAL])
         self.rec_cat_var.set("")
         self.rec_amount_var.set("")
         self.rec_desc_var.set("")
 
     # --- ZAKŁADKA: USTAWIENIA ---
     def create_settings_tab(self):
-        """Buduje UI zakładki 'Ustawienia' (motywy ttk)."""
+        """Buduje UI zakładki 'Ustawienia' (motywy ttk, magazyn danych, diagnostyka)."""
         settings_frame = ttk.LabelFrame(self.tab_settings, text="Motywy (Themes)")  # ramka
-        settings_frame.pack(fill="both", expand=True, padx=10, pady=10)             # umieść
+        settings_frame.pack(fill="x", padx=10, pady=10)                             # umieść
 
         self.available_themes = [                     # lista motywów (nie wszystkie dostępne)
             "clam", "alt", "default", "classic",
@@ -1006,6 +1276,100 @@ class BudgetApp(tk.Tk):
 
         ttk.Button(settings_frame, text="Zastosuj", command=self.apply_theme).pack(pady=5)  # przycisk zastosuj
 
+        storage_frame = ttk.LabelFrame(self.tab_settings, text="Magazyn danych")    # ramka magazynu
+        storage_frame.pack(fill="x", padx=10, pady=10)                              # umieść
+        self.backend_var = tk.StringVar(value=BACKEND_LABELS[self.engine.backend])  # bieżący magazyn
+        ttk.Combobox(storage_frame, textvariable=self.backend_var, values=list(BACKEND_LABELS.values()),
+                     state="readonly", width=70).pack(pady=5)                       # wybór magazynu
+        ttk.Label(storage_frame, text=SQLITE_PLAINTEXT_NOTE, wraplength=600, justify="left").pack(padx=5)  # cena SQLite
+        ttk.Button(storage_frame, text="Przenieś dane", command=self.switch_backend).pack(pady=5)  # przycisk
+
+        diag_frame = ttk.LabelFrame(self.tab_settings, text="Diagnostyka")          # ramka diagnostyki
+        diag_frame.pack(fill="both", expand=True, padx=10, pady=10)                 # umieść
+        options = ttk.Frame(diag_frame)                                             # przełączniki i przyciski
+        options.pack(fill="x")
+        self.diag_enabled_var = tk.BooleanVar(value=DIAGNOSTICS.enabled)            # pomiary włączone?
+        ttk.Checkbutton(options, text=f"Pomiary czasu (log: {DIAGNOSTICS_LOG})", variable=self.diag_enabled_var,
+                        command=self.toggle_diagnostics).pack(side="left", padx=5)  # przełącznik pomiarów
+        self.diag_tracing_var = tk.BooleanVar(value=DIAGNOSTICS.tracing)            # tracemalloc włączony?
+        ttk.Checkbutton(options, text="Śledzenie pamięci (tracemalloc)", variable=self.diag_tracing_var,
+                        command=self.toggle_tracemalloc).pack(side="left", padx=5)  # przełącznik tracemalloc
+        ttk.Button(options, text="Odśwież", command=self.update_diagnostics_text).pack(side="left", padx=5)
+        ttk.Button(options, text="Zrzut pamięci", command=self.show_memory_snapshot).pack(side="left", padx=5)
+        ttk.Button(options, text="Wyczyść", command=self.reset_diagnostics).pack(side="left", padx=5)
+        self.diag_text = tk.Text(diag_frame, wrap="none", height=14)               # statystyki pomiarów
+        self.diag_text.pack(fill="both", expand=True, padx=5, pady=5)              # umieść
+        self.update_diagnostics_text()                                              # stan na otwarcie zakładki
+
+    def switch_backend(self):
+        """Zapisuje dane i otwiera je ponownie w wybranym magazynie (jednorazowe przeniesienie)."""
+        backend = next(b for b, label in BACKEND_LABELS.items() if label == self.backend_var.get())  # etykieta -> nazwa
+        if backend == self.engine.backend:                   # bez zmiany
+            return
+        if backend == BACKEND_SQLITE and not messagebox.askyesno("Magazyn danych", f"{SQLITE_PLAINTEXT_NOTE}\n\nPrzenieść dane?"):
+            self.backend_var.set(BACKEND_LABELS[self.engine.backend])  # zostaje bieżący magazyn
+            return
+        self.cancel_recurring_check()                        # harmonogram wskazuje stary silnik
+        self.config(cursor="watch")                          # kursor oczekiwania
+        self.update_idletasks()
+        self.engine.save_all()                               # snapshot / zapieczętowana baza
+        try:
+            self.engine = BudgetEngine(self.global_key, self.current_user, backend=backend).open()  # przeniesienie danych
+        except Exception as exc:                             # dane zostają w starym magazynie
+            self.engine = BudgetEngine(self.global_key, self.current_user, backend=self.engine.backend).open()  # stary magazyn
+            messagebox.showwarning("Błąd", f"Nie udało się przenieść danych: {exc}")
+        finally:
+            self.config(cursor="")                           # zwykły kursor
+        self.transactions = self.engine.store                # nowe aliasy
+        self.budgets = self.engine.budgets
+        self.recurring = self.engine.recurring
+        self.apply_filter()                                  # odśwież widoki
+        self.update_analysis_charts()
+        self.update_budget_text()
+        self.update_calendar()
+        self.update_recurring_table()
+        self.schedule_recurring_check()                      # kopiec nowego silnika
+        self.backend_var.set(BACKEND_LABELS[self.engine.backend])  # faktyczny magazyn
+        if self.engine.backend == backend:
+            messagebox.showinfo("Magazyn danych", f"Dane są teraz w magazynie: {BACKEND_LABELS[backend]}.")
+
+    def toggle_diagnostics(self):
+        """Włącza/wyłącza pomiary czasu i log rotowany (wyłączenie zatrzymuje też tracemalloc)."""
+        if self.diag_enabled_var.get():
+            DIAGNOSTICS.enable()                                   # log obok plików danych
+        else:
+            DIAGNOSTICS.disable()
+            self.diag_tracing_var.set(False)                       # tracemalloc zatrzymany razem z pomiarami
+        self.update_diagnostics_text()
+
+    def toggle_tracemalloc(self):
+        """Włącza/wyłącza śledzenie alokacji (spowalnia aplikację – tylko na czas szukania problemu)."""
+        if self.diag_tracing_var.get():
+            DIAGNOSTICS.start_tracemalloc()
+        else:
+            DIAGNOSTICS.stop_tracemalloc()
+        self.update_diagnostics_text()
+
+    def show_memory_snapshot(self):
+        """Pokazuje największe miejsca alokacji pod statystykami (i zapisuje je w logu)."""
+        snapshot = DIAGNOSTICS.memory_snapshot()
+        if not snapshot:
+            messagebox.showwarning("Błąd", "Najpierw włącz śledzenie pamięci (tracemalloc).")  # ostrzeżenie
+            return
+        self.update_diagnostics_text("\n" + snapshot + "\n")
+
+    def reset_diagnostics(self):
+        """Czyści statystyki i liczniki pomiarów."""
+        DIAGNOSTICS.reset()
+        self.update_diagnostics_text()
+
+    def update_diagnostics_text(self, extra=""):
+        """Wyświetla statystyki pomiarów (i opcjonalny dopisek, np. zrzut pamięci) – jedno wstawienie tekstu."""
+        self.diag_text.config(state="normal")                     # włącz edycję
+        self.diag_text.delete("1.0", tk.END)                      # wyczyść
+        self.diag_text.insert("1.0", DIAGNOSTICS.report() + extra)  # cały raport naraz
+        self.diag_text.config(state="disabled")                   # zablokuj edycję
+
     def apply_theme(self):
         """Ustawia wybrany motyw ttk, jeśli dostępny."""
         chosen_theme = self.theme_var.get()         # pobierz z comboboxa
@@ -1016,6 +1380,7 @@ class BudgetApp(tk.Tk):
 
 # --- WEJŚCIE PROGRAMU: NAJPIERW LOGOWANIE, POTEM APLIKACJA ---
 if __name__ == "__main__":                              # uruchomiono bezpośrednio?
+    DIAGNOSTICS.enable_from_env()                       # BUDGET_DIAGNOSTICS=1 -> pomiary od startu
     users = load_users()                                # wczytaj użytkowników
     current = run_login_dialog(users)                   # pokaż logowanie i pobierz usera
     if not current:                                     # jeśli anulowano
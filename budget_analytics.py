@@ -0,0 +1,344 @@
+# --- ANALITYKA: KOLUMNY NUMPY I ZESTAWIENIA KRZYŻOWE (GROUP BY) JEDNYM PRZEBIEGIEM (BEZ GUI) ---
+"""
+Ramka analityczna użytkownika (AnalyticsFrame) trzyma jego transakcje jako tablice NumPy: data (ordinal),
+kwota (grosze), kod rodzaju i kod kategorii. Zestawienie krzyżowe dowolnych dwóch wymiarów (kategoria, rodzaj,
+rok, kwartał, miesiąc, dzień tygodnia) to jeden np.bincount po kluczu 'wiersz * liczba_kolumn + kolumna' –
+bez pętli Pythona po wierszach. Wymiary czasu liczone są przez tablicę przejść dzień -> okres dla zakresu dni
+historii (kilka tysięcy dni), a nie przez konwersję każdej daty.
+Ramki buduje i trzyma magazyn (analytics_frame); późniejsze zmiany wierszy ramka dokłada do krótkiej listy
+zmian (O(1) na wiersz), a zestawienia kolumn bazowych pamięta – odświeżenie widoku po edycji nie przechodzi
+przez całą historię. NumPy jest importowany dopiero tutaj.
+"""
+from datetime import date      # etykiety okresów
+
+import numpy as np             # kolumny i jądra group-by
+
+from budget_store import INCOME, EXPENSE, from_grosze   # rodzaje, grosze -> zł
+from budget_recurring import WEEKDAY_NAMES              # etykiety dni tygodnia
+
+DIM_CATEGORY = "kategoria"     # wymiar: kategoria
+DIM_KIND = "rodzaj"            # wymiar: przychód / wydatek
+DIM_YEAR = "rok"               # wymiar: rok
+DIM_QUARTER = "kwartał"        # wymiar: kwartał roku
+DIM_MONTH = "miesiąc"          # wymiar: miesiąc
+DIM_WEEKDAY = "dzień tygodnia" # wymiar: dzień tygodnia (pon–nd)
+DIMENSIONS = (DIM_CATEGORY, DIM_KIND, DIM_YEAR, DIM_QUARTER, DIM_MONTH, DIM_WEEKDAY)  # wszystkie wymiary
+
+MEASURE_EXPENSE = "wydatki"    # suma wydatków (grosze)
+MEASURE_INCOME = "przychody"   # suma przychodów (grosze)
+MEASURE_NET = "saldo"          # przychody - wydatki (grosze)
+MEASURE_COUNT = "liczba"       # liczba transakcji
+MEASURES = (MEASURE_EXPENSE, MEASURE_INCOME, MEASURE_NET, MEASURE_COUNT)  # wszystkie miary
+
+ANALYTICS_DELTA_ROWS = 2048    # ile zmian ramka trzyma jako listę, zanim magazyn zbuduje ją od nowa
+ANALYTICS_TABLES = 64          # ile zestawień kolumn bazowych (wymiary, miara, zakres dat) ramka pamięta
+
+# --- RAMKA ---
+class AnalyticsFrame:
+    """
+    Transakcje jednego użytkownika jako kolumny NumPy (baza, posortowana wg daty, niezmienna) i lista zmian
+    dołożonych później (pending). kind_labels / cat_labels: kod -> nazwa (kody to indeksy tych list, nowe nazwy
+    dopisywane na końcu). Kody wymiarów, klucze komórek, wagi miar i zestawienia bazy są liczone raz na ramkę.
+    """
+    __slots__ = ("dates", "amounts", "kinds", "cats", "kind_labels", "cat_labels", "pending",
+                 "_kind_codes", "_cat_codes", "_cache", "_tables")
+
+    def __init__(self, dates, amounts, kinds, cats, kind_labels, cat_labels):
+        self.dates = np.asarray(dates, dtype=np.int32)       # data (ordinal)
+        self.amounts = np.asarray(amounts, dtype=np.int64)   # kwota w groszach
+        self.kinds = np.asarray(kinds, dtype=np.intp)        # kod rodzaju
+        self.cats = np.asarray(cats, dtype=np.intp)          # kod kategorii
+        if len(self.dates) > 1 and (self.dates[1:] < self.dates[:-1]).any():
+            days = self.dates - self.dates.min()             # wiersze wg daty: zakres dat to wycinek (widok)
+            if days.max() < 1 << 16:
+                days = days.astype(np.uint16)                # sortowanie pozycyjne (radix) zamiast porównań
+            order = np.argsort(days, kind="stable")
+            self.dates, self.amounts = self.dates[order], self.amounts[order]
+            self.kinds, self.cats = self.kinds[order], self.cats[order]
+        self.kind_labels = list(kind_labels)                 # kod rodzaju -> nazwa
+        self.cat_labels = list(cat_labels)                   # kod kategorii -> nazwa
+        self._kind_codes = {name: code for code, name in enumerate(self.kind_labels)}  # nazwa -> kod
+        self._cat_codes = {name: code for code, name in enumerate(self.cat_labels)}
+        self.pending = []                                    # zmiany po zbudowaniu: (ordinal, rodzaj, kategoria, grosze, znak)
+        self._cache = {}                                     # wymiar/miara/para wymiarów -> tablice bazy
+        self._tables = {}                                    # (wymiary, miara, zakres) -> zestawienie bazy
+
+    @classmethod
+    def from_columns(cls, users, dates, kinds, cats, amounts, alive, ucode, kind_labels, cat_labels):
+        """
+        Ramka z kolumn magazynu (array / bytearray – czytane przez bufor, bez kopiowania całości do list):
+        maska 'aktywny i tego użytkownika' wybiera wiersze jednym przebiegiem.
+        """
+        mask = np.frombuffer(alive, dtype=np.uint8).astype(bool)          # kopia maski (bufor zwolniony od razu)
+        mask &= np.frombuffer(users, dtype=np.uint32) == ucode
+        return cls(np.frombuffer(dates, dtype=np.int32)[mask], np.frombuffer(amounts, dtype=np.int64)[mask],
+                   np.frombuffer(kinds, dtype=np.uint8)[mask], np.frombuffer(cats, dtype=np.uint32)[mask],
+                   kind_labels, cat_labels)                               # indeksowanie maską kopiuje
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Ramka z krotek (ordinal, rodzaj, kategoria, grosze) – np. z zapytania SQLite."""
+        kinds, cats = {}, {}                                               # nazwa -> kod
+        coded = np.array([(d, kinds.setdefault(r, len(kinds)), cats.setdefault(k, len(cats)), g)
+                          for d, r, k, g in rows], dtype=np.int64).reshape(-1, 4)
+        return cls(coded[:, 0], coded[:, 3], coded[:, 1], coded[:, 2], kinds, cats)
+
+    def __len__(self):
+        return len(self.dates) + sum(change[4] for change in self.pending)
+
+    # --- ZMIANY ---
+    def apply(self, ordinal, kind, category, grosze, sign):
+        """Dokłada zmianę wiersza (sign 1 = dodany, -1 = usunięty – z polami sprzed usunięcia); O(1)."""
+        self.pending.append((ordinal, _code(self.kind_labels, self._kind_codes, kind),
+                             _code(self.cat_labels, self._cat_codes, category), grosze, sign))
+
+    @property
+    def stale(self) -> bool:
+        """Czy lista zmian urosła tak, że taniej zbudować ramkę od nowa (decyduje magazyn)."""
+        return len(self.pending) > ANALYTICS_DELTA_ROWS
+
+    def pending_cells(self, rows, columns, measure, from_ord=None, to_ord=None) -> dict:
+        """Zmiany jako {(kod wiersza, kod kolumny): [liczba, wartość]} (kody jak w codes() + przesunięcie)."""
+        lo = -1 if from_ord is None else from_ord
+        hi = 1 << 31 if to_ord is None else to_ord
+        income, expense = self._kind_codes.get(INCOME), self._kind_codes.get(EXPENSE)
+        cells = {}
+        for ordinal, kind, cat, grosze, sign in self.pending:
+            if not lo <= ordinal <= hi:
+                continue
+            if measure == MEASURE_EXPENSE or measure == MEASURE_INCOME:
+                if kind != (expense if measure == MEASURE_EXPENSE else income):
+                    continue                                                # inny rodzaj
+                value = grosze
+            elif measure == MEASURE_NET:
+                value = grosze if kind == income else -grosze if kind == expense else 0
+            else:
+                value = 1                                                   # liczba transakcji
+            key = (_row_code(rows, ordinal, kind, cat), _row_code(columns, ordinal, kind, cat))
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [0, 0]
+            cell[0] += sign
+            cell[1] += sign * value
+        return cells
+
+    # --- BAZA ---
+    def weights(self, measure):
+        """
+        Wagi wierszy bazy dla miary i maska wierszy tej miary (float64 dla np.bincount), liczone raz na ramkę:
+        wydatki/przychody – kwota tylko w wierszach danego rodzaju, saldo – kwota ze znakiem, liczba – (None, None).
+        """
+        if measure == MEASURE_COUNT:
+            return None, None
+        if measure not in self._cache:
+            if measure == MEASURE_NET:
+                sign = np.zeros(len(self.kind_labels), dtype=np.int64)
+                for kind, value in ((INCOME, 1), (EXPENSE, -1)):
+                    if kind in self._kind_codes:
+                        sign[self._kind_codes[kind]] = value
+                self._cache[measure] = (self.amounts * sign[self.kinds]).astype(np.float64), None  # przychód +, wydatek -
+            elif measure in (MEASURE_EXPENSE, MEASURE_INCOME):
+                code = self._kind_codes.get(EXPENSE if measure == MEASURE_EXPENSE else INCOME, -1)
+                hits = (self.kinds == code).astype(np.float64)  # 1.0 = wiersz tego rodzaju
+                self._cache[measure] = self.amounts * hits, hits
+            else:
+                raise ValueError(f"Nieznana miara: {measure}")
+        return self._cache[measure]
+
+    def cell_keys(self, rows, columns):
+        """
+        Klucz komórki 'wiersz * liczba_kolumn + kolumna' każdego wiersza bazy oraz przesunięcie i liczba kodów
+        obu wymiarów: (klucze, (przesunięcie, liczba) wierszy, (przesunięcie, liczba) kolumn). Raz na parę.
+        """
+        pair = (rows, columns)
+        if pair not in self._cache:
+            row_codes, row_span = self.codes(rows)
+            col_codes, col_span = self.codes(columns)
+            self._cache[pair] = row_codes * col_span[1] + col_codes, row_span, col_span
+        return self._cache[pair]
+
+    def span(self, from_ord=None, to_ord=None):
+        """Wycinek wierszy bazy z datą w [od, do] (wyszukiwanie binarne po posortowanych datach)."""
+        start = 0 if from_ord is None else int(np.searchsorted(self.dates, from_ord, "left"))
+        stop = len(self.dates) if to_ord is None else int(np.searchsorted(self.dates, to_ord, "right"))
+        return slice(start, max(start, stop))
+
+    def table(self, rows, columns, measure, from_ord=None, to_ord=None):
+        """
+        Zestawienie bazy: (przesunięcie wierszy, przesunięcie kolumn, liczby wierszy, sumy) – macierze int64 po
+        wszystkich kodach obu wymiarów. Dwa np.bincount na wycinku bazy; wynik pamiętany (baza się nie zmienia).
+        """
+        key = (rows, columns, measure, from_ord, to_ord)
+        table = self._tables.get(key)
+        if table is None:
+            keys, (row_offset, height), (col_offset, width) = self.cell_keys(rows, columns)
+            weights, hits = self.weights(measure)
+            part = self.span(from_ord, to_ord)                             # wiersze z zakresu dat (widok)
+            keys, size, shape = keys[part], height * width, (height, width)
+            counts = np.bincount(keys, None if hits is None else hits[part], minlength=size)[:size].reshape(shape)
+            sums = counts if weights is None else np.bincount(keys, weights[part], minlength=size)[:size].reshape(shape)
+            if len(self._tables) >= ANALYTICS_TABLES:
+                self._tables.clear()                                       # pamięć zestawień ograniczona
+            table = self._tables[key] = (row_offset, col_offset, np.rint(counts).astype(np.int64),
+                                         np.rint(sums).astype(np.int64))
+        return table
+
+    # --- WYMIARY ---
+    def codes(self, dim):
+        """
+        Kody wierszy bazy w wymiarze 'dim' i (przesunięcie, liczba kodów): kod wymiaru = kod wiersza + przesunięcie.
+        Kategorie i rodzaje: kody ramki; dni tygodnia: 0–6; okresy: numer okresu od 1970 (ciągły zakres historii).
+        """
+        cached = self._cache.get(dim)
+        if cached is not None:
+            return cached
+        if dim == DIM_CATEGORY:
+            result = self.cats, (0, len(self.cat_labels))
+        elif dim == DIM_KIND:
+            result = self.kinds, (0, len(self.kind_labels))
+        elif dim == DIM_WEEKDAY:
+            result = (self.dates.astype(np.intp) - 1) % 7, (0, 7)          # ordinal 1 = poniedziałek
+        elif dim not in (DIM_YEAR, DIM_QUARTER, DIM_MONTH):
+            raise ValueError(f"Nieznany wymiar: {dim}")
+        elif not len(self.dates):
+            result = np.zeros(0, dtype=np.intp), (0, 0)
+        else:
+            first, last = int(self.dates.min()), int(self.dates.max())
+            days = np.arange(first, last + 1) - date(1970, 1, 1).toordinal()  # zakres historii (dni od 1970)
+            months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.intp)  # miesiące od 1970-01
+            periods = months // 12 if dim == DIM_YEAR else months // 3 if dim == DIM_QUARTER else months
+            base = int(periods[0])
+            table = periods - base                                          # dzień historii -> kod okresu
+            result = table[self.dates - first], (base, int(periods[-1]) - base + 1)  # jedno zebranie z tablicy przejść
+        self._cache[dim] = result
+        return result
+
+    def fixed_codes(self, dim) -> list:
+        """Kody wymiaru obecne niezależnie od danych: wszystkie nazwy (także dopisane zmianami) albo cały tydzień."""
+        if dim == DIM_CATEGORY:
+            return [0, len(self.cat_labels) - 1] if self.cat_labels else []
+        if dim == DIM_KIND:
+            return [0, len(self.kind_labels) - 1] if self.kind_labels else []
+        return [0, 6] if dim == DIM_WEEKDAY else []
+
+    def label(self, dim, code) -> str:
+        """Etykieta kodu wymiaru (kod z przesunięciem, jak w pending_cells)."""
+        if dim == DIM_CATEGORY:
+            return self.cat_labels[code]
+        if dim == DIM_KIND:
+            return self.kind_labels[code]
+        if dim == DIM_WEEKDAY:
+            return WEEKDAY_NAMES[code]
+        return _period_label(dim, code)
+
+def _code(labels, codes, name) -> int:
+    """Kod nazwy w ramce (nowa nazwa dostaje następny kod)."""
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(labels)
+        labels.append(name)
+    return code
+
+def _row_code(dim, ordinal, kind, cat) -> int:
+    """Kod wymiaru jednego wiersza (jak codes() + przesunięcie) – dla listy zmian."""
+    if dim == DIM_CATEGORY:
+        return cat
+    if dim == DIM_KIND:
+        return kind
+    if dim == DIM_WEEKDAY:
+        return (ordinal - 1) % 7
+    if dim not in (DIM_YEAR, DIM_QUARTER, DIM_MONTH):
+        raise ValueError(f"Nieznany wymiar: {dim}")
+    d = date.fromordinal(ordinal)
+    month = (d.year - 1970) * 12 + d.month - 1                              # miesiące od 1970-01
+    return month // 12 if dim == DIM_YEAR else month // 3 if dim == DIM_QUARTER else month
+
+def _period_label(dim, period) -> str:
+    """Etykieta okresu liczonego od 1970: '2026', '2026-Q4', '2026-10'."""
+    if dim == DIM_YEAR:
+        return f"{1970 + period:04d}"
+    if dim == DIM_QUARTER:
+        return f"{1970 + period // 4:04d}-Q{period % 4 + 1}"
+    return f"{1970 + period // 12:04d}-{period % 12 + 1:02d}"
+
+def _kept(dim, present, labels) -> np.ndarray:
+    """
+    Pozycje etykiet do pokazania: kategorie/rodzaje – tylko z transakcjami (alfabetycznie),
+    okresy – ciągły zakres od pierwszego do ostatniego z transakcjami (puste okresy w środku zostają).
+    """
+    used = np.flatnonzero(present)
+    if dim in (DIM_CATEGORY, DIM_KIND):
+        return np.array(sorted(used, key=lambda code: labels[code]), dtype=np.intp)
+    if dim == DIM_WEEKDAY:
+        return np.arange(len(labels))                                  # zawsze cały tydzień
+    return np.arange(used[0], used[-1] + 1) if len(used) else used
+
+# --- ZESTAWIENIE KRZYŻOWE ---
+class CrossTab:
+    """Wynik zestawienia: etykiety wierszy i kolumn oraz macierz wartości (grosze albo liczba transakcji)."""
+    __slots__ = ("rows", "columns", "values", "measure")
+
+    def __init__(self, rows, columns, values, measure):
+        self.rows = rows           # etykiety wierszy
+        self.columns = columns     # etykiety kolumn
+        self.values = values       # np.ndarray int64 [wiersze x kolumny]
+        self.measure = measure     # miara (MEASURES)
+
+    def row_totals(self):
+        return self.values.sum(axis=1)     # suma każdego wiersza
+
+    def column_totals(self):
+        return self.values.sum(axis=0)     # suma każdej kolumny
+
+    def cell(self, row, column) -> int:
+        """Wartość komórki po etykietach (0, gdy etykiety nie ma)."""
+        if row not in self.rows or column not in self.columns:
+            return 0
+        return int(self.values[self.rows.index(row), self.columns.index(column)])
+
+def crosstab(frame, rows, columns, measure=MEASURE_EXPENSE, from_ord=None, to_ord=None) -> CrossTab:
+    """
+    Zestawienie 'rows' x 'columns' (DIMENSIONS) miary 'measure' w zakresie dat [od, do].
+    Baza: dwa np.bincount (sumy i liczby wierszy – puste kategorie są pomijane) na wycinku posortowanych kolumn,
+    liczone raz i pamiętane; do tego zmiany z listy ramki. Sumy groszy bazy są dokładne do 2**53 groszy na komórkę.
+    """
+    row_offset, col_offset, counts, sums = frame.table(rows, columns, measure, from_ord, to_ord)
+    cells = frame.pending_cells(rows, columns, measure, from_ord, to_ord)
+    if cells:                                                               # zmiany po zbudowaniu ramki
+        height, width = counts.shape
+        row_codes = [r for r, _ in cells] + ([row_offset, row_offset + height - 1] if height else [])
+        col_codes = [c for _, c in cells] + ([col_offset, col_offset + width - 1] if width else [])
+        row_codes += frame.fixed_codes(rows)                                # pełny tydzień, nowe nazwy
+        col_codes += frame.fixed_codes(columns)
+        top, left = min(row_codes), min(col_codes)                           # zakres kodów bazy i zmian
+        shape = max(row_codes) - top + 1, max(col_codes) - left + 1
+        grown_counts, grown_sums = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+        r, c = row_offset - top, col_offset - left
+        grown_counts[r:r + height, c:c + width] = counts
+        grown_sums[r:r + height, c:c + width] = sums
+        for (row, column), (count, value) in cells.items():
+            grown_counts[row - top, column - left] += count
+            grown_sums[row - top, column - left] += value
+        row_offset, col_offset, counts, sums = top, left, grown_counts, grown_sums
+    row_labels = [frame.label(rows, row_offset + i) for i in range(counts.shape[0])]
+    col_labels = [frame.label(columns, col_offset + i) for i in range(counts.shape[1])]
+    keep_rows = _kept(rows, counts.sum(axis=1) > 0, row_labels)
+    keep_cols = _kept(columns, counts.sum(axis=0) > 0, col_labels)
+    values = sums[np.ix_(keep_rows, keep_cols)]
+    return CrossTab([row_labels[i] for i in keep_rows], [col_labels[i] for i in keep_cols], values, measure)
+
+def format_crosstab(tab, title="", width=10) -> str:
+    """Tekst zestawienia do pola tekstowego (kwoty w zł, kolumna i wiersz 'Razem')."""
+    value = (lambda v: f"{int(v):{width}d}") if tab.measure == MEASURE_COUNT else (lambda v: f"{from_grosze(int(v)):{width}.2f}")
+    label_width = max([15] + [len(label) for label in tab.rows])
+    header = f"{'':{label_width}s} |" + "".join(f" {label:>{width}s}" for label in tab.columns) + f" | {'Razem':>{width}s}"
+    lines = ([title, ""] if title else []) + [header, "-" * len(header)]
+    for label, row, total in zip(tab.rows, tab.values, tab.row_totals()):
+        lines.append(f"{label:{label_width}s} |" + "".join(f" {value(v)}" for v in row) + f" | {value(total)}")
+    if not tab.rows:
+        lines.append("Brak transakcji w tym zakresie.")
+    else:
+        lines.append("-" * len(header))
+        lines.append(f"{'Razem':{label_width}s} |" + "".join(f" {value(v)}" for v in tab.column_totals())
+                     + f" | {value(tab.values.sum())}")
+    return "\n".join(lines) + "\n"
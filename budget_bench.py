@@ -0,0 +1,313 @@
+# --- POMIARY WYDAJNOŚCI: GENERATOR DANYCH GOSPODARSTWA DOMOWEGO I BENCHMARKI ŚCIEŻEK KRYTYCZNYCH (BEZ GUI) ---
+"""
+Użycie:
+    python budget_bench.py generate --dir KATALOG --rows 100000 [--users 3] [--years 5] [--rules 2000] [--seed 1]
+    python budget_bench.py run [--sizes 10000 100000 1000000] [--repeat 5] [--backend sqlite] [--out wyniki.json]
+Generator zapisuje pliki w formatach aplikacji (secret.key, users.json, shardy transakcji, budgets.csv,
+recurring.json) – katalog można otworzyć w GUI (hasło każdego użytkownika: BENCH_PASSWORD).
+Benchmark mierzy bez Tk to, co robią ścieżki GUI: wczytanie shardu, filtr dat i wyszukiwanie, dane i rysowanie
+wykresów, raport budżetu, dopisywanie cyklicznych oraz encrypt_csv/decrypt_csv. Wynik (mediana/minimum czasu
+i szczytowa pamięć z tracemalloc) idzie jako JSON na stdout albo do pliku – do porównywania między wersjami.
+Te same parametry i ziarno dają identyczne dane, więc wyniki z różnych commitów są porównywalne.
+"""
+import argparse                # podpolecenia i opcje
+import hashlib                 # hash hasła w users.json (jak w GUI)
+import json                    # users.json, recurring.json, wynik
+import os                      # ścieżki
+import platform                # opis maszyny w wyniku
+import random                  # dane syntetyczne (z ziarnem)
+import shutil                  # kopia robocza danych
+import sys                     # stdout
+import tempfile                # katalogi robocze
+import time                    # pomiar czasu
+import tracemalloc             # szczytowa pamięć
+
+from datetime import date, datetime   # zakres historii, znacznik czasu wyniku
+from statistics import median         # mediana powtórzeń
+
+from budget_store import PERIOD_WEEK, PERIOD_MONTH, PERIOD_YEAR, PERIOD_ALL, ordinal_to_date  # okresy, daty
+from budget_engine import (BudgetEngine, KEY_FILE, SHARD_FILE, BACKEND_MEMORY, BACKENDS,  # silnik danych bez GUI
+                           generate_key, shard_path, encrypt_csv, decrypt_csv)
+from budget_recurring import SCHEDULE_INTERVAL, SCHEDULE_MONTHLY_DAY, SCHEDULE_LAST_BUSINESS_DAY, SCHEDULE_WEEKLY
+from budget_import import IMPORT_BATCH_ROWS   # wielkość partii jak przy imporcie
+from budget_planning import planning_report, lifetime_rows, format_report  # raport zakładki budżetu
+from budget_analytics import crosstab, format_crosstab, DIM_CATEGORY, DIM_MONTH  # zestawienia krzyżowe (NumPy)
+
+BENCH_SIZES = (10_000, 100_000, 1_000_000)    # domyślne rozmiary historii (wiersze wszystkich użytkowników)
+BENCH_REPEAT = 5                               # powtórzeń każdego pomiaru (mediana)
+BENCH_END = date(2025, 12, 31)                 # ostatni dzień historii (stały = powtarzalne dane i wyniki)
+BENCH_PASSWORD = "bench"                       # hasło wygenerowanych użytkowników
+BENCH_USERS = ("anna", "piotr", "kasia", "marek", "ola", "tomek", "zosia", "jan")  # nazwy użytkowników
+BENCH_USER_SKEW = 1.6                          # waga i-tego użytkownika = 1 / (i+1)^skew (pierwszy ma najwięcej)
+BENCH_CATEGORY_SKEW = 1.1                      # rozkład Zipfa kategorii (kilka dominuje, reszta rzadko)
+BENCH_SEARCH = "zab"                           # zapytanie wyszukiwania (prefiks popularnego sklepu)
+BENCH_FILTER_DAYS = 90                         # zakres filtra dat (ostatnie dni historii)
+BENCH_META = "bench.json"                      # parametry wygenerowanego katalogu (ponowne użycie)
+
+# Kategorie od najczęstszych: (kategoria, sklepy/opisy, typowa kwota w zł)
+CATEGORIES = (
+    ("Jedzenie", ("Biedronka zakupy", "Lidl", "Żabka", "Auchan", "piekarnia", "Carrefour Express"), 60),
+    ("Transport", ("Orlen paliwo", "bilet MPK", "Uber przejazd", "Bolt", "parking"), 45),
+    ("Restauracje", ("pizza", "kebab", "kawiarnia", "obiad na mieście", "Pyszne.pl"), 55),
+    ("Zakupy", ("Allegro.pl zamówienie", "Rossmann", "Decathlon", "IKEA", "Empik"), 120),
+    ("Rachunki", ("prąd Tauron", "gaz PGNiG", "internet", "telefon Play", "woda"), 150),
+    ("Rozrywka", ("Netflix", "Spotify", "kino Helios", "koncert", "Steam"), 40),
+    ("Zdrowie", ("apteka", "dentysta", "Medicover wizyta", "okulista"), 90),
+    ("Dom", ("Castorama", "Leroy Merlin", "środki czystości", "naprawa pralki"), 110),
+    ("Dzieci", ("przedszkole", "zabawki Smyk", "ubranka", "zajęcia dodatkowe"), 100),
+    ("Prezenty", ("prezent urodzinowy", "kwiaty", "prezent świąteczny"), 80),
+    ("Edukacja", ("kurs online", "książki", "podręczniki"), 130),
+    ("Podróże", ("hotel Booking.com", "bilety PKP Intercity", "lot Ryanair", "wakacje"), 600),
+)
+INCOMES = (("Wynagrodzenie", "pensja", 7000), ("Premia", "premia kwartalna", 2500), ("Inne", "zwrot Allegro", 80))
+BUDGET_PERIODS = (PERIOD_MONTH, PERIOD_MONTH, PERIOD_WEEK, PERIOD_YEAR, PERIOD_ALL)  # okresy limitów (częściej miesiąc)
+
+# --- GENERATOR ---
+def _amount(rng, typical) -> float:
+    """Kwota z rozkładu log-normalnego wokół typowej (długi ogon drogich zakupów), zaokrąglona do groszy."""
+    return round(max(0.01, rng.lognormvariate(0, 0.6) * typical), 2)
+
+def _user_shares(users, rows) -> list:
+    """Liczba wierszy każdego użytkownika (skośnie: pierwszy ma najwięcej), suma = rows."""
+    weights = [1 / (i + 1) ** BENCH_USER_SKEW for i in range(len(users))]
+    shares = [int(rows * w / sum(weights)) for w in weights]
+    shares[0] += rows - sum(shares)                        # reszta z zaokrągleń
+    return shares
+
+def generate_rows(rng, user, count, first, last) -> list:
+    """
+    Wiersze (pola FIELDNAMES) jednego użytkownika, chronologicznie: pensja co miesiąc, czasem premia i zwroty,
+    reszta to wydatki o kategoriach z rozkładu Zipfa i kwotach log-normalnych.
+    """
+    months = []                                             # dni wypłat (10. dzień miesiąca)
+    d = date.fromordinal(first).replace(day=10)
+    while d.toordinal() <= last and len(months) < count:
+        if d.toordinal() >= first:
+            months.append(d.toordinal())
+        d = date(d.year + d.month // 12, d.month % 12 + 1, 10)
+    salary = INCOMES[0][2] * rng.uniform(0.7, 1.5)           # pensja użytkownika (stała, z rzadka inna)
+    rows = [(day, "Przychód", *INCOMES[0][:2], round(salary, 2)) for day in months]
+    extra = min(count - len(rows), count // 50)             # premie i zwroty: ok. 2% wierszy
+    for _ in range(extra):
+        cat, opis, typical = INCOMES[rng.randrange(1, len(INCOMES))]
+        rows.append((rng.randint(first, last), "Przychód", cat, opis, _amount(rng, typical)))
+    weights = [1 / (i + 1) ** BENCH_CATEGORY_SKEW for i in range(len(CATEGORIES))]
+    expenses = count - len(rows)
+    days = [rng.randint(first, last) for _ in range(expenses)]
+    for day, (cat, shops, typical) in zip(days, rng.choices(CATEGORIES, weights, k=expenses)):
+        rows.append((day, "Wydatek", cat, rng.choice(shops), _amount(rng, typical)))
+    rows.sort(key=lambda row: row[0])                       # kolejność jak przy zwykłym dopisywaniu
+    return [(user, ordinal_to_date(day), rodzaj, cat, opis, kwota) for day, rodzaj, cat, opis, kwota in rows]
+
+def generate_recurring(rng, users, count, end) -> dict:
+    """Reguły cykliczne użytkowników (wszystkie harmonogramy); zaległe wystąpienia przypadają na ostatnie tygodnie."""
+    rules = {}
+    for n in range(count):
+        cat, shops, typical = CATEGORIES[rng.randrange(len(CATEGORIES))]
+        start = end - rng.randint(0, 60)                    # do dopisania przez post_recurring(end)
+        schedule = (SCHEDULE_MONTHLY_DAY, SCHEDULE_INTERVAL, SCHEDULE_WEEKLY, SCHEDULE_LAST_BUSINESS_DAY)[n % 4]
+        rule = {"user": users[n % len(users)], "next_date": ordinal_to_date(start), "schedule": schedule}
+        if schedule == SCHEDULE_MONTHLY_DAY:
+            rule["day"] = rng.randint(1, 31)
+        elif schedule == SCHEDULE_INTERVAL:
+            rule["interval_days"] = rng.choice((7, 14, 30, 90))
+        elif schedule == SCHEDULE_WEEKLY:
+            rule["weekday"] = rng.randrange(7)
+        rule.update(rodzaj="Wydatek", kategoria=cat, kwota=_amount(rng, typical), opis=rng.choice(shops))
+        rules[f"{rng.getrandbits(128):032x}"] = rule         # ID jak uuid4().hex w GUI
+    return rules
+
+def generate_dataset(base_dir, rows, users=3, years=5, rules=2000, seed=1, backend=BACKEND_MEMORY) -> dict:
+    """
+    Zapisuje w 'base_dir' kompletny zestaw plików aplikacji: klucz, użytkowników, shardy transakcji (przez
+    BudgetEngine.import_rows – ta sama ścieżka co import), budżety i reguły cykliczne. Zwraca parametry zestawu.
+    """
+    if os.path.exists(os.path.join(base_dir, KEY_FILE)):
+        raise FileExistsError(f"W katalogu są już dane: {base_dir}")  # nowy klucz zniszczyłby stare shardy
+    os.makedirs(base_dir, exist_ok=True)
+    rng = random.Random(seed)                               # powtarzalne dane
+    names = list(BENCH_USERS[:users])
+    key = generate_key(os.path.join(base_dir, KEY_FILE))    # nowy klucz Fernet
+    password_hash = hashlib.sha256(BENCH_PASSWORD.encode('utf-8')).hexdigest()  # jak hash_password w GUI
+    with open(os.path.join(base_dir, "users.json"), 'w', encoding='utf-8') as f:
+        json.dump({name: {'password_hash': password_hash} for name in names}, f, indent=2, ensure_ascii=False)
+
+    last = BENCH_END.toordinal()
+    first = date(BENCH_END.year - years + 1, 1, 1).toordinal()  # pełne lata historii
+    for name, count in zip(names, _user_shares(names, rows)):
+        engine = BudgetEngine(key, name, base_dir, backend).open()
+        engine.import_rows(generate_rows(rng, name, count, first, last), IMPORT_BATCH_ROWS)  # jeden snapshot
+        if name == names[0]:                                # budżety i cykliczne są wspólne dla katalogu
+            engine.budgets.update({cat: {"limit": float(typical * 20), "period": rng.choice(BUDGET_PERIODS)}
+                                   for cat, _, typical in CATEGORIES[:8]})  # limity głównych kategorii
+            engine.recurring.update(generate_recurring(rng, names, rules, last))
+        engine.save_all()
+    params = {"rows": rows, "users": users, "years": years, "rules": rules, "seed": seed, "backend": backend}
+    with open(os.path.join(base_dir, BENCH_META), 'w', encoding='utf-8') as f:
+        json.dump(params, f, indent=2)                      # do ponownego użycia katalogu
+    return params
+
+def _dataset(cache_dir, params) -> str:
+    """Katalog z zestawem o podanych parametrach (wygenerowany wcześniej albo teraz)."""
+    path = os.path.join(cache_dir, "{rows}-{users}-{years}-{rules}-{seed}-{backend}".format(**params))
+    meta = os.path.join(path, BENCH_META)
+    if os.path.exists(meta):
+        with open(meta, 'r', encoding='utf-8') as f:
+            if json.load(f) == params:
+                return path                                 # ten sam zestaw – bez generowania
+    if os.path.exists(path):
+        shutil.rmtree(path)                                 # inny/niedokończony – od nowa
+    generate_dataset(path, **params)
+    return path
+
+# --- POMIARY ---
+def measure(run, setup=None, repeat=BENCH_REPEAT) -> dict:
+    """
+    Mediana i minimum czasu run(stan) z 'repeat' powtórzeń (setup() przygotowuje świeży stan, poza pomiarem),
+    potem jedno dodatkowe wykonanie pod tracemalloc (śledzenie spowalnia, więc nie wchodzi do czasów).
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        times.append((time.perf_counter() - start) * 1000)
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]           # szczyt alokacji Pythona w trakcie run
+    finally:
+        tracemalloc.stop()
+    return {"median_ms": round(median(times), 3), "min_ms": round(min(times), 3), "peak_kib": round(peak / 1024, 1)}
+
+def bench_dataset(path, repeat=BENCH_REPEAT) -> dict:
+    """Pomiary ścieżek krytycznych na kopii roboczej zestawu (zestaw źródłowy zostaje nietknięty)."""
+    with open(os.path.join(path, KEY_FILE), 'rb') as f:
+        key = f.read()
+    with open(os.path.join(path, BENCH_META), 'r', encoding='utf-8') as f:
+        params = json.load(f)
+    user = BENCH_USERS[0]                                   # użytkownik z największą historią
+    end = BENCH_END.toordinal()
+    work = tempfile.mkdtemp(prefix="budget_bench_")
+    results = {}
+    try:
+        def fresh():                                        # świeża kopia plików (stan po zalogowaniu)
+            shutil.rmtree(work)
+            shutil.copytree(path, work)
+            return work
+
+        def opened():                                       # świeża kopia, otwarta
+            return BudgetEngine(key, user, fresh()).open()
+
+        results["load"] = measure(lambda d: BudgetEngine(key, user, d).open(), fresh, repeat)  # logowanie
+
+        engine = opened()                                   # jeden silnik dla pomiarów tylko do odczytu
+        store = engine.store
+        results["filter_range"] = measure(lambda _: store.user_indices(user, end - BENCH_FILTER_DAYS, end), None, repeat)
+        results["search"] = measure(lambda _: store.search(user, BENCH_SEARCH), None, repeat)
+
+        try:
+            from budget_charts import AnalysisFigures, CHART_NAMES, downsample_days  # matplotlib (Agg), import poza pomiarem
+        except ImportError:
+            results["charts_data"] = results["charts_render"] = None  # brak matplotlib – pomiary pominięte
+        else:
+            def chart_data(_):                              # jak render_analysis_charts przed rysowaniem
+                totals = store.user_totals(user)
+                timeline = store.balance_timeline(user)
+                span = timeline.span()
+                return totals, downsample_days(span[0], timeline.daily_balance(*span)) if span else ([], [])
+            results["charts_data"] = measure(chart_data, None, repeat)
+            figures = AnalysisFigures()
+            sizes = {name: (600, 250) for name in CHART_NAMES}
+            results["charts_render"] = measure(lambda _: figures.render(*chart_data(None), sizes), None, repeat)
+
+        def budget_text(_):                                 # jak update_budget_text
+            rows = planning_report(store, user, engine.budgets, PERIOD_MONTH, end)
+            return format_report(rows, PERIOD_MONTH, end, lifetime_rows(store, user, engine.budgets))
+        results["budget_text"] = measure(budget_text, None, repeat)
+        results["crosstab"] = measure(lambda _: format_crosstab(crosstab(store.analytics_frame(user), DIM_CATEGORY,
+                                                                        DIM_MONTH)), None, repeat)  # jak update_crosstab
+
+        plain = os.path.join(work, "bench_plain.csv")       # eksport jawnego CSV (poza pomiarami)
+        results["decrypt_csv"] = None
+        results["encrypt_csv"] = None
+        if os.path.exists(shard_path(work, SHARD_FILE, user)):  # tylko magazyn w RAM ma snapshot CSV
+            encrypted = shard_path(work, SHARD_FILE, user)
+            results["decrypt_csv"] = measure(lambda _: decrypt_csv(encrypted, plain, key), None, repeat)
+            target = os.path.join(work, "bench_encrypted.bin")
+            results["encrypt_csv"] = measure(lambda _: encrypt_csv(plain, target, key), None, repeat)
+        engine.close()
+
+        results["post_recurring"] = measure(lambda e: e.post_recurring(end), opened, repeat)  # zaległe cykliczne
+
+        def save(e):                                        # zapis przy wylogowaniu/wyjściu
+            if e.journal is None:
+                e.store.changed = True                      # SQLite: wymuś zapieczętowanie bazy
+            e.save_transactions(force=True)                 # RAM: zaszyfrowany snapshot
+            e.close()
+        results["save"] = measure(save, opened, repeat)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return {"dataset": params, "user_rows": _user_shares(BENCH_USERS[:params["users"]], params["rows"])[0],
+            "benchmarks": results}
+
+def run_benchmarks(sizes=BENCH_SIZES, repeat=BENCH_REPEAT, cache_dir=None, **params) -> dict:
+    """Generuje (albo bierze z cache_dir) zestawy o podanych rozmiarach i mierzy każdy; zwraca wynik do JSON."""
+    cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "budget_bench_data")
+    runs = []
+    for rows in sizes:
+        path = _dataset(cache_dir, {"rows": rows, "users": 3, "years": 5, "rules": 2000, "seed": 1,
+                                    "backend": BACKEND_MEMORY, **params})
+        runs.append(bench_dataset(path, repeat))
+    return {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "platform": platform.platform(), "repeat": repeat, "runs": runs}
+
+# --- WIERSZ POLECEŃ ---
+def build_parser() -> argparse.ArgumentParser:
+    """Parser poleceń."""
+    parser = argparse.ArgumentParser(prog="budget_bench", description="Domowy Budżet – dane syntetyczne i pomiary")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def dataset_options(p):
+        p.add_argument("--users", type=int, default=3, choices=range(1, len(BENCH_USERS) + 1), metavar="N",
+                       help=f"liczba użytkowników (1–{len(BENCH_USERS)})")
+        p.add_argument("--years", type=int, default=5, help="lata historii (do końca 2025)")
+        p.add_argument("--rules", type=int, default=2000, help="liczba reguł cyklicznych")
+        p.add_argument("--seed", type=int, default=1, help="ziarno generatora")
+        p.add_argument("--backend", choices=BACKENDS, default=BACKEND_MEMORY, help="magazyn transakcji")
+
+    p = sub.add_parser("generate", help="zapisz syntetyczny zestaw danych w formatach aplikacji")
+    p.add_argument("--dir", required=True, help="katalog docelowy")
+    p.add_argument("--rows", type=int, required=True, help="liczba transakcji (wszyscy użytkownicy)")
+    dataset_options(p)
+
+    p = sub.add_parser("run", help="zmierz ścieżki krytyczne i wypisz JSON")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(BENCH_SIZES), help="liczby transakcji zestawów")
+    p.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="powtórzeń każdego pomiaru")
+    p.add_argument("--cache", help="katalog wygenerowanych zestawów (domyślnie w katalogu tymczasowym)")
+    p.add_argument("--out", help="plik wynikowy JSON (domyślnie stdout)")
+    dataset_options(p)
+    return parser
+
+def main(argv=None):
+    """Punkt wejścia."""
+    args = build_parser().parse_args(argv)
+    params = {"users": args.users, "years": args.years, "rules": args.rules, "seed": args.seed,
+              "backend": args.backend}
+    if args.command == "generate":
+        try:
+            print(json.dumps(generate_dataset(args.dir, args.rows, **params)))
+        except FileExistsError as exc:
+            raise SystemExit(str(exc))                      # nie nadpisuj cudzych danych
+        return
+    report = run_benchmarks(args.sizes, args.repeat, args.cache, **params)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# --- WYKRESY ANALIZ: RYSOWANIE AGG POZA WĄTKIEM GUI, Z PAMIĘCIĄ GOTOWYCH BITMAP ---
+import threading               # ochrona pamięci podręcznej
+from collections import OrderedDict  # pamięć podręczna LRU
+from concurrent.futures import ThreadPoolExecutor  # wątek rysujący
+
+from datetime import date      # etykiety dni salda
+
+import numpy as np             # bufor RGBA -> RGB
+from matplotlib.figure import Figure  # figura bez pyplot (bezpieczna poza wątkiem GUI)
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # rasteryzacja Agg
+from matplotlib.patches import Wedge  # wycinki wykresu kołowego
+
+from budget_diagnostics import timed  # punkty pomiarowe (wyłączone = bez kosztu)
+
+CHART_DPI = 100                # rozdzielczość wykresów
+CHART_CACHE_SIZE = 16          # ile zestawów bitmap pamiętamy (LRU)
+CHART_NAMES = ("line", "pie", "bar", "balance")  # wykresy zakładki 'Analizy'
+CHART_MAX_POINTS = 24          # najwięcej punktów salda (potem kwartały, potem lata)
+CHART_MAX_DAYS = 366           # najwięcej punktów salda dziennego (dłuższa historia: co k-ty dzień)
+CHART_TOP_CATEGORIES = 8       # najwięcej słupków kategorii (z 'Inne')
+CHART_MAX_LABELS = 12          # najwięcej etykiet na osi X
+
+def chart_key(user, totals, balance, sizes) -> tuple:
+    """Klucz wersji danych wykresów: użytkownik, sumy (user_totals), saldo dzienne (downsample_days) i rozmiary płócien."""
+    income, expense, by_cat, by_month = totals
+    labels, values = balance
+    return (user, income, expense, tuple(by_cat.items()), tuple(by_month.items()),
+            tuple(labels), tuple(values), tuple(sorted(sizes.items())))
+
+# --- ZMNIEJSZANIE SERII ---
+def downsample_months(by_month, max_points=CHART_MAX_POINTS):
+    """Łączy saldo miesięczne w kwartały, a potem w lata, aż seria zmieści się w max_points; zwraca (etykiety, wartości)."""
+    for label_of in (lambda m: m, _quarter_label, lambda m: m[:4]):          # miesiąc -> kwartał -> rok
+        bins = {}                                                             # etykieta -> suma (kolejność wejścia)
+        for month, value in by_month.items():                                 # miesiące posortowane rosnąco
+            label = label_of(month)
+            bins[label] = bins.get(label, 0.0) + value                        # saldo jest addytywne
+        if len(bins) <= max_points:
+            break                                                             # wystarczająco gęsto
+    return list(bins.keys()), list(bins.values())
+
+def downsample_days(first, series, max_points=CHART_MAX_DAYS):
+    """
+    Saldo na koniec dnia od dnia 'first' (ordinal) -> co k-ty dzień i zawsze ostatni, by zmieścić się w max_points;
+    saldo to stan, nie przepływ, więc bierzemy wartość z końca przedziału zamiast sumy. Zwraca (etykiety, wartości w zł).
+    """
+    step = max(1, -(-len(series) // max_points))                              # zaokrąglenie w górę
+    picked = list(range(len(series) - 1, -1, -step))[::-1]                    # od ostatniego dnia wstecz
+    return ([date.fromordinal(first + i).isoformat() for i in picked],
+            [series[i] / 100 for i in picked])                                # grosze -> zł
+
+def _quarter_label(month: str) -> str:
+    """'YYYY-MM' -> 'YYYY-Qn'."""
+    return f"{month[:4]}-Q{(int(month[5:7]) - 1) // 3 + 1}"
+
+def _axis_label(labels) -> str:
+    """Podpis osi X wg etykiet z downsample_months."""
+    if labels and "Q" in labels[0]:
+        return "Kwartał"
+    if labels and len(labels[0]) == 4:
+        return "Rok"
+    return "Miesiąc"
+
+def top_categories(by_cat, n=CHART_TOP_CATEGORIES):
+    """Zostawia n największych kategorii, resztę sumuje jako 'Inne'; zwraca (etykiety, wartości)."""
+    ranked = sorted(by_cat.items(), key=lambda item: item[1], reverse=True)  # od największych
+    if len(ranked) > n:
+        ranked = ranked[:n - 1] + [("Inne", sum(v for _, v in ranked[n - 1:]))]  # ogon w jednym słupku
+    return [c for c, _ in ranked], [v for _, v in ranked]
+
+def _thin_ticks(ax, labels, max_labels=CHART_MAX_LABELS):
+    """Ustawia etykiety osi X, pokazując co k-tą, by się nie nakładały."""
+    step = max(1, -(-len(labels) // max_labels))                            # zaokrąglenie w górę
+    ticks = range(0, len(labels), step)
+    ax.set_xticks(ticks)                                                      # ticki
+    ax.set_xticklabels([labels[i] for i in ticks], rotation=45, ha="right")   # etykiety pod kątem
+
+# --- RYSOWANIE (W WĄTKU ROBOCZYM, TRWAŁE ARTYSTY) ---
+class AnalysisFigures:
+    """
+    Figury Agg tworzone raz: kolejne odświeżenia tylko podmieniają dane istniejących artystów
+    (linia, słupki, wycinki koła) zamiast ax.clear() i budowania wszystkiego od nowa.
+    Używane wyłącznie z jednego wątku roboczego.
+    """
+
+    def __init__(self):
+        self.figures = {}              # nazwa -> Figure
+        self._layout = {}              # nazwa -> (rozmiar, etykiety) z ostatniego dopasowania marginesów
+        for name in CHART_NAMES:
+            fig = Figure(dpi=CHART_DPI)                                       # figura bez pyplot
+            FigureCanvasAgg(fig)                                              # płótno Agg (fig.canvas)
+            fig.add_subplot(111)                                              # osie
+            self.figures[name] = fig
+        self._build_pie(self.figures["pie"].axes[0])
+        self._build_bar(self.figures["bar"].axes[0])
+        self._build_line(self.figures["line"].axes[0])
+        self._build_balance(self.figures["balance"].axes[0])
+
+    def _empty_text(self, ax, text):
+        """Komunikat 'brak danych' (ukrywany, gdy są dane)."""
+        return ax.text(0.5, 0.5, text, ha="center", va="center", transform=ax.transAxes)
+
+    def _build_pie(self, ax):
+        ax.set_title("Przychody vs Wydatki")                                  # tytuł
+        ax.set_xlim(-1.3, 1.3)                                                # miejsce na etykiety
+        ax.set_ylim(-1.3, 1.3)
+        ax.set_aspect("equal")                                                # koło jako okrąg
+        ax.set_axis_off()                                                     # bez ramki i osi
+        self.pie_wedges = [Wedge((0, 0), 1, 90, 90, color=c) for c in ("green", "red")]  # przychody, wydatki
+        for wedge in self.pie_wedges:
+            ax.add_patch(wedge)
+        self.pie_labels = [ax.text(0, 0, t, ha="center", va="center") for t in ("Przychody", "Wydatki")]
+        self.pie_pcts = [ax.text(0, 0, "", ha="center", va="center") for _ in range(2)]  # procenty
+        self.pie_empty = self._empty_text(ax, "Brak danych")
+
+    def _build_bar(self, ax):
+        ax.set_title("Wydatki wg kategorii")                                  # tytuł
+        self.bars = ax.bar(range(CHART_TOP_CATEGORIES), [0] * CHART_TOP_CATEGORIES, color="orange").patches  # słupki
+        self.bar_empty = self._empty_text(ax, "Brak wydatków")
+
+    def _build_line(self, ax):
+        ax.set_title("Saldo miesięczne (Przychody - Wydatki)")                # tytuł
+        ax.set_ylabel("Saldo")                                                # podpis Y
+        (self.line,) = ax.plot([], [], marker='o')                            # jedna linia na zawsze
+        self.line_empty = self._empty_text(ax, "Brak danych")
+
+    def _build_balance(self, ax):
+        ax.set_title("Saldo dzienne (narastająco)")                           # tytuł
+        ax.set_ylabel("Saldo")                                                # podpis Y
+        ax.axhline(0, color="gray", linewidth=0.8)                            # linia zera
+        (self.balance_line,) = ax.plot([], [], color="tab:blue")              # bez znaczników (wiele punktów)
+        self.balance_empty = self._empty_text(ax, "Brak danych")
+
+    def update_pie(self, income, expense):
+        """Nowe kąty wycinków i pozycje etykiet."""
+        total = income + expense
+        self.pie_empty.set_visible(total == 0)                                # brak danych?
+        angle = 90.0                                                          # start u góry (jak startangle=90)
+        for wedge, label, pct, value in zip(self.pie_wedges, self.pie_labels, self.pie_pcts, (income, expense)):
+            share = value / total if total else 0.0                           # udział
+            wedge.set_theta1(angle)
+            wedge.set_theta2(angle + 360 * share)
+            mid = np.deg2rad(angle + 180 * share)                             # środek wycinka
+            label.set_position((1.1 * np.cos(mid), 1.1 * np.sin(mid)))        # etykieta na zewnątrz
+            label.set_horizontalalignment("left" if np.cos(mid) > 0 else "right")  # od koła na zewnątrz
+            pct.set_position((0.6 * np.cos(mid), 0.6 * np.sin(mid)))          # procent w środku
+            pct.set_text(f"{share * 100:.1f}%")
+            for artist in (wedge, label, pct):
+                artist.set_visible(total != 0)
+            angle += 360 * share
+
+    def update_bar(self, by_cat):
+        """Nowe wysokości słupków (top-N kategorii + 'Inne')."""
+        ax = self.figures["bar"].axes[0]
+        labels, values = top_categories(by_cat)
+        self.bar_empty.set_visible(not labels)                                # brak wydatków?
+        for i, bar in enumerate(self.bars):
+            bar.set_visible(i < len(labels))                                  # nieużyte sloty ukryte
+            bar.set_height(values[i] if i < len(labels) else 0)
+        ax.set_xlim(-0.5, max(len(labels), 1) - 0.5)                          # tylko użyte sloty
+        ax.set_ylim(0, max(values, default=0) * 1.05 or 1)                    # zapas nad najwyższym
+        _thin_ticks(ax, labels)
+        return _layout_key(ax, labels)
+
+    def update_line(self, by_month):
+        """Nowa seria salda (miesiące, kwartały albo lata – zależnie od długości historii)."""
+        ax = self.figures["line"].axes[0]
+        labels, values = downsample_months(by_month)
+        self.line_empty.set_visible(not labels)                               # brak danych?
+        self.line.set_data(range(len(labels)), values)                        # dane w istniejącej linii
+        ax.relim()                                                            # nowe granice danych
+        ax.autoscale_view()
+        ax.set_xlabel(_axis_label(labels))                                    # podpis X
+        _thin_ticks(ax, labels)
+        return _layout_key(ax, labels)
+
+    def update_balance(self, balance):
+        """Nowa seria salda dziennego (etykiety dni i wartości z downsample_days)."""
+        ax = self.figures["balance"].axes[0]
+        labels, values = balance
+        self.balance_empty.set_visible(not labels)                            # brak danych?
+        self.balance_line.set_data(range(len(labels)), values)                # dane w istniejącej linii
+        ax.relim()                                                            # nowe granice danych
+        ax.autoscale_view()
+        ax.set_xlabel("Dzień")                                                # podpis X
+        _thin_ticks(ax, labels)
+        return _layout_key(ax, labels)
+
+    def render(self, totals, balance, sizes) -> dict:
+        """Aktualizuje artystów i rasteryzuje figury; zwraca {nazwa: obraz PPM}."""
+        income, expense, by_cat, by_month = totals
+        self.update_pie(income, expense)
+        labels = {"pie": (), "bar": self.update_bar(by_cat), "line": self.update_line(by_month),
+                  "balance": self.update_balance(balance)}
+        images = {}
+        for name, fig in self.figures.items():
+            width, height = sizes[name]                                       # rozmiar płótna w pikselach
+            layout = ((width, height), labels[name])
+            if self._layout.get(name) != layout:                              # zmiana rozmiaru albo etykiet?
+                fig.set_size_inches(width / CHART_DPI, height / CHART_DPI)
+                if name != "pie":
+                    fig.tight_layout()                                        # dopasuj marginesy tylko wtedy
+                self._layout[name] = layout
+            images[name] = _rasterize(fig)
+        return images
+
+def _layout_key(ax, labels) -> tuple:
+    """Co wpływa na marginesy: etykiety X i szerokość liczb na osi Y."""
+    return tuple(labels), max(len(f"{abs(v):.0f}") for v in ax.get_ylim())
+
+def _rasterize(fig) -> bytes:
+    """Rysuje figurę w Agg i zwraca obraz PPM (P6) do tk.PhotoImage."""
+    fig.canvas.draw()                                                         # rasteryzacja
+    rgb = np.asarray(fig.canvas.buffer_rgba())[:, :, :3]                      # bez kanału alfa
+    height, width = rgb.shape[:2]
+    return b"P6 %d %d 255\n" % (width, height) + rgb.tobytes()               # nagłówek + piksele
+
+# --- WĄTEK ROBOCZY + PAMIĘĆ PODRĘCZNA ---
+class ChartRenderer:
+    """
+    Rysuje wykresy w jednym wątku roboczym (Agg) i pamięta gotowe bitmapy po kluczu wersji danych,
+    więc przełączanie zakładek albo ponowne logowanie nie rysuje niezmienionych wykresów.
+    """
+
+    def __init__(self, cache_size=CHART_CACHE_SIZE):
+        self.cache_size = cache_size                   # limit LRU
+        self._cache = OrderedDict()                    # klucz -> {nazwa: PPM}
+        self._lock = threading.Lock()                  # cache zapisywany z wątku roboczego
+        self._pool = ThreadPoolExecutor(max_workers=1) # jeden wątek rysujący (kolejność zleceń)
+        self._figures = None                           # trwałe figury (tworzone w wątku roboczym)
+
+    def cached(self, key):
+        """Zwraca gotowe bitmapy dla klucza albo None."""
+        with self._lock:
+            images = self._cache.get(key)
+            if images is not None:
+                self._cache.move_to_end(key)           # ostatnio użyte
+            return images
+
+    @timed("charts.render")
+    def _render(self, key, totals, balance, sizes):
+        """Rysuje i zapamiętuje wynik (w wątku roboczym)."""
+        if self._figures is None:
+            self._figures = AnalysisFigures()          # pierwsze rysowanie tworzy artystów
+        images = self._figures.render(totals, balance, sizes)
+        with self._lock:
+            self._cache[key] = images
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)        # usuń najdawniej użyte
+        return images
+
+    def submit(self, key, totals, balance, sizes):
+        """Zleca rysowanie w tle; zwraca Future z {nazwa: PPM}."""
+        return self._pool.submit(self._render, key, totals, balance, sizes)
+
+    def shutdown(self):
+        """Zatrzymuje wątek roboczy (bez czekania na zlecenia)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
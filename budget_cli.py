@@ -0,0 +1,185 @@
+# --- WIERSZ POLECEŃ: CYKLICZNE, PODSUMOWANIE, FILTR, EKSPORT (BEZ GUI) ---
+"""
+Użycie (np. z crona na serwerze bez ekranu):
+    python budget_cli.py post-recurring [--date RRRR-MM-DD]
+    python budget_cli.py summary --user NAZWA
+    python budget_cli.py balance --user NAZWA [--date RRRR-MM-DD] [--from RRRR-MM-DD --to RRRR-MM-DD]
+    python budget_cli.py filter --user NAZWA [--from RRRR-MM-DD] [--to RRRR-MM-DD] [--category K] [--kind RODZAJ]
+    python budget_cli.py export --out PLIK.csv [--user NAZWA]
+    python budget_cli.py import --user NAZWA --file WYCIĄG.csv [--delimiter ';']
+Nie uruchamiać, gdy otwarte jest GUI na tych samych plikach (obie strony dopisywałyby cykliczne).
+"""
+import argparse                # podpolecenia i opcje
+import csv                     # wyjście CSV
+import json                    # reguły cykliczne
+import os                      # ścieżki
+import sys                     # stdout / kod wyjścia
+
+from datetime import date                             # domyślny dzień salda
+
+from budget_store import FIELDNAMES, date_to_ordinal, from_grosze  # kolumny, daty i kwoty magazynu
+from budget_engine import BudgetEngine, KEY_FILE, RECURRING_FILE, BACKENDS, shard_users, split_legacy  # silnik danych bez GUI
+from budget_import import import_file                 # import wyciągów bankowych
+
+def _key(args) -> bytes:
+    """Klucz Fernet z katalogu --dir (bez tworzenia nowego)."""
+    key_path = os.path.join(args.dir, KEY_FILE)        # klucz obok danych
+    if not os.path.exists(key_path):                   # nowy klucz = dane nie do odczytania
+        raise SystemExit(f"Brak klucza: {key_path}")
+    with open(key_path, 'rb') as f:
+        return f.read()                                # klucz Fernet
+
+def _engine(args, user) -> BudgetEngine:
+    """Otwiera dane użytkownika z katalogu --dir (tylko jego shard transakcji)."""
+    return BudgetEngine(_key(args), user, args.dir, args.backend).open()  # shard, budżety, cykliczne
+
+def _all_users(args) -> list:
+    """Użytkownicy z shardami transakcji (wspólny plik starszej wersji dzielony najpierw)."""
+    split_legacy(_key(args), args.dir)                 # stary układ -> shardy
+    return shard_users(args.dir)
+
+def _ordinal(text):
+    """Data z opcji (None = brak ograniczenia); błąd formatu kończy program."""
+    if text is None:
+        return None
+    try:
+        return date_to_ordinal(text)                   # 'YYYY-MM-DD' -> ordinal
+    except ValueError:
+        raise SystemExit(f"Niepoprawna data: {text}")
+
+def cmd_post_recurring(args):
+    """Dopisuje zaległe wystąpienia cyklicznych (do dziś albo do --date), shard po shardzie."""
+    until = _ordinal(args.date)
+    path = os.path.join(args.dir, RECURRING_FILE)         # reguły wszystkich użytkowników
+    rules = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+    count = 0
+    for user in sorted({rule["user"] for rule in rules.values()}):  # właściciele reguł
+        engine = _engine(args, user)                      # shard użytkownika
+        count += len(engine.post_recurring(until))        # jedna partia, jeden zapis
+        engine.close()                                    # dziennik już trwały
+    print(f"Dopisano wystąpień: {count}")
+
+def cmd_summary(args):
+    """Sumy użytkownika: przychody, wydatki, saldo i wydatki wg kategorii."""
+    engine = _engine(args, args.user)
+    income, expense, by_cat, _ = engine.store.user_totals(args.user)  # sumy przyrostowe
+    engine.close()
+    print(f"Przychody: {income:12.2f}")
+    print(f"Wydatki:   {expense:12.2f}")
+    print(f"Saldo:     {income - expense:12.2f}")
+    for cat, total in sorted(by_cat.items(), key=lambda item: item[1], reverse=True):  # od największych
+        print(f"  {cat:20s} {total:12.2f}")
+
+def cmd_balance(args):
+    """Saldo użytkownika na koniec dnia (domyślnie dziś) i przepływy w zakresie dat (oś salda, O(log dni))."""
+    day = _ordinal(args.date) if args.date else date.today().toordinal()
+    engine = _engine(args, args.user)
+    print(f"Saldo na {date.fromordinal(day)}: {from_grosze(engine.store.balance_as_of(args.user, day)):12.2f}")
+    if args.date_from or args.date_to:
+        first, last = engine.store.balance_timeline(args.user).span() or (day, day)  # brak granicy = cała historia
+        first = _ordinal(args.date_from) if args.date_from else first
+        last = _ordinal(args.date_to) if args.date_to else last
+        income, expense = engine.store.range_totals(args.user, first, last)
+        print(f"Od {date.fromordinal(first)} do {date.fromordinal(last)}:")
+        print(f"  Przychody: {from_grosze(income):12.2f}")
+        print(f"  Wydatki:   {from_grosze(expense):12.2f}")
+        print(f"  Przepływ:  {from_grosze(income - expense):12.2f}")
+    engine.close()
+
+def _filtered(engine, args):
+    """Widoki transakcji użytkownika po dacie (bisect), kategorii i rodzaju."""
+    for t in engine.store.for_user(args.user, _ordinal(args.date_from), _ordinal(args.date_to)):
+        if args.category is not None and t.kategoria != args.category:
+            continue                                   # inna kategoria
+        if args.kind is not None and t.rodzaj != args.kind:
+            continue                                   # inny rodzaj
+        yield t
+
+def cmd_filter(args):
+    """Wypisuje przefiltrowane transakcje jako CSV na stdout."""
+    engine = _engine(args, args.user)
+    writer = csv.writer(sys.stdout)                    # CSV na wyjście
+    writer.writerow(FIELDNAMES)                        # nagłówek
+    for t in _filtered(engine, args):
+        writer.writerow([t[name] for name in FIELDNAMES])  # wiersz
+    engine.close()
+
+def cmd_export(args):
+    """Zapisuje transakcje (jednego albo wszystkich użytkowników) do jawnego CSV."""
+    users = [args.user] if args.user else _all_users(args)         # wybrany albo wszyscy
+    count = 0
+    with open(args.out, 'w', newline='', encoding='utf-8') as f:   # plik wyjściowy
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)                                # nagłówek
+        for user in users:
+            engine = _engine(args, user)                           # shard po shardzie
+            for t in engine.store:
+                writer.writerow([t[name] for name in FIELDNAMES])  # wiersz
+                count += 1
+            engine.close()
+    print(f"Wyeksportowano transakcji: {count} -> {args.out}")
+
+def cmd_import(args):
+    """Importuje wyciąg bankowy CSV dla użytkownika (wszystko albo nic, jeden zapis)."""
+    engine = _engine(args, args.user)
+    try:
+        report = import_file(engine, args.file, args.user, args.delimiter)  # potok + partie
+    except (OSError, ValueError, csv.Error) as exc:
+        raise SystemExit(f"Import nieudany: {exc}")
+    finally:
+        engine.close()
+    print(report.summary())
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parser poleceń."""
+    parser = argparse.ArgumentParser(prog="budget_cli", description="Domowy Budżet – polecenia bez GUI")
+    parser.add_argument("--dir", default=".", help="katalog z plikami danych (domyślnie bieżący)")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="magazyn transakcji (domyślnie ten, w którym są dane; inny = przeniesienie danych)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("post-recurring", help="dopisz zaległe transakcje cykliczne")
+    p.add_argument("--date", help="dopisz wystąpienia do tej daty włącznie (domyślnie dziś)")
+    p.set_defaults(func=cmd_post_recurring)
+
+    p = sub.add_parser("summary", help="podsumowanie użytkownika")
+    p.add_argument("--user", required=True)
+    p.set_defaults(func=cmd_summary)
+
+    p = sub.add_parser("balance", help="saldo na dzień i przepływy w zakresie dat")
+    p.add_argument("--user", required=True)
+    p.add_argument("--date", help="saldo na koniec tego dnia (domyślnie dziś)")
+    p.add_argument("--from", dest="date_from", help="początek zakresu przepływów (RRRR-MM-DD)")
+    p.add_argument("--to", dest="date_to", help="koniec zakresu przepływów (RRRR-MM-DD)")
+    p.set_defaults(func=cmd_balance)
+
+    p = sub.add_parser("filter", help="transakcje użytkownika jako CSV na stdout")
+    p.add_argument("--user", required=True)
+    p.add_argument("--from", dest="date_from", help="data od (RRRR-MM-DD)")
+    p.add_argument("--to", dest="date_to", help="data do (RRRR-MM-DD)")
+    p.add_argument("--category", help="tylko ta kategoria")
+    p.add_argument("--kind", choices=["Przychód", "Wydatek"], help="tylko ten rodzaj")
+    p.set_defaults(func=cmd_filter)
+
+    p = sub.add_parser("export", help="eksport transakcji do jawnego CSV")
+    p.add_argument("--out", required=True, help="plik wynikowy")
+    p.add_argument("--user", help="tylko ten użytkownik (domyślnie wszyscy)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="import wyciągu bankowego CSV")
+    p.add_argument("--user", required=True, help="użytkownik, do którego trafią transakcje")
+    p.add_argument("--file", required=True, help="plik CSV z banku")
+    p.add_argument("--delimiter", help="separator pól (domyślnie wykrywany)")
+    p.set_defaults(func=cmd_import)
+    return parser
+
+def main(argv=None):
+    """Punkt wejścia."""
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# --- SZYFROWANY KONTENER SEGMENTOWY: KAWAŁKI -> ZLIB -> FERNET, RÓWNOLEGLE I STRUMIENIOWO ---
+import io                      # strumień bajtów dla parsera CSV
+import os                      # operacje na plikach
+import struct                  # nagłówek / indeks binarny
+import zlib                    # kompresja kawałków
+from collections import deque  # okno zadań w puli wątków
+from concurrent.futures import ThreadPoolExecutor  # równoległe (de)szyfrowanie
+
+from cryptography.fernet import Fernet, InvalidToken  # uwierzytelnione szyfrowanie kawałków
+
+from budget_diagnostics import span                   # punkty pomiarowe (wyłączone = bez kosztu)
+
+MAGIC = b"BDGSEG01"            # znacznik formatu segmentowego (stary format = jeden token Fernet)
+CHUNK_SIZE = 1024 * 1024       # rozmiar kawałka jawnych danych (1 MiB)
+COMPRESS_LEVEL = 3             # poziom zlib: CSV kurczy się ~6x, a kompresja nie dominuje czasu zapisu
+HEADER = struct.Struct(">8sIQ")    # magic, rozmiar kawałka, przesunięcie indeksu
+ENTRY = struct.Struct(">QI")       # wpis indeksu: przesunięcie, długość tokenu
+SEQ = struct.Struct(">I")          # numer kawałka (wewnątrz szyfrogramu)
+
+def _workers(workers):
+    """Zwraca liczbę wątków puli (domyślnie liczba CPU, max 8)."""
+    return workers or min(8, os.cpu_count() or 1)      # rozsądny limit
+
+def _ordered_map(func, items, workers):
+    """Jak Executor.map, ale pobiera wejście leniwie (okno 2x wątki) i oddaje wyniki po kolei."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:  # pula wątków
+        pending = deque()                                  # zadania w kolejności wejścia
+        for item in items:
+            pending.append(pool.submit(func, item))        # zleć kawałek
+            if len(pending) >= 2 * workers:                # okno pełne?
+                yield pending.popleft().result()           # oddaj najstarszy wynik
+        while pending:
+            yield pending.popleft().result()               # dokończ resztę
+
+# --- SZYFROWANIE ---
+def encrypt_chunks(chunks, encrypted_path, key, workers=None):
+    """Zapisuje strumień kawałków bajtów jako kontener segmentowy (atomowo, przez plik .tmp)."""
+    fernet = Fernet(key)                                   # obiekt Fernet
+    def seal(item):                                        # wykonywane w wątku puli
+        seq, data = item
+        with span("codec.seal_chunk"):                     # kompresja + szyfr (czas wątku puli)
+            return fernet.encrypt(SEQ.pack(seq) + zlib.compress(data, COMPRESS_LEVEL))  # numer + kompresja + szyfr
+    tmp_path = encrypted_path + ".tmp"                     # plik tymczasowy obok docelowego
+    entries = []                                           # indeks (przesunięcie, długość)
+    with open(tmp_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, CHUNK_SIZE, 0))       # nagłówek (indeks uzupełnimy na końcu)
+        for token in _ordered_map(seal, enumerate(chunks), _workers(workers)):
+            entries.append((out.tell(), len(token)))       # gdzie leży kawałek
+            out.write(token)                               # zapisz szyfrogram
+        index_offset = out.tell()                          # indeks za ostatnim kawałkiem
+        index = struct.pack(">I", len(entries)) + b"".join(ENTRY.pack(*e) for e in entries)
+        out.write(fernet.encrypt(index))                   # indeks też uwierzytelniony
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, CHUNK_SIZE, index_offset))  # nagłówek z przesunięciem indeksu
+        out.flush()                                        # bufor -> system
+        os.fsync(out.fileno())                             # system -> dysk
+    os.replace(tmp_path, encrypted_path)                   # atomowa podmiana
+
+def file_chunks(path, size=CHUNK_SIZE):
+    """Zwraca generator kawałków pliku o podanym rozmiarze."""
+    with open(path, 'rb') as f:                            # czytaj binarnie
+        while True:
+            data = f.read(size)                            # kolejny kawałek
+            if not data:
+                return                                     # koniec pliku
+            yield data
+
+# --- DESZYFROWANIE ---
+def decrypt_chunks(encrypted_path, key, workers=None):
+    """Zwraca generator odszyfrowanych kawałków (po kolei); stary format czytany w całości."""
+    fernet = Fernet(key)                                   # obiekt Fernet
+    with open(encrypted_path, 'rb') as f:
+        head = f.read(HEADER.size)                         # nagłówek
+        if not head.startswith(MAGIC):                     # stary format: jeden token Fernet
+            data = fernet.decrypt(head + f.read())         # odszyfruj całość (migracja przy zapisie)
+            for start in range(0, len(data), CHUNK_SIZE):
+                yield data[start:start + CHUNK_SIZE]       # oddaj w kawałkach
+            return
+        _, _, index_offset = HEADER.unpack(head)           # gdzie leży indeks
+        f.seek(index_offset)
+        index = fernet.decrypt(f.read())                   # uwierzytelniony indeks
+        (count,) = struct.unpack_from(">I", index)         # liczba kawałków
+        entries = [ENTRY.unpack_from(index, 4 + i * ENTRY.size) for i in range(count)]
+        def read_tokens():                                 # czytanie w wątku wywołującym
+            for offset, length in entries:
+                f.seek(offset)
+                yield f.read(length)                       # szyfrogram kawałka
+        def open_token(token):                             # wykonywane w wątku puli
+            with span("codec.open_chunk"):                 # odszyfrowanie + dekompresja (czas wątku puli)
+                plain = fernet.decrypt(token)              # weryfikacja + odszyfrowanie
+                return SEQ.unpack_from(plain)[0], zlib.decompress(plain[SEQ.size:])
+        for expected, (seq, data) in enumerate(_ordered_map(open_token, read_tokens(), _workers(workers))):
+            if seq != expected:                            # podmieniona kolejność kawałków?
+                raise InvalidToken                         # traktuj jak uszkodzony plik
+            yield data
+
+class ChunkReader(io.RawIOBase):
+    """Strumień bajtów czytany z generatora kawałków (np. decrypt_chunks) – bez sklejania całości."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)    # źródło kawałków
+        self._buf = memoryview(b"")    # bieżący kawałek (widok, bez kopiowania reszty)
+        self._pos = 0                  # ile bajtów kawałka już oddano
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self._pos >= len(self._buf):                 # potrzebny nowy kawałek
+            chunk = next(self._chunks, None)               # pobierz
+            if chunk is None:                              # koniec danych
+                return 0
+            self._buf, self._pos = memoryview(chunk), 0    # nowy kawałek od początku
+        n = min(len(b), len(self._buf) - self._pos)        # ile się zmieści
+        b[:n] = self._buf[self._pos:self._pos + n]         # skopiuj
+        self._pos += n                                     # przesuń pozycję
+        return n
+
+def open_encrypted_text(encrypted_path, key, workers=None):
+    """Otwiera zaszyfrowany plik jako strumień tekstowy (np. dla csv.reader), kawałek po kawałku."""
+    raw = io.BufferedReader(ChunkReader(decrypt_chunks(encrypted_path, key, workers)))  # bajty
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')                          # tekst
@@ -0,0 +1,216 @@
+# --- DIAGNOSTYKA: POMIARY CZASU, LICZNIKI, ZRZUTY PAMIĘCI I ROTOWANY LOG (BEZ GUI) ---
+"""
+Lekkie punkty pomiarowe na ścieżkach krytycznych (wczytanie/zapis, szyfrowanie, tabela, wykresy, cykliczne).
+Domyślnie wyłączone: dekorator @timed i span() sprawdzają wtedy jedną flagę i nic nie mierzą.
+Po włączeniu (Ustawienia -> Diagnostyka albo zmienna środowiskowa BUDGET_DIAGNOSTICS=1) każdy pomiar trafia
+do statystyk (liczba wywołań, suma, maksimum, ostatni) i do rotowanego pliku logu; opcjonalnie tracemalloc
+pozwala robić zrzuty największych alokacji. Pomiary mogą przychodzić z wątków (rysowanie, kompaktowanie, pula szyfrująca).
+"""
+import os                      # zmienna środowiskowa
+import threading               # pomiary z wątków roboczych
+import time                    # perf_counter
+import tracemalloc             # zrzuty pamięci (na żądanie)
+from functools import wraps    # dekorator z nazwą i opisem funkcji
+
+DIAGNOSTICS_LOG = "budget_diagnostics.log"   # plik logu (obok danych)
+DIAGNOSTICS_LOG_BYTES = 1024 * 1024          # rozmiar pliku, po którym log jest rotowany
+DIAGNOSTICS_LOG_BACKUPS = 3                  # ile starych plików logu trzymać (.1, .2, .3)
+DIAGNOSTICS_ENV = "BUDGET_DIAGNOSTICS"       # '1' = pomiary włączone od startu
+TRACEMALLOC_FRAMES = 5                       # głębokość stosu zapisywana przy alokacji
+TRACEMALLOC_TOP = 10                         # ile największych miejsc alokacji pokazuje zrzut
+
+class Stat:
+    """Statystyka jednego punktu pomiarowego (czasy w sekundach)."""
+    __slots__ = ("calls", "total", "max", "last")
+
+    def __init__(self):
+        self.calls = 0         # liczba pomiarów
+        self.total = 0.0       # suma czasów
+        self.max = 0.0         # najdłuższy
+        self.last = 0.0        # ostatni
+
+class _Span:
+    """Pomiar bloku 'with' (tylko gdy diagnostyka włączona)."""
+    __slots__ = ("_diag", "_name", "_start")
+
+    def __init__(self, diag, name):
+        self._diag = diag
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._diag.record(self._name, time.perf_counter() - self._start)
+        return False
+
+class _NullSpan:
+    """Pusty blok 'with' dla wyłączonej diagnostyki (jeden współdzielony obiekt)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class Diagnostics:
+    """Statystyki pomiarów i liczników, log rotowany i tracemalloc; jedna instancja na proces (DIAGNOSTICS)."""
+
+    def __init__(self):
+        self.enabled = False       # jedyna rzecz sprawdzana na ścieżkach krytycznych przy wyłączonej diagnostyce
+        self._stats = {}           # nazwa -> Stat
+        self._counters = {}        # nazwa -> liczba
+        self._lock = threading.Lock()  # pomiary z kilku wątków
+        self._logger = None        # logging.Logger z RotatingFileHandler (po enable)
+        self.log_path = None       # ścieżka bieżącego logu
+
+    # --- WŁĄCZANIE ---
+    def enable(self, log_path=DIAGNOSTICS_LOG):
+        """Włącza pomiary i log rotowany (logging importowany dopiero tutaj)."""
+        import logging                             # import odroczony (niepotrzebny przy wyłączonej diagnostyce)
+        from logging.handlers import RotatingFileHandler
+        if self._logger is None or self.log_path != log_path:
+            self._close_log()
+            logger = logging.getLogger("budget.diagnostics")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False               # tylko do własnego pliku
+            handler = RotatingFileHandler(log_path, maxBytes=DIAGNOSTICS_LOG_BYTES,
+                                          backupCount=DIAGNOSTICS_LOG_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+            logger.addHandler(handler)
+            self._logger, self.log_path = logger, log_path
+        self.enabled = True
+        self._logger.info("diagnostyka włączona")
+
+    def enable_from_env(self, log_path=DIAGNOSTICS_LOG):
+        """Włącza diagnostykę, jeśli ustawiono zmienną DIAGNOSTICS_ENV (np. przy uruchomieniu na produkcji)."""
+        if os.environ.get(DIAGNOSTICS_ENV, "") not in ("", "0"):
+            self.enable(log_path)
+
+    def disable(self):
+        """Wyłącza pomiary (statystyki zostają do podglądu) i zamyka log; zatrzymuje tracemalloc."""
+        if self._logger is not None:
+            self._logger.info("diagnostyka wyłączona")
+        self.enabled = False
+        self.stop_tracemalloc()
+        self._close_log()
+
+    def _close_log(self):
+        """Odłącza i zamyka plik logu."""
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+                handler.close()
+        self._logger = self.log_path = None
+
+    # --- POMIARY ---
+    def record(self, name, seconds, detail=""):
+        """Dopisuje pomiar do statystyk i logu (wołane przez timed/span albo ręcznie, np. z wątku puli)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = Stat()
+            stat.calls += 1
+            stat.total += seconds
+            stat.last = seconds
+            if seconds > stat.max:
+                stat.max = seconds
+        logger = self._logger                      # disable() z innego wątku może go właśnie zamykać
+        if logger is not None:
+            logger.info("%s %.3f ms%s", name, seconds * 1000, f" {detail}" if detail else "")
+
+    def count(self, name, n=1):
+        """Zwiększa licznik (np. wczytane wiersze, dopisane cykliczne)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def span(self, name):
+        """Blok 'with' mierzony pod nazwą 'name' (przy wyłączonej diagnostyce – pusty obiekt)."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def timed(self, name):
+        """Dekorator mierzący każde wywołanie funkcji; przy wyłączonej diagnostyce koszt to jedno sprawdzenie flagi."""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)   # szybka ścieżka
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        """Czyści statystyki i liczniki."""
+        with self._lock:
+            self._stats.clear()
+            self._counters.clear()
+
+    # --- PAMIĘĆ ---
+    @property
+    def tracing(self) -> bool:
+        """Czy tracemalloc śledzi alokacje."""
+        return tracemalloc.is_tracing()
+
+    def start_tracemalloc(self):
+        """Włącza śledzenie alokacji (spowalnia program – tylko na czas szukania problemu)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def stop_tracemalloc(self):
+        """Wyłącza śledzenie alokacji i zwalnia jego pamięć."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def memory_snapshot(self, limit=TRACEMALLOC_TOP) -> str:
+        """Zrzut największych miejsc alokacji (tekst, także do logu); pusty, gdy tracemalloc nie działa."""
+        if not tracemalloc.is_tracing():
+            return ""
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        lines = [f"Pamięć śledzona: {current / 1024:.0f} KiB, szczyt {peak / 1024:.0f} KiB"]
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KiB {stat.count:8d} bl.  "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        text = "\n".join(lines)
+        if self._logger is not None:
+            self._logger.info("zrzut pamięci\n%s", text)
+        return text
+
+    # --- RAPORT ---
+    def report(self) -> str:
+        """Tabela statystyk (od największej sumy czasu) i liczników do panelu diagnostyki."""
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda item: item[1].total, reverse=True)
+            counters = sorted(self._counters.items())
+        header = f"{'Punkt pomiarowy':32s} | {'Wywołań':>8s} | {'Suma ms':>10s} | {'Śr. ms':>9s} | {'Maks. ms':>9s} | {'Ost. ms':>9s}"
+        lines = [header, "-" * len(header)]
+        for name, s in stats:
+            lines.append(f"{name:32s} | {s.calls:8d} | {s.total * 1000:10.1f} | {s.total * 1000 / s.calls:9.2f} | "
+                         f"{s.max * 1000:9.2f} | {s.last * 1000:9.2f}")
+        if not stats:
+            lines.append("Brak pomiarów (włącz diagnostykę i użyj aplikacji)." if not self.enabled else "Brak pomiarów.")
+        if counters:
+            lines += ["", "Liczniki:"]
+            lines += [f"  {name:30s} {value:12d}" for name, value in counters]
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines += ["", f"tracemalloc: {current / 1024:.0f} KiB, szczyt {peak / 1024:.0f} KiB"]
+        return "\n".join(lines) + "\n"
+
+DIAGNOSTICS = Diagnostics()        # wspólna instancja (GUI, silnik, kodek, wykresy)
+timed = DIAGNOSTICS.timed          # skróty używane w modułach
+span = DIAGNOSTICS.span
+count = DIAGNOSTICS.count
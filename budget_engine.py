@@ -0,0 +1,409 @@
+# --- SILNIK DANYCH BEZ GUI: ODCZYT/ZAPIS, SZYFROWANIE, DZIENNIK, CYKLICZNE, BUDŻETY ---
+import csv                     # budżety (CSV)
+import json                    # cykliczne (JSON)
+import os                      # ścieżki i pliki
+import re                      # nazwy plików shardów
+from datetime import date      # dzisiejszy dzień dla cyklicznych
+from itertools import islice   # partie importu
+
+from budget_store import TransactionStore, PERIOD_ALL, PERIODS  # kolumnowy magazyn transakcji
+from budget_recurring import RecurringScheduler                 # kopiec reguł po dacie wystąpienia
+from budget_diagnostics import timed, count                     # punkty pomiarowe (wyłączone = bez kosztu)
+
+# Moduły z cryptography (budget_codec, budget_journal) są importowane w funkcjach,
+# żeby samo 'import budget_engine' (np. przed oknem logowania) było lekkie.
+
+# --- STAŁE / ŚCIEŻKI PLIKÓW ---
+BUDGETS_FILE = "budgets.csv"                          # budżety (CSV)
+RECURRING_FILE = "recurring.json"                     # transakcje cykliczne (JSON)
+KEY_FILE = "secret.key"                               # klucz do Fernet
+
+# Transakcje: osobny plik (shard) na użytkownika; {} = nazwa użytkownika w hex (shard_id).
+SHARD_FILE = "transactions_{}.bin"                    # zaszyfrowany snapshot użytkownika
+SHARD_JOURNAL = "transactions_journal_{}.bin"         # dziennik zmian użytkownika od ostatniego snapshotu
+SHARD_DB = "transactions_{}.db"                       # baza SQLite użytkownika w trakcie sesji (jawna)
+SHARD_DB_SEALED = "transactions_db_{}.bin"            # zapieczętowana (Fernet) baza SQLite użytkownika
+
+# Wspólne pliki wszystkich użytkowników ze starszych wersji – tylko do jednorazowego podziału na shardy.
+TRANSACTIONS_FILE_ENCRYPTED = "transactions_encrypted.bin"  # zaszyfrowane transakcje
+TRANSACTIONS_FILE_DECRYPTED = "transactions_temp.csv"       # jawny CSV
+TRANSACTIONS_JOURNAL = "transactions_journal.bin"           # dziennik zmian
+TRANSACTIONS_DB = "transactions.db"                         # baza SQLite (jawna)
+TRANSACTIONS_DB_SEALED = "transactions_db.bin"              # baza SQLite (zapieczętowana)
+
+BACKEND_MEMORY = "memory"      # magazyn kolumnowy w RAM + zaszyfrowany snapshot + dziennik zmian
+BACKEND_SQLITE = "sqlite"      # baza SQLite (WAL, indeksy) na dysku, zapieczętowana po zamknięciu
+BACKENDS = (BACKEND_MEMORY, BACKEND_SQLITE)  # dostępne magazyny
+
+SHARD_PATTERN = re.compile(r"transactions_(?:db_)?([0-9a-f]+)\.(?:bin|db)$")  # nazwy plików shardów
+
+# --- KLUCZ I SZYFROWANIE ---
+def generate_key(path=KEY_FILE):
+    """Generuje klucz Fernet i zapisuje do pliku; zwraca bytes."""
+    from cryptography.fernet import Fernet   # import odroczony (tylko przy pierwszym uruchomieniu)
+    key = Fernet.generate_key()              # wygeneruj losowy klucz
+    with open(path, 'wb') as f:              # zapisz do pliku binarnie
+        f.write(key)                         # zapisz klucz
+    return key                               # zwróć klucz
+
+def load_key(path=KEY_FILE) -> bytes:
+    """Wczytuje klucz z pliku; jeśli brak, tworzy nowy."""
+    if not os.path.exists(path):       # jeśli brak klucza
+        return generate_key(path)      # wygeneruj nowy
+    with open(path, 'rb') as f:        # wczytaj klucz
+        return f.read()                # zwróć bytes
+
+@timed("engine.encrypt_csv")
+def encrypt_csv(plaintext_csv_path, encrypted_path, key):
+    """Szyfruje CSV kawałkami do kontenera segmentowego (zlib + Fernet, równolegle)."""
+    from budget_codec import encrypt_chunks, file_chunks    # import odroczony (cryptography)
+    if not os.path.exists(plaintext_csv_path):              # jeśli nie ma CSV
+        return                                              # nie rób nic
+    encrypt_chunks(file_chunks(plaintext_csv_path), encrypted_path, key)  # strumieniowo, bez całości w RAM
+
+@timed("engine.decrypt_csv")
+def decrypt_csv(encrypted_path, plaintext_csv_path, key):
+    """Odszyfrowuje plik (segmentowy albo stary pojedynczy token Fernet) do jawnego CSV (eksport na żądanie)."""
+    from budget_codec import decrypt_chunks         # import odroczony (cryptography)
+    if not os.path.exists(encrypted_path):          # jeśli nie ma szyfrogramu
+        return                                      # pomiń
+    with open(plaintext_csv_path, 'wb') as file:    # zapisz CSV binarnie
+        for data in decrypt_chunks(encrypted_path, key):  # kawałek po kawałku
+            file.write(data)                        # zapisz jawny fragment
+
+@timed("engine.encrypt_store")
+def encrypt_store(store, encrypted_path, key, user=None):
+    """Serializuje magazyn (albo wiersze jednego użytkownika) kawałkami CSV prosto do kontenera segmentowego (atomowo)."""
+    from budget_codec import CHUNK_SIZE, encrypt_chunks                          # import odroczony (cryptography)
+    encrypt_chunks(store.iter_csv_bytes(CHUNK_SIZE, user), encrypted_path, key)  # bez pełnego CSV w pamięci
+
+# --- SHARDY UŻYTKOWNIKÓW ---
+def shard_id(user) -> str:
+    """Część nazwy pliku shardu: nazwa użytkownika w hex (bezpieczna dla systemu plików)."""
+    return user.encode('utf-8').hex()
+
+def shard_path(base_dir, pattern, user) -> str:
+    """Ścieżka pliku shardu użytkownika (pattern = SHARD_*)."""
+    return os.path.join(base_dir, pattern.format(shard_id(user)))
+
+def shard_users(base_dir=".") -> list:
+    """Użytkownicy, którzy mają shard transakcji w katalogu (posortowani)."""
+    found = set()
+    for name in os.listdir(base_dir):
+        match = SHARD_PATTERN.match(name)
+        if match:
+            found.add(bytes.fromhex(match.group(1)).decode('utf-8'))
+    return sorted(found)
+
+def detect_backend(base_dir, user) -> str:
+    """Magazyn, w którym leżą dane użytkownika: SQLite, jeśli ma bazę (jawną albo zapieczętowaną)."""
+    for pattern in (SHARD_DB, SHARD_DB_SEALED):
+        if os.path.exists(shard_path(base_dir, pattern, user)):
+            return BACKEND_SQLITE
+    return BACKEND_MEMORY
+
+def split_legacy(key, base_dir="."):
+    """Jednorazowo dzieli wspólny plik transakcji starszej wersji (snapshot + dziennik albo baza) na shardy."""
+    from budget_codec import open_encrypted_text                           # import odroczony (cryptography)
+    from budget_journal import TransactionJournal                          # j.w.
+    path = lambda name: os.path.join(base_dir, name)
+    plain, encrypted = path(TRANSACTIONS_FILE_DECRYPTED), path(TRANSACTIONS_FILE_ENCRYPTED)
+    journal = TransactionJournal(path(TRANSACTIONS_JOURNAL), key, None)    # tylko odczyt i sprzątanie
+    if os.path.exists(plain) or os.path.exists(encrypted) or journal.size():
+        store = TransactionStore()                                         # wszyscy użytkownicy (ostatni raz)
+        if os.path.exists(plain):                                          # jawny CSV jest nowszy
+            with open(plain, 'r', newline='', encoding='utf-8') as f:
+                store.load_csv(f)
+        elif os.path.exists(encrypted):
+            with open_encrypted_text(encrypted, key) as f:
+                store.load_csv(f)
+        journal.replay(store)                                              # zmiany po snapshocie
+        for user in store.user_names():
+            encrypt_store(store, shard_path(base_dir, SHARD_FILE, user), key, user)  # shard użytkownika
+        for name in (plain, encrypted):
+            if os.path.exists(name):
+                os.remove(name)                                            # dane są już w shardach
+        journal.discard()
+    db, sealed = path(TRANSACTIONS_DB), path(TRANSACTIONS_DB_SEALED)
+    if os.path.exists(db) or os.path.exists(sealed):
+        from budget_sqlite import SqliteStore, unseal, seal, remove_database  # import odroczony
+        if not os.path.exists(db):
+            unseal(sealed, db, key)
+        source = SqliteStore(db)
+        for user in source.user_names():
+            target_db = shard_path(base_dir, SHARD_DB, user)
+            remove_database(target_db)                                     # po przerwanym podziale – od nowa
+            target = SqliteStore(target_db)
+            with target.deferred_indexes():                                # jedna transakcja na shard
+                for t in source.for_user(user):
+                    target.append(t.user, t.data, t.rodzaj, t.kategoria, t.opis, t.kwota, t.tid)  # z tym samym ID
+            target.close()
+            seal(target_db, shard_path(base_dir, SHARD_DB_SEALED, user), key)
+        source.close()
+        remove_database(db, sealed)                                        # wspólna baza niepotrzebna
+
+# --- SILNIK ---
+class BudgetEngine:
+    """
+    Dane jednego użytkownika bez Tk: jego shard transakcji (BACKEND_MEMORY albo BACKEND_SQLITE), budżety i cykliczne.
+    Logowanie i zapis kosztują tyle, ile dane tego użytkownika – pozostałe shardy nie są odszyfrowywane.
+    Używany przez BudgetApp (GUI) i budget_cli (cron, serwer bez ekranu).
+    Otwarcie z innym magazynem niż ten, w którym leżą dane, przenosi je jednorazowo.
+    """
+
+    def __init__(self, key, user, base_dir=".", backend=None):
+        self.key = key                         # klucz Fernet
+        self.user = user                       # właściciel shardu
+        self.base_dir = base_dir               # katalog plików danych
+        self.backend = backend                 # None = wykryj z plików (detect_backend)
+        self.store = TransactionStore()        # magazyn transakcji (SqliteStore po open() dla SQLite)
+        self.journal = None                    # dziennik zmian (tylko BACKEND_MEMORY, po open())
+        self.budgets = {}                      # {kategoria: {"limit", "period"}}
+        self.recurring = {}                    # {rec_id: reguła} – wszystkich użytkowników (wspólny plik)
+        self.scheduler = RecurringScheduler(self.recurring, user)  # kopiec reguł (pusty do open())
+
+    def path(self, name) -> str:
+        """Ścieżka pliku danych w katalogu silnika."""
+        return os.path.join(self.base_dir, name)
+
+    def shard(self, pattern) -> str:
+        """Ścieżka pliku shardu użytkownika silnika (pattern = SHARD_*)."""
+        return shard_path(self.base_dir, pattern, self.user)
+
+    @timed("engine.open")
+    def open(self):
+        """Otwiera shard transakcji użytkownika, wczytuje budżety i cykliczne."""
+        split_legacy(self.key, self.base_dir)              # wspólny plik starszej wersji -> shardy
+        if self.backend is None:
+            self.backend = detect_backend(self.base_dir, self.user)  # tam, gdzie są dane
+        if self.backend == BACKEND_SQLITE:
+            self.open_sqlite()                             # baza na dysku
+        else:
+            self.open_memory()                             # snapshot + dziennik w RAM
+        self.load_budgets()                                # wczytaj budżety z CSV
+        self.load_recurring()                              # wczytaj cykliczne z JSON
+        return self
+
+    def open_memory(self):
+        """Wczytuje snapshot i odtwarza dziennik; dane z bazy SQLite (po zmianie magazynu) przenosi do RAM."""
+        from budget_journal import TransactionJournal  # import odroczony (cryptography)
+        self.load_transactions()                       # odszyfruj w pamięci i wczytaj transakcje
+        self.journal = TransactionJournal(self.shard(SHARD_JOURNAL), self.key, self.write_snapshot)  # dziennik zmian
+        self.journal.replay(self.store)                # dołóż zmiany sprzed awarii/zamknięcia
+        if detect_backend(self.base_dir, self.user) == BACKEND_SQLITE:  # dane jeszcze w bazie?
+            self.migrate_from_sqlite()
+
+    def open_sqlite(self):
+        """Otwiera bazę SQLite (odpieczętowuje ją); nowa baza przejmuje snapshot i dziennik."""
+        from budget_sqlite import SqliteStore, unseal, seal, remove_database  # import odroczony
+        db, sealed = self.shard(SHARD_DB), self.shard(SHARD_DB_SEALED)
+        if os.path.exists(db):                         # jawna baza z przerwanej sesji (nowsza niż zapieczętowana)
+            SqliteStore(db).close()                    # dołącz WAL do pliku bazy
+            seal(db, sealed, self.key)                 # od razu zaszyfruj i usuń jawne pliki (z WAL/SHM)
+        remove_database(db)                            # niepełna kopia z przerwanego odpieczętowania (.tmp)
+        if os.path.exists(sealed):
+            unseal(sealed, db, self.key)               # odszyfruj do pliku sesji
+        fresh = not os.path.exists(db)                 # pierwsze uruchomienie z SQLite?
+        self.store = SqliteStore(db)                   # WAL + indeksy
+        if fresh:
+            try:
+                self.migrate_to_sqlite()               # przenieś dane z magazynu w RAM
+            except BaseException:
+                self.store.conn.close()
+                remove_database(db)                    # pusta baza nie może przesłonić starych plików
+                raise
+
+    def migrate_to_sqlite(self):
+        """Jednorazowo przenosi snapshot i dziennik użytkownika do bazy (jedna transakcja), potem je usuwa."""
+        from budget_codec import open_encrypted_text       # import odroczony (cryptography)
+        from budget_journal import TransactionJournal      # j.w.
+        encrypted = self.shard(SHARD_FILE)
+        journal = TransactionJournal(self.shard(SHARD_JOURNAL), self.key, None)  # tylko odczyt i sprzątanie
+        with self.store.deferred_indexes():                # wszystko albo nic
+            if os.path.exists(encrypted):                  # zaszyfrowany snapshot
+                with open_encrypted_text(encrypted, self.key) as f:
+                    self.store.load_csv(f)                 # strumieniowo, bez całości w RAM
+            journal.replay(self.store)                     # zmiany po snapshocie
+        if os.path.exists(encrypted):
+            os.remove(encrypted)                           # dane są już w bazie
+        journal.discard()                                  # j.w.
+
+    def migrate_from_sqlite(self):
+        """Jednorazowo przenosi wiersze z bazy SQLite do magazynu w RAM, zapisuje snapshot i usuwa bazę."""
+        from budget_sqlite import SqliteStore, unseal, remove_database  # import odroczony
+        db, sealed = self.shard(SHARD_DB), self.shard(SHARD_DB_SEALED)
+        if not os.path.exists(db):
+            unseal(sealed, db, self.key)                   # odpieczętuj do odczytu
+        source = SqliteStore(db)
+        with self.store.deferred_indexes():                # jedna przebudowa indeksów
+            for t in source:
+                self.store.append(t.user, t.data, t.rodzaj, t.kategoria, t.opis, t.kwota, t.tid)  # z tym samym ID
+        source.close()
+        self.save_transactions(force=True)                 # snapshot przed usunięciem bazy
+        remove_database(db, sealed)                        # jawna i zapieczętowana
+
+    def save_all(self):
+        """Zapisuje transakcje (snapshot albo zapieczętowana baza), budżety i cykliczne."""
+        self.close()              # snapshot + pusty dziennik / baza zapieczętowana
+        self.save_budgets()       # zapisz budżety
+        self.save_recurring()     # zapisz cykliczne
+
+    def close(self):
+        """Kończy pracę: w RAM – snapshot (czyści dziennik); w SQLite – pieczętuje bazę i usuwa jawny plik."""
+        if self.journal is None:                           # SQLite: każda zmiana już zatwierdzona
+            from budget_sqlite import seal, remove_database  # import odroczony (cryptography)
+            db, sealed = self.shard(SHARD_DB), self.shard(SHARD_DB_SEALED)
+            self.store.close()                             # checkpoint WAL i zamknięcie
+            if self.store.changed or not os.path.exists(sealed):
+                seal(db, sealed, self.key)                 # zaszyfruj i usuń jawny plik
+            else:
+                remove_database(db)                        # bez zmian: zapieczętowana kopia aktualna
+            return
+        self.save_transactions()  # snapshot + pusty dziennik (tylko po zmianach)
+        self.journal.close()      # zamknij dziennik
+
+    # --- ODCZYT / ZAPIS TRANSAKCJI ---
+    @timed("engine.load_transactions")
+    def load_transactions(self):
+        """Wczytuje shard użytkownika do magazynu: odszyfrowane kawałki idą prosto do parsera CSV (bez pliku jawnego)."""
+        from budget_codec import open_encrypted_text                       # import odroczony (cryptography)
+        self.store.clear()                                                  # wyczyść magazyn
+        encrypted = self.shard(SHARD_FILE)                                  # tylko własny shard
+        if not os.path.exists(encrypted):                                   # jeśli brak danych
+            return                                                          # pomiń
+        with open_encrypted_text(encrypted, self.key) as f:                 # strumień z pamięci
+            self.store.load_csv(f)                                          # wczytaj wiersze do kolumn
+        count("engine.rows_loaded", len(self.store))                        # wielkość shardu
+
+    @timed("engine.save_transactions")
+    def save_transactions(self, force=False):
+        """
+        Zapisuje zaszyfrowany snapshot shardu i czyści dziennik (synchronicznie), ale tylko gdy dziennik ma zmiany
+        albo force=True (zmiany poza dziennikiem, np. import). SQLite – nic do zrobienia.
+        """
+        if self.journal is None:
+            return
+        self.journal.wait()                                                 # dokończ kompaktowanie w tle
+        if force or self.journal.size():                                    # niezapisane zmiany?
+            self.journal.compact(self.store)                                # snapshot + sprzątanie
+
+    @timed("engine.write_snapshot")
+    def write_snapshot(self, snapshot):
+        """Zapisuje kopię magazynu jako zaszyfrowany shard (wołane także z wątku dziennika)."""
+        encrypt_store(snapshot, self.shard(SHARD_FILE), self.key)           # szyfruj z pamięci
+
+    def journal_changed(self):
+        """Po zapisie rekordu w dzienniku: kompaktuje w tle, gdy dziennik urósł."""
+        if self.journal is not None:
+            self.journal.maybe_compact(self.store)                          # O(1), chyba że próg
+
+    # --- ZMIANY TRANSAKCJI (MAGAZYN + DZIENNIK) ---
+    # W SQLite magazyn sam zatwierdza każdą zmianę – dziennik (self.journal) jest wtedy None.
+    def add_transaction(self, user, data, rodzaj, kategoria, opis, kwota) -> int:
+        """Dodaje transakcję i zapisuje ją w dzienniku; ValueError przy błędnej dacie/kwocie."""
+        idx = self.store.append(user, data, rodzaj, kategoria, opis, kwota)  # walidacja + wiersz
+        if self.journal is not None:
+            self.journal.log_add(self.store.view(idx))                      # dopisz rekord do dziennika
+            self.journal_changed()                                          # ewentualne kompaktowanie
+        return idx
+
+    def update_transaction(self, idx, **fields):
+        """Zmienia pola transakcji i zapisuje nowy stan w dzienniku; ValueError przy błędnych danych."""
+        self.store.update(idx, **fields)                                    # walidacja przed zmianą
+        if self.journal is not None:
+            self.journal.log_edit(self.store.view(idx))                     # nowy stan w dzienniku
+            self.journal_changed()                                          # ewentualne kompaktowanie
+
+    def remove_transaction(self, idx):
+        """Usuwa transakcję (znacznik) i zapisuje usunięcie w dzienniku."""
+        if self.journal is not None:
+            self.journal.log_delete(self.store.view(idx).tid)               # rekord usunięcia (po ID)
+        self.store.remove(idx)                                              # znacznik usunięcia, O(1)
+        self.journal_changed()                                              # ewentualne kompaktowanie
+
+    @timed("engine.import_rows")
+    def import_rows(self, rows, batch_size, progress=None) -> list:
+        """
+        Dodaje wiersze (krotki pól FIELDNAMES, np. z budget_import.pipeline) partiami, z indeksami przebudowanymi
+        raz na końcu (SQLite: jedna transakcja) i jednym zapisem snapshotu zamiast rekordu dziennika na wiersz. Błąd w trakcie wycofuje
+        cały import. progress(liczba) jest wołane po każdej partii. Zwraca indeksy nowych wierszy.
+        """
+        added = []                                                          # nowe wiersze
+        rows = iter(rows)                                                   # generator potoku
+        append = self.store.append                                          # lokalna referencja (szybciej)
+        with self.store.deferred_indexes():                                 # bez N wstawień do indeksów
+            try:
+                while True:
+                    batch = list(islice(rows, batch_size))                  # kolejna partia z potoku
+                    if not batch:
+                        break
+                    added.extend(append(*row) for row in batch)             # walidacja daty/kwoty w magazynie
+                    if progress is not None:
+                        progress(len(added))                                # postęp po partii
+            except BaseException:
+                for idx in added:                                           # wszystko albo nic
+                    self.store.remove(idx)
+                raise
+        if added:
+            self.save_transactions(force=True)                              # jeden snapshot (czyści dziennik)
+        return added
+
+    # --- ODCZYT / ZAPIS BUDŻETÓW ---
+    def load_budgets(self):
+        """Wczytuje budżety z CSV do self.budgets ({kategoria: {"limit", "period"}})."""
+        self.budgets.clear()                                           # wyczyść dict
+        if not os.path.exists(self.path(BUDGETS_FILE)):                # jeśli brak pliku
+            return                                                     # pomiń
+        with open(self.path(BUDGETS_FILE), 'r', newline='', encoding='utf-8') as f:  # otwórz do odczytu
+            reader = csv.reader(f)                                         # czytnik CSV
+            for row in reader:                                             # iteruj wiersze
+                if len(row) not in (2, 3):                                 # kategoria, limit[, okres]
+                    continue                                               # pomiń błędne
+                cat, limit_str = row[0], row[1]                            # odczytaj
+                period = row[2] if len(row) == 3 else PERIOD_ALL           # stare pliki: limit na całość
+                if period not in PERIODS:
+                    continue                                               # nieznany okres
+                try:
+                    self.budgets[cat] = {"limit": float(limit_str), "period": period}  # rzutuj na float
+                except ValueError:
+                    pass                                                   # pomiń błędne
+
+    def save_budgets(self):
+        """Zapisuje self.budgets (dict) do CSV (kategoria, limit, okres)."""
+        with open(self.path(BUDGETS_FILE), 'w', newline='', encoding='utf-8') as f:  # otwórz do zapisu
+            writer = csv.writer(f)                                         # pisarz CSV
+            for cat, budget in self.budgets.items():                       # iteruj po dict
+                writer.writerow([cat, budget["limit"], budget["period"]])  # zapisz wiersz
+
+    # --- ODCZYT / ZAPIS CYKLICZNYCH ---
+    def load_recurring(self):
+        """Wczytuje transakcje cykliczne z JSON i buduje kopiec harmonogramu."""
+        self.recurring.clear()                                  # ten sam dict (współdzielony z GUI)
+        if os.path.exists(self.path(RECURRING_FILE)):           # jeśli plik istnieje
+            with open(self.path(RECURRING_FILE), 'r', encoding='utf-8') as f:  # wczytaj JSON
+                self.recurring.update(json.load(f))             # reguły
+        self.scheduler = RecurringScheduler(self.recurring, self.user)  # kopiec reguł użytkownika po dacie wystąpienia
+
+    def save_recurring(self):
+        """Zapisuje self.recurring (dict) do JSON (ładny format)."""
+        with open(self.path(RECURRING_FILE), 'w', encoding='utf-8') as f:  # otwórz do zapisu
+            json.dump(self.recurring, f, indent=2, ensure_ascii=False)     # zapisz pretty
+
+    @timed("engine.post_recurring")
+    def post_recurring(self, until=None) -> list:
+        """Dopisuje należne wystąpienia cyklicznych do dnia 'until' (ordinal, domyślnie dziś); zwraca indeksy."""
+        if until is None:
+            until = date.today().toordinal()                   # dzisiejszy dzień (ordinal)
+        if self.journal is None:
+            with self.store.deferred_indexes():                # SQLite: cała partia w jednej transakcji
+                posted = self.scheduler.post_due(self.store, until)
+        else:
+            posted = self.scheduler.post_due(self.store, until)  # tylko reguły z wierzchu kopca
+
+        if posted:                          # jeśli były dopisane
+            count("engine.recurring_posted", len(posted))
+            if self.journal is not None:
+                self.journal.log_adds(self.store.view(idx) for idx in posted)  # cała partia, jeden fsync
+            self.save_recurring()           # nowe next_date (po awarii przed zapisem: te same ID -> pominięte)
+            self.journal_changed()          # ewentualne kompaktowanie
+        return posted
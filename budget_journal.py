@@ -0,0 +1,226 @@
+# --- DZIENNIK ZMIAN TRANSAKCJI: DOPISYWANY, SZYFROWANY REKORD PO REKORDZIE ---
+import json                    # treść rekordu
+import os                      # operacje na plikach
+import threading               # kompaktowanie w tle
+
+from cryptography.fernet import Fernet, InvalidToken  # szyfrowanie pojedynczych rekordów
+
+from budget_store import format_tid, parse_tid        # ID transakcji <-> tekst
+from budget_diagnostics import timed, count           # punkty pomiarowe (wyłączone = bez kosztu)
+
+JOURNAL_COMPACT_BYTES = 1024 * 1024    # próg rozmiaru dziennika, po którym robimy nowy snapshot
+
+OP_ADD = "add"         # rekord: nowa transakcja (pełny wiersz)
+OP_EDIT = "edit"       # rekord: zmieniona transakcja (pełny wiersz)
+OP_DELETE = "del"      # rekord: usunięta transakcja (tylko ID)
+
+class TransactionJournal:
+    """
+    Dziennik zmian: każda zmiana to jedna linia = osobny token Fernet z JSON {op, id, row}.
+    Stan = snapshot + odtworzenie segmentów dziennika (obrócone '.N' i bieżący).
+    Rekordy add/edit niosą pełny wiersz, więc ponowne odtworzenie jest idempotentne.
+    """
+
+    def __init__(self, path, key, write_snapshot, compact_bytes=JOURNAL_COMPACT_BYTES):
+        self.path = path                       # bieżący segment dziennika
+        self.fernet = Fernet(key)              # szyfrowanie rekordów
+        self.write_snapshot = write_snapshot   # funkcja zapisująca snapshot magazynu (kopii)
+        self.compact_bytes = compact_bytes     # próg kompaktowania
+        self.last_error = None                 # ostatni błąd kompaktowania w tle
+        self._file = None                      # otwarty bieżący segment (leniwie)
+        self._thread = None                    # wątek kompaktowania
+        self._lock = threading.Lock()          # chroni listę segmentów przy obracaniu/sprzątaniu
+
+    # --- SEGMENTY ---
+    def _rotated_segments(self):
+        """Zwraca obrócone segmenty (numer, ścieżka) rosnąco po numerze."""
+        folder = os.path.dirname(os.path.abspath(self.path))   # katalog dziennika
+        prefix = os.path.basename(self.path) + "."             # 'plik.bin.'
+        found = []                                             # lista (numer, ścieżka)
+        for name in os.listdir(folder):                        # przejrzyj katalog
+            suffix = name[len(prefix):]                        # część po prefiksie
+            if name.startswith(prefix) and suffix.isdigit():   # 'plik.bin.N'
+                found.append((int(suffix), os.path.join(folder, name)))
+        return sorted(found)                                   # najstarsze najpierw
+
+    def segment_size(self) -> int:
+        """Zwraca rozmiar bieżącego segmentu w bajtach (próg kompaktowania; bez przeglądania katalogu)."""
+        if self._file is not None:                     # plik otwarty?
+            return self._file.tell()                   # pozycja końca
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0  # rozmiar na dysku
+
+    def size(self) -> int:
+        """Zwraca rozmiar całego dziennika w bajtach: bieżący segment i obrócone, jeszcze nieskompaktowane '.N'."""
+        with self._lock:
+            rotated = sum(os.path.getsize(p) for _, p in self._rotated_segments() if os.path.exists(p))
+        return self.segment_size() + rotated
+
+    # --- ODTWARZANIE ---
+    def _records(self, path):
+        """
+        Zwraca generator odszyfrowanych rekordów segmentu. Pomijany jest tylko urwany ostatni rekord (zapis przerwany
+        awarią – linia bez '\n'); każdy inny nieczytelny rekord (uszkodzenie, inny klucz) to ValueError, bo
+        pominięcie go zgubiłoby też późniejsze zmiany tej transakcji, a kompaktowanie utrwaliłoby tę stratę.
+        """
+        with open(path, 'rb') as f:                    # czytaj binarnie
+            for number, raw in enumerate(f, 1):        # jeden token na linię
+                line = raw.strip()                     # bez '\n'
+                if not line:
+                    continue                           # pusta linia
+                try:
+                    record = json.loads(self.fernet.decrypt(line))  # odszyfruj i zdekoduj
+                except (InvalidToken, ValueError):
+                    if not raw.endswith(b"\n"):          # ostatnia linia bez końca = urwany zapis
+                        count("journal.torn_records")
+                        return
+                    raise ValueError(f"Uszkodzony rekord dziennika {os.path.basename(path)} (linia {number}): "
+                                     "zły klucz albo uszkodzony plik") from None
+                yield record
+
+    @timed("journal.replay")
+    def replay(self, store) -> int:
+        """Nakłada wszystkie segmenty dziennika na magazyn; zwraca liczbę rekordów."""
+        paths = [p for _, p in self._rotated_segments()]   # obrócone segmenty
+        if os.path.exists(self.path):
+            paths.append(self.path)                        # bieżący segment na końcu
+        replayed = 0                                       # licznik rekordów
+        for path in paths:
+            for rec in self._records(path):
+                apply_record(store, rec)                   # zastosuj zmianę
+                replayed += 1
+        count("journal.records_replayed", replayed)
+        return replayed
+
+    # --- ZAPIS ---
+    def _append(self, *records):
+        """Dopisuje zaszyfrowane rekordy i raz wymusza zapis na dysk (O(1) na zmianę)."""
+        if self._file is None:                         # pierwsze użycie
+            self._file = open(self.path, 'ab')         # dopisywanie binarne
+            if self._file.tell() and not _ends_with_newline(self.path):  # urwany ogon po awarii?
+                self._file.truncate(_complete_length(self.path))  # utnij niepełny rekord (nie został zapisany)
+        for record in records:                         # jeden token na linię
+            self._file.write(self.fernet.encrypt(json.dumps(record, ensure_ascii=False).encode('utf-8')) + b"\n")
+        self._file.flush()                             # bufor -> system
+        os.fsync(self._file.fileno())                  # system -> dysk
+
+    def log_add(self, view):
+        """Zapisuje dodanie transakcji (widok wiersza magazynu)."""
+        self._append({"op": OP_ADD, "id": format_tid(view.tid), "row": view.as_dict()})
+
+    def log_adds(self, views):
+        """Zapisuje partię dodanych transakcji (np. zaległe cykliczne) z jednym fsync."""
+        self._append(*({"op": OP_ADD, "id": format_tid(v.tid), "row": v.as_dict()} for v in views))
+
+    def log_edit(self, view):
+        """Zapisuje zmianę transakcji (pełny nowy stan wiersza)."""
+        self._append({"op": OP_EDIT, "id": format_tid(view.tid), "row": view.as_dict()})
+
+    def log_delete(self, tid):
+        """Zapisuje usunięcie transakcji o danym ID."""
+        self._append({"op": OP_DELETE, "id": format_tid(tid)})
+
+    # --- KOMPAKTOWANIE ---
+    def _rotate(self):
+        """Zamyka bieżący segment i zmienia jego nazwę na '.N'; zwraca listę segmentów do skasowania."""
+        if self._file is not None:
+            self._file.close()                         # zamknij bieżący
+            self._file = None
+        with self._lock:
+            segments = self._rotated_segments()        # istniejące obrócone
+            if os.path.exists(self.path):              # bieżący niepusty?
+                seq = segments[-1][0] + 1 if segments else 1  # kolejny numer
+                rotated = f"{self.path}.{seq}"
+                os.replace(self.path, rotated)         # atomowa zmiana nazwy
+                segments.append((seq, rotated))
+        return [p for _, p in segments]                # wszystko to wejdzie do snapshotu
+
+    def _compact(self, snapshot, segments):
+        """Zapisuje snapshot, a potem kasuje segmenty, które już zawiera."""
+        try:
+            self.write_snapshot(snapshot)              # nowy zaszyfrowany snapshot (atomowo)
+        except Exception as exc:                       # segmenty zostają -> nic nie ginie
+            self.last_error = exc
+            return
+        with self._lock:
+            for path in segments:
+                if os.path.exists(path):
+                    os.remove(path)                    # już w snapshocie
+
+    def compacting(self) -> bool:
+        """Czy trwa kompaktowanie w tle."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def maybe_compact(self, store):
+        """Po przekroczeniu progu uruchamia kompaktowanie w tle (kopia kolumn, zapis w wątku)."""
+        if self.segment_size() < self.compact_bytes or self.compacting():  # za mały albo już trwa
+            return False
+        snapshot = store.snapshot()                    # spójna kopia (w wątku GUI)
+        segments = self._rotate()                      # nowe zmiany trafią do nowego segmentu
+        self._thread = threading.Thread(target=self._compact, args=(snapshot, segments), daemon=True)
+        self._thread.start()                           # zapis w tle
+        return True
+
+    def compact(self, store):
+        """Kompaktuje synchronicznie (np. przy wyjściu): snapshot + pusty dziennik."""
+        self.wait()                                    # dokończ ewentualne kompaktowanie w tle
+        self.last_error = None                         # liczy się tylko ten zapis
+        self._compact(store.snapshot(), self._rotate())  # zapisz i posprzątaj
+        if self.last_error is not None:                # zapis się nie udał?
+            error, self.last_error = self.last_error, None
+            raise error                                # zgłoś wywołującemu
+
+    def wait(self):
+        """Czeka na zakończenie kompaktowania w tle."""
+        if self._thread is not None:
+            self._thread.join()                        # czekaj na wątek
+            self._thread = None
+
+    def discard(self):
+        """Zamyka dziennik i usuwa wszystkie segmenty (zmiany przeniesione do innego magazynu)."""
+        self.wait()                                    # bez kompaktowania w tle
+        self.close()
+        with self._lock:
+            for _, path in self._rotated_segments():
+                os.remove(path)                        # obrócone segmenty
+            if os.path.exists(self.path):
+                os.remove(self.path)                   # bieżący segment
+
+    def close(self):
+        """Zamyka bieżący segment."""
+        if self._file is not None:
+            self._file.close()                         # zamknij plik
+            self._file = None
+
+def apply_record(store, rec):
+    """Nakłada jeden rekord dziennika na magazyn (upsert / usunięcie po ID)."""
+    tid = parse_tid(rec["id"])                         # ID transakcji
+    idx = store.index_of(tid)                          # wiersz o tym ID (O(1))
+    if rec["op"] == OP_DELETE:
+        if idx is not None:
+            store.remove(idx)                          # usuń, jeśli jest
+        return
+    row = rec["row"]                                   # pełny stan wiersza
+    if idx is None:
+        store.append_row(row, tid)                     # nowy albo odtworzony po snapshot
+    else:
+        store.update(idx, data=row["data"], rodzaj=row["rodzaj"], kategoria=row["kategoria"],
+                     opis=row["opis"], kwota=row["kwota"])  # nadpisz stan
+
+def _ends_with_newline(path) -> bool:
+    """Czy plik kończy się znakiem nowej linii (pełny ostatni rekord)."""
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)                        # ostatni bajt
+        return f.read(1) == b"\n"
+
+def _complete_length(path, block=64 * 1024) -> int:
+    """Długość pliku do ostatniego '\n' włącznie (pełne rekordy), szukana od końca blokami."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)                   # rozmiar pliku
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            found = f.read(end - start).rfind(b"\n")   # ostatni koniec linii w bloku
+            if found >= 0:
+                return start + found + 1
+            end = start
+        return 0                                       # cały plik to urwany rekord
@@ -0,0 +1,157 @@
+# --- PLANOWANIE BUDŻETU: ZESTAWIENIA MIESIĘCZNE / KWARTALNE / ROCZNE Z PRZENIESIENIEM I TRENDEM (BEZ GUI) ---
+"""
+Raport zakładki 'Planowanie Budżetu' dla wybranego okresu (miesiąc, kwartał, rok):
+limit przeliczony na okres, przeniesienie niewykorzystanej (albo przekroczonej) kwoty z wcześniejszych
+okresów tego samego roku, wydatki oraz trend względem poprzedniego okresu i średniej kilku poprzednich.
+Wydatki pochodzą z sum per (kategoria, okres) utrzymywanych przez magazyn (spent_by_category),
+więc koszt raportu zależy od liczby kategorii i okresów w roku, a nie od liczby transakcji.
+"""
+from datetime import date      # etykiety okresów
+
+from budget_store import (PERIOD_WEEK, PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR, PERIOD_ALL,  # okresy
+                          period_bounds, from_grosze)  # granice okresów, grosze -> zł
+
+PLANNING_PERIODS = (PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR)  # okresy widoku zakładki
+PLANNING_TREND_PERIODS = 3     # ile poprzednich okresów wchodzi do średniej trendu
+PERIOD_MONTHS = {PERIOD_MONTH: 1, PERIOD_QUARTER: 3, PERIOD_YEAR: 12}  # długość okresu w miesiącach
+
+# --- OKRESY ---
+def previous_period(period, ordinal) -> int:
+    """Zwraca ostatni dzień okresu poprzedzającego okres zawierający 'ordinal'."""
+    return period_bounds(period, ordinal)[0] - 1
+
+def next_period(period, ordinal) -> int:
+    """Zwraca pierwszy dzień okresu następującego po okresie zawierającym 'ordinal'."""
+    return period_bounds(period, ordinal)[1] + 1
+
+def period_label(period, ordinal) -> str:
+    """Etykieta okresu: '2026-10', '2026-Q4' albo '2026'."""
+    d = date.fromordinal(ordinal)
+    if period == PERIOD_MONTH:
+        return f"{d.year:04d}-{d.month:02d}"
+    if period == PERIOD_QUARTER:
+        return f"{d.year:04d}-Q{(d.month - 1) // 3 + 1}"
+    return f"{d.year:04d}"
+
+def scaled_limit(budget, period, ordinal):
+    """Limit budżetu (zł) przeliczony na okres widoku; None dla limitu na całą historię."""
+    limit, own = budget["limit"], budget["period"]
+    if own == PERIOD_ALL:
+        return None                                                # limit bez okresu – nie da się rozłożyć
+    if own == PERIOD_WEEK:
+        start, end = period_bounds(period, ordinal)
+        return limit * (end - start + 1) / 7                       # tygodnie w okresie (także ułamkowe)
+    return limit * PERIOD_MONTHS[period] / PERIOD_MONTHS[own]      # miesiąc/kwartał/rok
+
+# --- RAPORT ---
+class PlanningRow:
+    """Wiersz raportu jednej kategorii (kwoty w zł; limit/przeniesienie None, gdy kategoria nie ma limitu okresowego)."""
+    __slots__ = ("category", "limit", "carry", "spent", "previous", "average")
+
+    def __init__(self, category, limit, carry, spent, previous, average):
+        self.category = category   # kategoria
+        self.limit = limit         # limit na okres widoku
+        self.carry = carry         # przeniesienie z wcześniejszych okresów roku
+        self.spent = spent         # wydatki w okresie
+        self.previous = previous   # wydatki w poprzednim okresie
+        self.average = average     # średnie wydatki w (najwyżej) PLANNING_TREND_PERIODS poprzednich okresach
+
+    @property
+    def available(self):
+        """Limit z przeniesieniem (None bez limitu)."""
+        return None if self.limit is None else self.limit + self.carry
+
+    @property
+    def remaining(self):
+        """Ile zostało (ujemne = przekroczono; None bez limitu)."""
+        return None if self.limit is None else self.available - self.spent
+
+def planning_report(store, user, budgets, period, ordinal) -> list:
+    """
+    Wiersze raportu dla okresu 'period' zawierającego dzień 'ordinal' (kategorie z limitem albo z wydatkami).
+    Przeniesienie liczone łańcuchem od początku roku (rok zaczyna budżet od zera); w widoku rocznym zawsze 0.
+    """
+    spent = {}                                                     # ostatni dzień okresu -> {kategoria: grosze}
+
+    def spent_in(day):
+        end = period_bounds(period, day)[1]                        # klucz okresu
+        if end not in spent:
+            spent[end] = store.spent_by_category(user, period, day)  # sumy z magazynu (bez skanu)
+        return spent[end]
+
+    current = spent_in(ordinal)
+    span = store.balance_timeline(user).span()                     # pierwszy dzień z ruchem (albo None)
+    history = []                                                   # poprzednie okresy z historią, od najbliższego
+    day = ordinal
+    for _ in range(PLANNING_TREND_PERIODS):
+        day = previous_period(period, day)
+        if span is None or day < span[0]:
+            break                                                  # okresy sprzed pierwszej transakcji nie zaniżają średniej
+        history.append(spent_in(day))
+
+    year_start = date(date.fromordinal(ordinal).year, 1, 1).toordinal()  # przeniesienie tylko w obrębie roku
+    chain = []                                                     # dni okresów roku przed bieżącym (chronologicznie)
+    day = previous_period(period, ordinal)
+    while period != PERIOD_YEAR and day >= year_start:
+        chain.append(day)
+        day = previous_period(period, day)
+    chain.reverse()
+
+    rows = []
+    for cat in sorted(set(budgets) | set(current)):                # kategorie z limitem albo z wydatkami
+        budget = budgets.get(cat)
+        limit = scaled_limit(budget, period, ordinal) if budget else None
+        carry = None
+        if limit is not None:
+            carry = 0.0
+            for day in chain:                                      # niewykorzystane przechodzi dalej
+                carry += scaled_limit(budget, period, day) - from_grosze(spent_in(day).get(cat, 0))
+        previous = from_grosze(history[0].get(cat, 0)) if history else 0.0
+        average = sum(from_grosze(h.get(cat, 0)) for h in history) / len(history) if history else 0.0
+        rows.append(PlanningRow(cat, limit, carry, from_grosze(current.get(cat, 0)), previous, average))
+    return rows
+
+def lifetime_rows(store, user, budgets) -> list:
+    """Limity na całą historię (PERIOD_ALL): [(kategoria, limit, wydano)] w zł – sumy przyrostowe magazynu."""
+    return [(cat, budget["limit"], from_grosze(store.spent_in_period(user, cat, PERIOD_ALL, 0)))
+            for cat, budget in sorted(budgets.items()) if budget["period"] == PERIOD_ALL]
+
+def _trend(row) -> str:
+    """Zmiana wydatków względem średniej poprzednich okresów: '↑ 12%', '↓ 5%', 'nowe' albo ''."""
+    if not row.average:
+        return "nowe" if row.spent else ""
+    change = (row.spent - row.average) / row.average * 100
+    if abs(change) < 0.5:
+        return "= 0%"
+    return f"{'↑' if change > 0 else '↓'} {abs(change):.0f}%"
+
+def format_report(rows, period, ordinal, lifetime=()) -> str:
+    """Tekst raportu (z lifetime_rows na końcu) do jednego wstawienia w pole tekstowe (kolumny o stałej szerokości)."""
+    amount = lambda value: "-" if value is None else f"{value:.2f}"  # brak limitu -> '-'
+    header = (f"{'Kategoria':15s} | {'Limit':>10s} | {'Przeniesienie':>13s} | {'Dostępne':>10s} | {'Wydano':>10s} | "
+              f"{'Pozostało':>10s} | {'Poprzedni':>10s} | {f'Śr. {PLANNING_TREND_PERIODS}':>10s} | Trend")
+    lines = [f"Okres: {period_label(period, ordinal)}", "", header, "-" * len(header)]
+    for row in rows:
+        line = (f"{row.category:15s} | {amount(row.limit):>10s} | {amount(row.carry):>13s} | "
+                f"{amount(row.available):>10s} | {row.spent:10.2f} | {amount(row.remaining):>10s} | "
+                f"{row.previous:10.2f} | {row.average:10.2f} | {_trend(row)}")
+        if row.remaining is not None and row.remaining < 0:
+            line += "  (Przekroczono!)"                            # jak w ostrzeżeniu przy dodawaniu
+        lines.append(line)
+    if not rows:
+        lines.append("Brak budżetów i wydatków w tym okresie.")
+    else:
+        budgeted = [row for row in rows if row.limit is not None]
+        lines.append("-" * len(header))
+        lines.append(f"{'Razem':15s} | {sum(r.limit for r in budgeted):10.2f} | {sum(r.carry for r in budgeted):13.2f} | "
+                     f"{sum(r.available for r in budgeted):10.2f} | {sum(r.spent for r in rows):10.2f} | "
+                     f"{sum(r.remaining for r in budgeted):10.2f} | {sum(r.previous for r in rows):10.2f} | "
+                     f"{sum(r.average for r in rows):10.2f} |")
+    if lifetime:
+        lines += ["", "Limity na całą historię:"]
+        for cat, limit, spent in lifetime:
+            line = f"{cat:15s} | {limit:10.2f} | wydano {spent:10.2f} | pozostało {limit - spent:10.2f}"
+            if spent > limit:
+                line += "  (Przekroczono!)"
+            lines.append(line)
+    return "\n".join(lines) + "\n"
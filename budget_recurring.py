@@ -0,0 +1,185 @@
+# --- TRANSAKCJE CYKLICZNE: HARMONOGRAMY I LENIWE WYSTĄPIENIA (BEZ GUI) ---
+import calendar                # długość miesiąca
+import hashlib                 # deterministyczne ID wystąpień
+import heapq                   # kolejka reguł po dacie następnego wystąpienia
+from datetime import date      # dzień tygodnia, rok/miesiąc z ordinala
+
+from budget_store import date_to_ordinal, ordinal_to_date  # 'YYYY-MM-DD' <-> ordinal
+
+SCHEDULE_INTERVAL = "interval"                  # co N dni (pole 'interval_days')
+SCHEDULE_MONTHLY_DAY = "monthly_day"            # co miesiąc, dnia N (pole 'day'; krótszy miesiąc -> ostatni dzień)
+SCHEDULE_LAST_BUSINESS_DAY = "last_business_day"  # ostatni dzień roboczy (pon–pt) miesiąca
+SCHEDULE_WEEKLY = "weekly"                      # co tydzień w dniu tygodnia (pole 'weekday', 0 = poniedziałek)
+SCHEDULES = (SCHEDULE_INTERVAL, SCHEDULE_MONTHLY_DAY, SCHEDULE_LAST_BUSINESS_DAY, SCHEDULE_WEEKLY)  # wszystkie
+
+RECURRING_PREFIX = "[Cykliczna] "               # prefiks opisu dopisanych wystąpień
+WEEKDAY_NAMES = ("pon", "wt", "śr", "czw", "pt", "sob", "nd")  # skróty dni tygodnia
+
+# --- KALENDARZ (NA ORDINALACH) ---
+def _month_of(ordinal: int) -> int:
+    """Numer miesiąca dnia (rok*12 + miesiąc-1)."""
+    d = date.fromordinal(ordinal)
+    return d.year * 12 + d.month - 1
+
+def _day_in_month(month: int, day: int) -> int:
+    """Ordinal dnia 'day' miesiąca (obcięty do ostatniego dnia miesiąca)."""
+    year, m = divmod(month, 12)                                    # rok, miesiąc-1
+    last = calendar.monthrange(year, m + 1)[1]                     # liczba dni miesiąca
+    return date(year, m + 1, min(day, last)).toordinal()
+
+def _last_business_day(month: int) -> int:
+    """Ordinal ostatniego dnia roboczego (pon–pt) miesiąca."""
+    last = _day_in_month(month, 31)                                # ostatni dzień miesiąca
+    weekday = date.fromordinal(last).weekday()                     # 5 = sobota, 6 = niedziela
+    return last - max(0, weekday - 4)                              # cofnij do piątku
+
+def _month_occurrence(rule, month: int) -> int:
+    """Wystąpienie reguły miesięcznej w danym miesiącu."""
+    if rule.get("schedule") == SCHEDULE_LAST_BUSINESS_DAY:
+        return _last_business_day(month)
+    return _day_in_month(month, rule["day"])
+
+# --- HARMONOGRAM ---
+def schedule_of(rule) -> str:
+    """Rodzaj harmonogramu reguły (stare wpisy bez pola = co N dni)."""
+    return rule.get("schedule", SCHEDULE_INTERVAL)
+
+def is_valid(rule) -> bool:
+    """Czy reguła ma poprawny harmonogram i datę (inaczej jest pomijana)."""
+    schedule = schedule_of(rule)
+    try:
+        date_to_ordinal(rule.get("next_date", ""))                 # poprawna data?
+    except ValueError:
+        return False
+    if schedule == SCHEDULE_INTERVAL:
+        return isinstance(rule.get("interval_days"), int) and rule["interval_days"] > 0  # 0 = pętla bez końca
+    if schedule == SCHEDULE_MONTHLY_DAY:
+        return isinstance(rule.get("day"), int) and 1 <= rule["day"] <= 31
+    if schedule == SCHEDULE_WEEKLY:
+        return isinstance(rule.get("weekday"), int) and 0 <= rule["weekday"] <= 6
+    return schedule == SCHEDULE_LAST_BUSINESS_DAY
+
+def first_on_or_after(rule, ordinal: int) -> int:
+    """Pierwsze wystąpienie reguły w dniu 'ordinal' lub później (O(1))."""
+    schedule = schedule_of(rule)
+    if schedule == SCHEDULE_INTERVAL:
+        return ordinal                                             # odliczanie od daty startu
+    if schedule == SCHEDULE_WEEKLY:
+        return ordinal + (rule["weekday"] - date.fromordinal(ordinal).weekday()) % 7  # najbliższy taki dzień
+    month = _month_of(ordinal)
+    occurrence = _month_occurrence(rule, month)                    # w tym miesiącu
+    if occurrence < ordinal:                                       # już minęło?
+        occurrence = _month_occurrence(rule, month + 1)            # następny miesiąc
+    return occurrence
+
+def next_after(rule, ordinal: int) -> int:
+    """Wystąpienie reguły następujące po wystąpieniu 'ordinal' (O(1))."""
+    schedule = schedule_of(rule)
+    if schedule == SCHEDULE_INTERVAL:
+        return ordinal + rule["interval_days"]
+    if schedule == SCHEDULE_WEEKLY:
+        return ordinal + 7
+    return _month_occurrence(rule, _month_of(ordinal) + 1)         # ten sam dzień kolejnego miesiąca
+
+def next_occurrence(rule) -> int:
+    """Najbliższe wystąpienie reguły (ordinal) – 'next_date' wyrównane do harmonogramu."""
+    return first_on_or_after(rule, date_to_ordinal(rule["next_date"]))
+
+def occurrences(rule, until: int):
+    """Leniwy generator zaległych wystąpień (ordinale) od 'next_date' do 'until' włącznie."""
+    ordinal = next_occurrence(rule)                                # wyrównaj start do harmonogramu
+    while ordinal <= until:
+        yield ordinal
+        ordinal = next_after(rule, ordinal)                        # kolejne, bez kroków dzień po dniu
+
+def normalize(rule):
+    """Przesuwa 'next_date' na pierwsze wystąpienie zgodne z harmonogramem (po dodaniu/edycji)."""
+    rule["next_date"] = ordinal_to_date(first_on_or_after(rule, date_to_ordinal(rule["next_date"])))
+
+def describe(rule) -> str:
+    """Krótki opis harmonogramu do tabeli."""
+    schedule = schedule_of(rule)
+    if schedule == SCHEDULE_MONTHLY_DAY:
+        return f"co miesiąc, dnia {rule['day']}"
+    if schedule == SCHEDULE_LAST_BUSINESS_DAY:
+        return "ost. dzień roboczy"
+    if schedule == SCHEDULE_WEEKLY:
+        return f"co tydzień ({WEEKDAY_NAMES[rule['weekday']]})"
+    return f"co {rule['interval_days']} dni"
+
+# --- DOPISYWANIE ZALEGŁYCH ---
+def occurrence_tid(rec_id, ordinal: int) -> int:
+    """
+    ID transakcji wystąpienia reguły (63 bity jak new_tid) wyliczone z (ID reguły, dzień): po awarii między
+    zapisem wierszy a zapisem 'next_date' ponowne dopisanie trafia na te same ID i jest pomijane.
+    """
+    digest = hashlib.sha256(f"{rec_id}:{ordinal}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") >> 1                 # mieści się w int64
+
+def post_rule(rec_id, rule, store, until: int) -> list:
+    """
+    Dopisuje zaległe wystąpienia jednej reguły do magazynu i przesuwa 'next_date'; zwraca indeksy nowych wierszy.
+    Wystąpienie, którego ID już jest w magazynie (dopisane przed awarią), jest pomijane.
+    """
+    if not is_valid(rule):                                         # błędna reguła -> pomiń
+        return []
+    opis = RECURRING_PREFIX + rule.get("opis", "")                 # opis z prefiksem
+    posted = []                                                    # nowe wiersze
+    last = None                                                    # ostatnie wystąpienie
+    for ordinal in occurrences(rule, until):
+        last = ordinal
+        tid = occurrence_tid(rec_id, ordinal)
+        if store.index_of(tid) is not None:
+            continue                                               # już dopisane (np. odtworzone z dziennika)
+        posted.append(store.append(rule["user"], ordinal_to_date(ordinal), rule["rodzaj"],
+                                   rule["kategoria"], opis, rule["kwota"], tid))  # dopisz wystąpienie
+    if last is not None:
+        rule["next_date"] = ordinal_to_date(next_after(rule, last))  # następne przyszłe wystąpienie
+    return posted
+
+# --- HARMONOGRAM W TRAKCIE SESJI ---
+class RecurringScheduler:
+    """
+    Kopiec (min-heap) reguł po dacie następnego wystąpienia: sprawdzenie, czy coś jest należne, to O(1),
+    a każde należne wystąpienie kosztuje O(log n) zamiast przeglądania wszystkich reguł.
+    Wpisy nieaktualne (reguła usunięta albo zmieniona) są pomijane przy zdejmowaniu z kopca.
+    Z podanym 'user' kopiec obejmuje tylko reguły tego użytkownika (magazyn trzyma tylko jego dane).
+    """
+
+    def __init__(self, recurring, user=None):
+        self.recurring = recurring     # słownik reguł (rec_id -> dict), współdzielony z aplikacją
+        self.user = user               # None = reguły wszystkich użytkowników
+        self._heap = []                # (ordinal następnego wystąpienia, rec_id)
+        for rec_id in recurring:
+            self.push(rec_id)          # kopiec z wszystkich reguł
+
+    def push(self, rec_id):
+        """Wstawia (ponownie) regułę do kopca – po dodaniu, edycji albo dopisaniu wystąpień."""
+        rule = self.recurring.get(rec_id)
+        if rule is None or (self.user is not None and rule.get("user") != self.user):
+            return                                                 # usunięta albo cudza reguła
+        if is_valid(rule):                                         # błędne reguły nie wchodzą
+            heapq.heappush(self._heap, (next_occurrence(rule), rec_id))
+
+    def _current(self, entry) -> bool:
+        """Czy wpis kopca odpowiada bieżącemu stanowi reguły."""
+        ordinal, rec_id = entry
+        rule = self.recurring.get(rec_id)
+        return rule is not None and is_valid(rule) and next_occurrence(rule) == ordinal
+
+    def next_due(self):
+        """Ordinal najbliższego wystąpienia spośród wszystkich reguł (None, gdy brak reguł)."""
+        while self._heap and not self._current(self._heap[0]):    # wyrzuć nieaktualne wpisy
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def post_due(self, store, until: int) -> list:
+        """Dopisuje wystąpienia należne do dnia 'until' włącznie; zwraca indeksy nowych wierszy."""
+        posted = []
+        while self._heap and self._heap[0][0] <= until:            # tylko należne reguły
+            entry = heapq.heappop(self._heap)
+            if not self._current(entry):
+                continue                                           # usunięta/zmieniona reguła
+            posted.extend(post_rule(entry[1], self.recurring[entry[1]], store, until))  # zaległe tej reguły
+            self.push(entry[1])                                    # wraca z nową datą
+        return posted
@@ -0,0 +1,420 @@
+# --- MAGAZYN TRANSAKCJI W SQLITE (WAL, INDEKSY), ZAPIECZĘTOWANY FERNETEM PO ZAMKNIĘCIU (BEZ GUI) ---
+"""
+Alternatywa dla kolumnowego TransactionStore z tym samym API (append/update/remove/view/user_indices/
+for_user/user_totals/spent_in_period...). Wiersze zostają na dysku – filtrowanie, sumy, budżety
+i kalendarz to zapytania po indeksach (user, data, ...) i (user, kategoria, data, ...), więc długa historia
+nie musi mieścić się w RAM. Cena: w trakcie sesji baza (z WAL/SHM) leży na dysku jawnie; przy zamknięciu jest
+szyfrowana kluczem Fernet (kontener segmentowy budget_codec) i usuwana, a jawna baza po awarii jest pieczętowana
+przy następnym otwarciu (BudgetEngine.open_sqlite).
+"""
+import csv                     # migracja z/do CSV
+import os                      # pliki bazy, WAL, SHM
+import sqlite3                 # baza danych
+from contextlib import contextmanager  # transakcja wsadu
+
+from budget_store import (FIELDNAMES, INCOME, EXPENSE, PERIOD_ALL,  # schemat i rodzaje
+                          date_to_ordinal, ordinal_to_date, to_grosze, from_grosze,  # konwersje
+                          new_tid, parse_tid, period_bounds,          # ID i okresy budżetów
+                          ordinal_to_month, month_label,              # miesiące sald
+                          BalanceTimeline, fold_text, search_tokens)  # oś salda, wyszukiwanie
+from budget_diagnostics import timed                  # punkty pomiarowe (wyłączone = bez kosztu)
+
+SQLITE_CACHE_KB = 8 * 1024     # pamięć podręczna stron SQLite (KiB) – stała, niezależna od liczby wierszy
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    idx       INTEGER PRIMARY KEY AUTOINCREMENT,  -- indeks wiersza (nigdy nie używany ponownie)
+    tid       INTEGER NOT NULL UNIQUE,            -- trwałe ID transakcji
+    user      TEXT    NOT NULL,
+    data      INTEGER NOT NULL,                   -- ordinal dnia
+    rodzaj    TEXT    NOT NULL,
+    kategoria TEXT    NOT NULL,
+    opis      TEXT    NOT NULL,
+    grosze    INTEGER NOT NULL
+);
+-- Indeksy pokrywające: sumy i limity liczone z samego indeksu, bez sięgania do wierszy tabeli (~6x szybciej).
+CREATE INDEX IF NOT EXISTS tx_user_data ON transactions (user, data, rodzaj, grosze);
+CREATE INDEX IF NOT EXISTS tx_user_kategoria ON transactions (user, kategoria, data, rodzaj, grosze);
+-- Wyszukiwanie: FTS5 nad opisem i kategorią po fold_text (jak TextIndex), utrzymywane wyzwalaczami.
+CREATE VIRTUAL TABLE IF NOT EXISTS tx_search USING fts5(tekst);
+CREATE TRIGGER IF NOT EXISTS tx_search_insert AFTER INSERT ON transactions BEGIN
+    INSERT INTO tx_search (rowid, tekst) VALUES (new.idx, search_text(new.opis, new.kategoria));
+END;
+CREATE TRIGGER IF NOT EXISTS tx_search_delete AFTER DELETE ON transactions BEGIN
+    DELETE FROM tx_search WHERE rowid = old.idx;
+END;
+CREATE TRIGGER IF NOT EXISTS tx_search_update AFTER UPDATE OF opis, kategoria ON transactions BEGIN
+    UPDATE tx_search SET tekst = search_text(new.opis, new.kategoria) WHERE rowid = new.idx;
+END;
+"""
+COLUMNS = "idx, tid, user, data, rodzaj, kategoria, opis, grosze"  # kolejność pól w SqliteView
+
+# --- WIDOK WIERSZA ---
+class SqliteView:
+    """Wiersz z bazy (krotka COLUMNS); pola jak w TransactionView (t["kwota"], t.kwota)."""
+    __slots__ = ("idx", "tid", "user", "ordinal", "rodzaj", "kategoria", "opis", "grosze")
+
+    def __init__(self, row):
+        self.idx, self.tid, self.user, self.ordinal, self.rodzaj, self.kategoria, self.opis, self.grosze = row
+
+    @property
+    def data(self):
+        return ordinal_to_date(self.ordinal)       # data 'YYYY-MM-DD'
+
+    @property
+    def kwota(self):
+        return from_grosze(self.grosze)            # kwota w zł
+
+    def __getitem__(self, key):
+        if key not in FIELDNAMES:                  # tylko pola z CSV
+            raise KeyError(key)                    # nieznany klucz
+        return getattr(self, key)                  # t["kwota"] == t.kwota
+
+    def as_dict(self):
+        """Zwraca wiersz jako dict (jak w pliku CSV)."""
+        return {name: getattr(self, name) for name in FIELDNAMES}  # kopia pól
+
+    def __repr__(self):
+        return f"SqliteView({self.idx}, {self.as_dict()!r})"     # czytelny podgląd
+
+def _search_text(opis, kategoria) -> str:
+    """Tekst wiersza w tabeli FTS (po fold_text, żeby zapytania bez ogonków pasowały)."""
+    return fold_text(f"{opis} {kategoria}")
+
+# --- MAGAZYN ---
+class SqliteStore:
+    """Magazyn transakcji w pliku SQLite (WAL); każda zmiana poza wsadem jest od razu zatwierdzona."""
+
+    def __init__(self, path):
+        self.path = path                                                # jawny plik bazy (tylko w sesji)
+        self.conn = sqlite3.connect(path, isolation_level=None)         # transakcje ręcznie (BEGIN/COMMIT)
+        self.conn.execute("PRAGMA journal_mode=WAL")                    # odczyty nie blokują zapisu
+        self.conn.execute("PRAGMA synchronous=NORMAL")                  # w WAL: trwałe po checkpoincie, bez fsync na zmianę
+        self.conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")      # ograniczona pamięć podręczna
+        self.conn.create_function("search_text", 2, _search_text, deterministic=True)  # dla wyzwalaczy FTS
+        had_search = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tx_search'").fetchone()  # baza sprzed wyszukiwania?
+        self.conn.executescript(SCHEMA)                                 # tabela i indeksy
+        if not had_search:
+            self.conn.execute("INSERT INTO tx_search (rowid, tekst) "
+                              "SELECT idx, search_text(opis, kategoria) FROM transactions")  # jednorazowo dla starych wierszy
+        self._batch = 0                                                 # głębokość wsadu (BEGIN ... COMMIT)
+        self.changed = False                                            # czy w tej sesji coś zapisano
+        self._timelines = {}                                            # user -> BalanceTimeline (po pierwszym zapytaniu)
+        self._period_cache = {}                                         # (user, od, do) -> {kategoria: wydatki}
+        self._frames = {}                                               # user -> AnalyticsFrame (po pierwszym zapytaniu)
+
+    def close(self):
+        """Przenosi WAL do pliku bazy i zamyka połączenie."""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")            # wszystko w pliku głównym
+        self.conn.close()
+
+    def _commit(self):
+        """Zatwierdza pojedynczą zmianę (we wsadzie – dopiero na końcu wsadu)."""
+        if not self._batch:
+            self.conn.execute("COMMIT")
+
+    def _begin(self):
+        """Rozpoczyna zmianę (poza wsadem – własną transakcję)."""
+        self.changed = True                                             # baza do ponownego zapieczętowania
+        self._period_cache.clear()                                      # sumy okresów nieaktualne
+        if not self._batch:
+            self.conn.execute("BEGIN")
+
+    @contextmanager
+    def _write(self):
+        """Pojedyncza zmiana: BEGIN, COMMIT po sukcesie, ROLLBACK przy dowolnym błędzie (we wsadzie – wycofuje wsad)."""
+        self._begin()
+        try:
+            yield
+        except BaseException:
+            if not self._batch:
+                self.conn.execute("ROLLBACK")                           # nie zostawiaj otwartej transakcji
+            raise
+        self._commit()
+
+    def _tracked(self, idx):
+        """Widok wiersza przed zmianą, gdy jakaś oś salda albo ramka jest zbudowana (inaczej None, bez zapytania)."""
+        if not self._timelines and not self._frames:
+            return None
+        row = self.conn.execute(f"SELECT {COLUMNS} FROM transactions WHERE idx = ?", (idx,)).fetchone()
+        return SqliteView(row) if row else None
+
+    def _retrack(self, old, new):
+        """Przenosi zmianę wiersza (widok przed / po, None = brak) na zbudowane osie salda (O(log dni)) i ramki (O(1))."""
+        for view, sign in ((old, -1), (new, 1)):
+            if view is None:
+                continue
+            frame = self._frames.get(view.user)
+            if frame is not None:
+                if self._batch:                                         # wsad może zostać wycofany
+                    del self._frames[view.user]
+                else:
+                    frame.apply(view.ordinal, view.rodzaj, view.kategoria, view.grosze, sign)
+                    if frame.stale:
+                        del self._frames[view.user]                     # za dużo zmian – zbuduj od nowa
+            if view.user not in self._timelines:
+                continue
+            if self._batch:                                             # wsad może zostać wycofany
+                del self._timelines[view.user]                          # zbuduj od nowa przy zapytaniu
+                continue
+            grosze = sign * view.grosze
+            if view.rodzaj == INCOME:
+                self._timelines[view.user].add(view.ordinal, grosze, 0)
+            elif view.rodzaj == EXPENSE:
+                self._timelines[view.user].add(view.ordinal, 0, grosze)
+
+    # --- ZAPIS / MODYFIKACJA ---
+    def append(self, user, data, rodzaj, kategoria, opis, kwota, tid=None) -> int:
+        """Dodaje wiersz (data jako 'YYYY-MM-DD', kwota w zł, tid=None -> nowe ID); zwraca indeks wiersza."""
+        ordinal = date_to_ordinal(data)                # najpierw walidacja daty
+        grosze = to_grosze(kwota)                      # i kwoty
+        if tid is None:
+            tid = new_tid()                            # wylosuj ID
+        try:
+            with self._write():
+                cur = self.conn.execute(
+                    "INSERT INTO transactions (tid, user, data, rodzaj, kategoria, opis, grosze) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (tid, user, ordinal, rodzaj, kategoria, opis, grosze))
+        except sqlite3.IntegrityError:                 # UNIQUE(tid)
+            raise ValueError(f"Duplikat ID transakcji: {tid:016x}") from None
+        if user in self._timelines or user in self._frames:
+            self._retrack(None, SqliteView((cur.lastrowid, tid, user, ordinal, rodzaj, kategoria, opis, grosze)))
+        return cur.lastrowid                           # idx nowego wiersza
+
+    def append_row(self, row, tid=None) -> int:
+        """Dodaje wiersz z dict (np. z csv.DictReader); ID z argumentu albo z pola 'id'."""
+        if tid is None and row.get("id"):              # plik z ID?
+            tid = parse_tid(row["id"])                 # użyj zapisanego ID
+        return self.append(row["user"], row["data"], row["rodzaj"],
+                           row["kategoria"], row["opis"], row["kwota"], tid)  # rozpakuj pola
+
+    def update(self, idx, data=None, rodzaj=None, kategoria=None, opis=None, kwota=None):
+        """Zmienia wskazane pola wiersza (None = bez zmian); KeyError, gdy wiersza nie ma."""
+        fields = {"data": date_to_ordinal(data) if data is not None else None,   # walidacja przed zmianą
+                  "rodzaj": rodzaj, "kategoria": kategoria, "opis": opis,
+                  "grosze": to_grosze(kwota) if kwota is not None else None}
+        fields = {name: value for name, value in fields.items() if value is not None}
+        if not fields:                                 # nic do zmiany
+            self.view(idx)                             # ale wiersz musi istnieć
+            return
+        old = self._tracked(idx)                       # stan przed zmianą (dla osi salda)
+        with self._write():
+            cur = self.conn.execute(f"UPDATE transactions SET {', '.join(f'{name} = ?' for name in fields)} WHERE idx = ?",
+                                    (*fields.values(), idx))
+        if not cur.rowcount:                           # usunięty wiersz?
+            raise KeyError(idx)
+        if old is not None:
+            self._retrack(old, self.view(idx))         # nowy stan
+
+    def remove(self, idx):
+        """Usuwa wiersz (brak wiersza = nic do zrobienia)."""
+        old = self._tracked(idx)                       # stan przed usunięciem (dla osi salda)
+        with self._write():
+            self.conn.execute("DELETE FROM transactions WHERE idx = ?", (idx,))
+        self._retrack(old, None)
+
+    def clear(self):
+        """Usuwa wszystkie wiersze."""
+        with self._write():
+            self.conn.execute("DELETE FROM transactions")
+        self._timelines.clear()                        # brak wierszy
+        self._frames.clear()
+
+    @contextmanager
+    def deferred_indexes(self):
+        """Wsad zmian w jednej transakcji SQL (jeden zapis WAL); błąd wycofuje cały wsad."""
+        self._begin()
+        self._batch += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch -= 1
+            if not self._batch:
+                self.conn.execute("ROLLBACK")          # nic z wsadu nie zostaje
+            self._timelines.clear()                    # osie mogły widzieć wycofane wiersze
+            self._period_cache.clear()                 # j.w. (sumy okresów)
+            self._frames.clear()                       # j.w. (ramki analityczne)
+            raise
+        self._batch -= 1
+        self._commit()
+
+    # --- ODCZYT ---
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def live_indices(self):
+        """Zwraca generator indeksów wierszy."""
+        return (row[0] for row in self.conn.execute("SELECT idx FROM transactions ORDER BY idx"))
+
+    def __iter__(self):
+        return (SqliteView(row) for row in self.conn.execute(f"SELECT {COLUMNS} FROM transactions ORDER BY idx"))
+
+    def view(self, idx) -> SqliteView:
+        """Zwraca widok wiersza o podanym indeksie (KeyError, gdy nie ma)."""
+        row = self.conn.execute(f"SELECT {COLUMNS} FROM transactions WHERE idx = ?", (idx,)).fetchone()
+        if row is None:
+            raise KeyError(idx)
+        return SqliteView(row)
+
+    def index_of(self, tid):
+        """Zwraca indeks wiersza o danym ID albo None."""
+        row = self.conn.execute("SELECT idx FROM transactions WHERE tid = ?", (tid,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _range(user, from_ord, to_ord):
+        """Warunek WHERE i parametry: użytkownik + opcjonalny zakres dat (indeks (user, data))."""
+        return ("user = ? AND data BETWEEN ? AND ?",
+                (user, -1 if from_ord is None else from_ord, 1 << 31 if to_ord is None else to_ord))
+
+    def user_indices(self, user, from_ord=None, to_ord=None):
+        """Zwraca indeksy wierszy użytkownika posortowane po dacie (opcjonalnie w zakresie dat)."""
+        where, params = self._range(user, from_ord, to_ord)
+        return [row[0] for row in self.conn.execute(
+            f"SELECT idx FROM transactions WHERE {where} ORDER BY data, idx", params)]
+
+    def for_user(self, user, from_ord=None, to_ord=None):
+        """Zwraca listę widoków wierszy użytkownika posortowanych po dacie."""
+        where, params = self._range(user, from_ord, to_ord)
+        return [SqliteView(row) for row in self.conn.execute(
+            f"SELECT {COLUMNS} FROM transactions WHERE {where} ORDER BY data, idx", params)]
+
+    def for_day(self, user, ordinal):
+        """Zwraca widoki wierszy użytkownika z jednego dnia (indeks (user, data))."""
+        return self.for_user(user, ordinal, ordinal)
+
+    def day_activity(self, user, from_ord, to_ord) -> dict:
+        """Zwraca {ordinal: (liczba transakcji, wydatki w groszach)} dla aktywnych dni w [od, do] (np. miesiąc)."""
+        return {ordinal: (count, spent) for ordinal, count, spent in self.conn.execute(
+            "SELECT data, COUNT(*), COALESCE(SUM(CASE WHEN rodzaj = ? THEN grosze END), 0) FROM transactions "
+            "WHERE user = ? AND data BETWEEN ? AND ? GROUP BY data", (EXPENSE, user, from_ord, to_ord))}  # indeks pokrywający
+
+    def balance_timeline(self, user) -> BalanceTimeline:
+        """Zwraca oś salda użytkownika (grosze); budowana raz z sum dni (indeks pokrywający), potem przyrostowo."""
+        timeline = self._timelines.get(user)
+        if timeline is None:
+            daily = {ordinal: (income, expense) for ordinal, income, expense in self.conn.execute(
+                "SELECT data, SUM(CASE WHEN rodzaj = ? THEN grosze ELSE 0 END),"
+                "       SUM(CASE WHEN rodzaj = ? THEN grosze ELSE 0 END) FROM transactions "
+                "WHERE user = ? GROUP BY data", (INCOME, EXPENSE, user))}
+            timeline = self._timelines[user] = BalanceTimeline(daily)
+        return timeline
+
+    def balance_as_of(self, user, ordinal) -> int:
+        """Zwraca saldo użytkownika (grosze) na koniec dnia 'ordinal'; O(log dni)."""
+        return self.balance_timeline(user).balance(ordinal)
+
+    def range_totals(self, user, from_ord, to_ord):
+        """Zwraca (przychody, wydatki) użytkownika w groszach w dniach [od, do]; O(log dni)."""
+        return self.balance_timeline(user).range_totals(from_ord, to_ord)
+
+    def user_names(self):
+        """Zwraca nazwy użytkowników, którzy mają wiersze (z indeksu (user, ...))."""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT user FROM transactions")]
+
+    def user_totals(self, user):
+        """Zwraca sumy użytkownika w zł: (przychody, wydatki, {kategoria: wydatki}, {'YYYY-MM': saldo})."""
+        income, expense = self.conn.execute(
+            "SELECT COALESCE(SUM(CASE WHEN rodzaj = ? THEN grosze END), 0),"
+            "       COALESCE(SUM(CASE WHEN rodzaj = ? THEN grosze END), 0) FROM transactions WHERE user = ?",
+            (INCOME, EXPENSE, user)).fetchone()
+        expenses_by_cat = {cat: from_grosze(total) for cat, total in self.conn.execute(
+            "SELECT kategoria, SUM(grosze) FROM transactions WHERE user = ? AND rodzaj = ? GROUP BY kategoria",
+            (user, EXPENSE))}                          # indeks (user, kategoria, ...)
+        month_net = {}                                 # numer miesiąca -> saldo (jak UserAggregates)
+        for ordinal, net in self.conn.execute(
+                "SELECT data, SUM(CASE WHEN rodzaj = ? THEN grosze ELSE -grosze END) FROM transactions "
+                "WHERE user = ? GROUP BY data", (INCOME, user)):  # dni po kolei z indeksu, bez sortowania
+            month = ordinal_to_month(ordinal)
+            month_net[month] = month_net.get(month, 0) + net
+        monthly = {month_label(m): from_grosze(g) for m, g in sorted(month_net.items())}  # O(miesięcy)
+        return from_grosze(income), from_grosze(expense), expenses_by_cat, monthly
+
+    def spent_in_period(self, user, kategoria, period, ordinal) -> int:
+        """Zwraca wydatki (grosze) kategorii usera w okresie zawierającym dzień 'ordinal' (indeks (user, kategoria, data))."""
+        if period == PERIOD_ALL:
+            row = self.conn.execute("SELECT SUM(grosze) FROM transactions WHERE user = ? AND kategoria = ? AND rodzaj = ?",
+                                    (user, kategoria, EXPENSE)).fetchone()
+        else:
+            start, end = period_bounds(period, ordinal)  # pierwszy i ostatni dzień okresu
+            row = self.conn.execute("SELECT SUM(grosze) FROM transactions WHERE user = ? AND kategoria = ? "
+                                    "AND data BETWEEN ? AND ? AND rodzaj = ?",
+                                    (user, kategoria, start, end, EXPENSE)).fetchone()
+        return row[0] or 0
+
+    def search(self, user, query, from_ord=None, to_ord=None, within=None) -> list:
+        """
+        Indeksy wierszy użytkownika (po dacie), których opis/kategoria zawiera słowa zaczynające się od
+        każdego słowa zapytania (FTS5, zapytania prefiksowe); opcjonalnie w zakresie dat i w obrębie 'within'.
+        """
+        tokens = search_tokens(query)                  # słowa zapytania (bez wielkości liter i ogonków)
+        if not tokens:
+            return self.user_indices(user, from_ord, to_ord)  # puste zapytanie = bez filtra tekstu
+        where, params = self._range(user, from_ord, to_ord)
+        match = " ".join(f'"{token}"*' for token in tokens)  # każdy token jako prefiks (AND)
+        found = [row[0] for row in self.conn.execute(
+            f"SELECT idx FROM transactions WHERE idx IN (SELECT rowid FROM tx_search WHERE tx_search MATCH ?) "
+            f"AND {where} ORDER BY data, idx", (match, *params))]
+        if within is not None:
+            within = set(within)
+            found = [idx for idx in found if idx in within]
+        return found
+
+    def analytics_frame(self, user):
+        """Transakcje użytkownika jako kolumny NumPy (budget_analytics) – jedno zapytanie, potem zmiany przyrostowo."""
+        frame = self._frames.get(user)
+        if frame is None:
+            from budget_analytics import AnalyticsFrame  # import odroczony (NumPy)
+            frame = self._frames[user] = AnalyticsFrame.from_rows(self.conn.execute(
+                "SELECT data, rodzaj, kategoria, grosze FROM transactions WHERE user = ? ORDER BY data",  # indeks (user, data)
+                (user,)))
+        return frame
+
+    def spent_by_category(self, user, period, ordinal) -> dict:
+        """
+        Zwraca {kategoria: grosze} wydatków usera w okresie (tydzień/miesiąc/kwartał/rok) zawierającym 'ordinal'.
+        Wynik jest pamiętany per (user, okres) do następnej zmiany w bazie.
+        """
+        start, end = period_bounds(period, ordinal)    # pierwszy i ostatni dzień okresu
+        key = (user, start, end)
+        cats = self._period_cache.get(key)
+        if cats is None:
+            cats = self._period_cache[key] = dict(self.conn.execute(
+                "SELECT kategoria, SUM(grosze) FROM transactions WHERE user = ? AND data BETWEEN ? AND ? "
+                "AND rodzaj = ? GROUP BY kategoria", (user, start, end, EXPENSE)))
+        return dict(cats)
+
+    # --- CSV ---
+    @timed("sqlite.load_csv")
+    def load_csv(self, f):
+        """Wczytuje wiersze z otwartego pliku CSV (nagłówek jak FIELDNAMES) w jednej transakcji."""
+        with self.deferred_indexes():
+            for row in csv.DictReader(f):              # strumieniowo, bez całości w RAM
+                self.append_row(row)
+
+# --- PIECZĘTOWANIE PLIKU ---
+def _sidecars(db_path):
+    """Pliki pomocnicze SQLite obok bazy (i kopia robocza odpieczętowania) – wszystkie jawne."""
+    return (db_path + "-wal", db_path + "-shm", db_path + ".tmp")
+
+def unseal(sealed_path, db_path, key):
+    """Odszyfrowuje zapieczętowaną bazę do jawnego pliku sesji (strumieniowo)."""
+    from budget_codec import decrypt_chunks            # import odroczony (cryptography)
+    tmp_path = db_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        for data in decrypt_chunks(sealed_path, key):  # kawałek po kawałku
+            f.write(data)
+    os.replace(tmp_path, db_path)                      # cały plik albo nic
+
+def seal(db_path, sealed_path, key):
+    """Szyfruje zamkniętą bazę do kontenera segmentowego i usuwa jawny plik oraz WAL/SHM."""
+    from budget_codec import encrypt_chunks, file_chunks  # import odroczony (cryptography)
+    encrypt_chunks(file_chunks(db_path), sealed_path, key)  # atomowo, przez .tmp
+    remove_database(db_path)                           # jawne dane tylko w trakcie sesji
+
+def remove_database(db_path, sealed_path=None):
+    """Usuwa jawną bazę z WAL/SHM (i opcjonalnie zapieczętowaną kopię)."""
+    for path in (db_path, *_sidecars(db_path), sealed_path):
+        if path is not None and os.path.exists(path):
+            os.remove(path)
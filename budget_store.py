@@ -0,0 +1,1021 @@
+# --- MAGAZYN TRANSAKCJI: KOLUMNOWY, KOMPAKTOWY (BEZ GUI) ---
+import csv                     # obsługa plików CSV
+import io                      # bufor tekstowy dla serializacji w kawałkach
+import math                    # kontrola skończoności kwot
+import re                      # podział tekstu na słowa (wyszukiwanie)
+import unicodedata             # zdejmowanie znaków diakrytycznych (wyszukiwanie)
+import uuid                    # losowe, trwałe ID transakcji
+from array import array        # zwarte tablice liczb (kolumny)
+from bisect import bisect_left, insort  # wyszukiwanie binarne w posortowanych kluczach
+from contextlib import contextmanager  # wsad z wstrzymanymi indeksami
+from datetime import date      # konwersja dat <-> ordinal
+
+from budget_diagnostics import timed, span     # punkty pomiarowe (wyłączone = bez kosztu)
+
+FIELDNAMES = ["user", "data", "rodzaj", "kategoria", "opis", "kwota"]  # kolumny danych transakcji
+STORE_FIELDNAMES = FIELDNAMES + ["id"]                                  # kolumny pliku magazynu (z ID)
+INCOME = "Przychód"            # rodzaj: przychód
+EXPENSE = "Wydatek"            # rodzaj: wydatek
+
+PERIOD_WEEK = "week"           # okres budżetu: tydzień (od poniedziałku)
+PERIOD_MONTH = "month"         # okres budżetu: miesiąc kalendarzowy
+PERIOD_QUARTER = "quarter"     # okres budżetu: kwartał kalendarzowy
+PERIOD_YEAR = "year"           # okres budżetu: rok kalendarzowy
+PERIOD_ALL = "all"             # okres budżetu: cała historia (dawne limity bez okresu)
+PERIODS = (PERIOD_WEEK, PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR, PERIOD_ALL)  # wszystkie okresy
+WORD_PATTERN = re.compile(r"[^\W_]+")  # słowo = litery/cyfry (podkreślenie i interpunkcja rozdzielają)
+MAX_GROSZE = 2 ** 63 - 1       # zakres kolumny kwot (int64, grosze)
+TIMELINE_SLACK_DAYS = 366      # zapas dni osi salda przed pierwszą i po ostatniej dacie (rzadsze przebudowy)
+
+# --- KONWERSJE WARTOŚCI ---
+def date_to_ordinal(date_str: str) -> int:
+    """Zamienia 'YYYY-MM-DD' na numer dnia (ordinal); ValueError przy błędnym formacie."""
+    return date.fromisoformat(date_str).toordinal()    # parsuj i zamień na int
+
+def ordinal_to_date(ordinal: int) -> str:
+    """Zamienia numer dnia (ordinal) na 'YYYY-MM-DD'."""
+    return date.fromordinal(ordinal).isoformat()       # int -> tekst ISO
+
+def to_grosze(kwota) -> int:
+    """Zamienia kwotę (float/str) na całkowitą liczbę groszy; ValueError poza zakresem int64."""
+    value = float(kwota)                               # tekst/liczba -> float
+    if not math.isfinite(value):                       # inf / nan?
+        raise ValueError(f"Niepoprawna kwota: {kwota!r}")
+    grosze = int(round(value * 100))                   # zaokrąglij do grosza
+    if abs(grosze) > MAX_GROSZE:                       # nie zmieści się w kolumnie
+        raise ValueError(f"Kwota poza zakresem: {kwota!r}")
+    return grosze
+
+def from_grosze(grosze: int) -> float:
+    """Zamienia grosze na kwotę w złotych (float)."""
+    return grosze / 100                                # grosze -> zł
+
+def new_tid() -> int:
+    """Losuje nowe 63-bitowe ID transakcji (mieści się w int64)."""
+    return uuid.uuid4().int >> 65                      # 128 bitów uuid -> 63 bity
+
+def format_tid(tid: int) -> str:
+    """Zamienia ID transakcji na tekst (16 znaków hex)."""
+    return f"{tid:016x}"                               # stała szerokość
+
+def parse_tid(text: str) -> int:
+    """Zamienia tekst hex na ID transakcji; ValueError przy błędnym formacie."""
+    return int(text, 16)                               # hex -> int
+
+def ordinal_to_month(ordinal: int) -> int:
+    """Zamienia numer dnia na numer miesiąca (rok*12 + miesiąc-1)."""
+    d = date.fromordinal(ordinal)                      # ordinal -> data
+    return d.year * 12 + d.month - 1                   # ciągła numeracja miesięcy
+
+def period_key(period: str, ordinal: int) -> int:
+    """Zwraca numer okresu (tydzień/miesiąc/kwartał/rok), do którego należy dzień; dla 'all' zawsze 0."""
+    if period == PERIOD_WEEK:
+        return (ordinal - 1) // 7                      # ordinal 1 (0001-01-01) to poniedziałek
+    if period == PERIOD_MONTH:
+        return ordinal_to_month(ordinal)               # rok*12 + miesiąc-1
+    if period == PERIOD_QUARTER:
+        return ordinal_to_month(ordinal) // 3          # rok*4 + kwartał-1
+    if period == PERIOD_YEAR:
+        return date.fromordinal(ordinal).year          # rok
+    return 0                                           # cała historia
+
+def period_bounds(period: str, ordinal: int):
+    """Zwraca (pierwszy, ostatni) dzień okresu zawierającego 'ordinal'; dla 'all' (None, None)."""
+    d = date.fromordinal(ordinal)                      # rok/miesiąc dnia
+    if period == PERIOD_WEEK:
+        start = ordinal - d.weekday()                  # poniedziałek
+        return start, start + 6
+    if period == PERIOD_MONTH:
+        start = d.replace(day=1).toordinal()           # pierwszy dzień miesiąca
+        end = date(d.year + d.month // 12, d.month % 12 + 1, 1).toordinal() - 1  # dzień przed następnym
+        return start, end
+    if period == PERIOD_QUARTER:
+        first = (d.month - 1) // 3 * 3 + 1            # pierwszy miesiąc kwartału
+        start = date(d.year, first, 1).toordinal()
+        end = date(d.year + (first + 3) // 13, (first + 2) % 12 + 1, 1).toordinal() - 1  # dzień przed następnym
+        return start, end
+    if period == PERIOD_YEAR:
+        return date(d.year, 1, 1).toordinal(), date(d.year, 12, 31).toordinal()
+    return None, None                                  # cała historia
+
+def month_label(month: int) -> str:
+    """Zamienia numer miesiąca (rok*12 + miesiąc-1) na 'YYYY-MM'."""
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"   # tekst jak t["data"][:7]
+
+def fold_text(text: str) -> str:
+    """Tekst do wyszukiwania: małe litery bez polskich znaków ('Żabka Łódź' -> 'zabka lodz')."""
+    text = text.casefold().replace("ł", "l")            # 'ł' nie rozkłada się w NFKD
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+def search_tokens(text: str) -> list:
+    """Słowa tekstu do indeksu/zapytania (po fold_text)."""
+    return WORD_PATTERN.findall(fold_text(text))
+
+# --- INTERNOWANIE NAPISÓW ---
+class StringPool:
+    """Słownik napisów: każdy unikalny tekst trzymany raz, w kolumnach tylko jego kod (int)."""
+    __slots__ = ("_codes", "_values")
+
+    def __init__(self):
+        self._codes = {}       # tekst -> kod
+        self._values = []      # kod -> tekst
+
+    def code(self, value: str) -> int:
+        """Zwraca kod tekstu (dodaje go do puli, jeśli nowy)."""
+        code = self._codes.get(value)                  # sprawdź, czy już jest
+        if code is None:                               # nowy tekst?
+            code = len(self._values)                   # kolejny wolny kod
+            self._codes[value] = code                  # zapamiętaj tekst -> kod
+            self._values.append(value)                 # zapamiętaj kod -> tekst
+        return code                                    # zwróć kod
+
+    def lookup(self, value: str):
+        """Zwraca kod tekstu albo None, gdy tekstu nie ma w puli (bez dodawania)."""
+        return self._codes.get(value)                  # tylko odczyt
+
+    def value(self, code: int) -> str:
+        """Zwraca tekst dla kodu."""
+        return self._values[code]                      # kod -> tekst
+
+    def __len__(self):
+        return len(self._values)                       # liczba unikalnych tekstów
+
+    def copy(self):
+        """Zwraca niezależną kopię puli."""
+        pool = StringPool()                            # nowa pula
+        pool._codes = dict(self._codes)                # kopia tekst -> kod
+        pool._values = list(self._values)              # kopia kod -> tekst
+        return pool
+
+# --- WIDOK WIERSZA ---
+class TransactionView:
+    """Lekki widok jednego wiersza magazynu; pola jak w dawnym dict (t["kwota"], t.kwota)."""
+    __slots__ = ("_store", "idx")
+
+    def __init__(self, store, idx):
+        self._store = store    # magazyn, do którego należy wiersz
+        self.idx = idx         # indeks wiersza w kolumnach
+
+    @property
+    def tid(self):
+        return self._store._tid[self.idx]                                   # trwałe ID transakcji
+
+    @property
+    def user(self):
+        return self._store.users.value(self._store._user[self.idx])        # nazwa użytkownika
+
+    @property
+    def ordinal(self):
+        return self._store._date[self.idx]                                  # data jako ordinal
+
+    @property
+    def data(self):
+        return ordinal_to_date(self._store._date[self.idx])                 # data 'YYYY-MM-DD'
+
+    @property
+    def rodzaj(self):
+        return self._store.kinds.value(self._store._kind[self.idx])         # Przychód/Wydatek
+
+    @property
+    def kategoria(self):
+        return self._store.categories.value(self._store._cat[self.idx])     # kategoria
+
+    @property
+    def opis(self):
+        return self._store.descriptions.value(self._store._desc[self.idx])  # opis
+
+    @property
+    def grosze(self):
+        return self._store._amount[self.idx]                                # kwota w groszach
+
+    @property
+    def kwota(self):
+        return from_grosze(self._store._amount[self.idx])                   # kwota w zł
+
+    def __getitem__(self, key):
+        if key not in FIELDNAMES:                  # tylko pola z CSV
+            raise KeyError(key)                    # nieznany klucz
+        return getattr(self, key)                  # t["kwota"] == t.kwota
+
+    def as_dict(self):
+        """Zwraca wiersz jako dict (jak w pliku CSV)."""
+        return {name: getattr(self, name) for name in FIELDNAMES}  # kopia pól
+
+    def __repr__(self):
+        return f"TransactionView({self.idx}, {self.as_dict()!r})"   # czytelny podgląd
+
+# --- INDEKSY POMOCNICZE ---
+class StoreIndex:
+    """Baza indeksu magazynu: add/remove wywoływane przy każdej zmianie wiersza."""
+
+    def add(self, store, idx):
+        """Uwzględnia aktywny wiersz idx."""
+        raise NotImplementedError
+
+    def remove(self, store, idx):
+        """Wycofuje wiersz idx (przed zmianą lub usunięciem)."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Zeruje stan indeksu."""
+        raise NotImplementedError
+
+    def rebuild(self, store):
+        """Buduje indeks od zera ze wszystkich aktywnych wierszy."""
+        self.clear()                                   # wyzeruj
+        for idx in store.live_indices():               # dodaj po kolei
+            self.add(store, idx)
+
+class UserDateIndex(StoreIndex):
+    """
+    Per-użytkownik posortowana tablica kluczy (ordinal << 32 | idx).
+    Zakres dat = dwa bisect + wycinek, bez parsowania dat.
+    """
+    _SHIFT = 32                  # bity na indeks wiersza
+    _MASK = (1 << 32) - 1        # maska indeksu wiersza
+
+    def __init__(self):
+        self._keys = {}          # kod użytkownika -> array('q') posortowanych kluczy
+
+    def _key(self, store, idx):
+        return (store._date[idx] << self._SHIFT) | idx     # klucz: data, potem kolejność dodania
+
+    def add(self, store, idx):
+        keys = self._keys.setdefault(store._user[idx], array('q'))  # klucze usera
+        key = self._key(store, idx)                        # klucz wiersza
+        if not keys or key > keys[-1]:                     # najczęstszy przypadek: najnowsza data
+            keys.append(key)                               # dopisz na końcu
+        else:
+            keys.insert(bisect_left(keys, key), key)       # wstaw w miejsce
+
+    def remove(self, store, idx):
+        keys = self._keys.get(store._user[idx])            # klucze usera
+        key = self._key(store, idx)                        # klucz wiersza
+        pos = bisect_left(keys, key)                       # pozycja klucza
+        if pos < len(keys) and keys[pos] == key:           # znaleziony?
+            del keys[pos]                                  # usuń
+
+    def clear(self):
+        self._keys.clear()                                 # brak kluczy
+
+    def rebuild(self, store):
+        self.clear()                                       # wyzeruj
+        per_user = {}                                      # kod usera -> lista kluczy
+        ucol, dcol, shift = store._user, store._date, self._SHIFT  # lokalne referencje
+        for idx in store.live_indices():                   # jeden przebieg
+            per_user.setdefault(ucol[idx], []).append((dcol[idx] << shift) | idx)
+        for ucode, keys in per_user.items():               # jedno sortowanie na usera
+            keys.sort()
+            self._keys[ucode] = array('q', keys)           # zwarta tablica
+
+    def user_codes(self):
+        """Zwraca kody użytkowników, którzy mają aktywne wiersze."""
+        return [code for code, keys in self._keys.items() if keys]
+
+    def indices(self, user_code, from_ord=None, to_ord=None):
+        """Zwraca indeksy wierszy usera posortowane po dacie, opcjonalnie w zakresie [od, do]."""
+        keys = self._keys.get(user_code)                   # klucze usera
+        if not keys:                                       # brak wierszy
+            return []
+        lo = 0 if from_ord is None else bisect_left(keys, from_ord << self._SHIFT)       # początek zakresu
+        hi = len(keys) if to_ord is None else bisect_left(keys, (to_ord + 1) << self._SHIFT)  # koniec zakresu
+        mask = self._MASK                                  # lokalna referencja
+        return [k & mask for k in keys[lo:hi]]             # wycinek -> indeksy wierszy
+
+class UserTotals:
+    """Sumy jednego użytkownika (w groszach) utrzymywane przyrostowo."""
+    __slots__ = ("income", "expense", "expense_by_cat", "month_net", "_cat_rows", "_month_rows")
+
+    def __init__(self):
+        self.income = 0            # suma przychodów
+        self.expense = 0           # suma wydatków
+        self.expense_by_cat = {}   # kod kategorii -> suma wydatków
+        self.month_net = {}        # numer miesiąca -> saldo (przychody - wydatki)
+        self._cat_rows = {}        # kod kategorii -> liczba wydatków (do usuwania pustych)
+        self._month_rows = {}      # numer miesiąca -> liczba wierszy (j.w.)
+
+    def _apply(self, is_income, is_expense, cat, month, grosze, sign):
+        """Dodaje (sign=1) albo odejmuje (sign=-1) jeden wiersz; O(1)."""
+        delta = sign * grosze                                      # zmiana sum
+        if is_income:
+            self.income += delta                                   # przychody
+        elif is_expense:
+            self.expense += delta                                  # wydatki
+            self.expense_by_cat[cat] = self.expense_by_cat.get(cat, 0) + delta  # suma kategorii
+            rows = self._cat_rows.get(cat, 0) + sign               # liczba wydatków kategorii
+            if rows:
+                self._cat_rows[cat] = rows
+            else:                                                  # ostatni wydatek zniknął
+                del self._cat_rows[cat]
+                del self.expense_by_cat[cat]
+        self.month_net[month] = self.month_net.get(month, 0) + (delta if is_income else -delta)  # saldo miesiąca
+        rows = self._month_rows.get(month, 0) + sign               # liczba wierszy miesiąca
+        if rows:
+            self._month_rows[month] = rows
+        else:                                                      # miesiąc bez wierszy
+            del self._month_rows[month]
+            del self.month_net[month]
+
+class BalanceTimeline:
+    """
+    Przychody i wydatki jednego użytkownika po dniach (grosze) jako dwa drzewa Fenwicka nad kolejnymi dniami
+    od 'base': saldo na dzień i sumy w zakresie dat w O(log dni), zmiana wiersza też w O(log dni).
+    Dzień spoza zakresu tablic powiększa je (przebudowa O(dni), zapas TIMELINE_SLACK_DAYS w obie strony).
+    """
+    __slots__ = ("base", "_income", "_expense", "_income_tree", "_expense_tree")
+
+    def __init__(self, daily=None):
+        """daily: {ordinal: (przychody, wydatki)} do zbudowania od razu (np. z zapytania GROUP BY)."""
+        self.base = 0                          # ordinal dnia o pozycji 0
+        self._income = array('q')              # przychody dnia (pozycja = ordinal - base)
+        self._expense = array('q')             # wydatki dnia
+        self._income_tree = array('q', [0])    # drzewo Fenwicka przychodów (od pozycji 1)
+        self._expense_tree = array('q', [0])   # drzewo Fenwicka wydatków
+        if daily:
+            self._resize(min(daily), max(daily))
+            for ordinal, (income, expense) in daily.items():
+                self._income[ordinal - self.base] += income
+                self._expense[ordinal - self.base] += expense
+            self._build()
+
+    def _resize(self, first, last):
+        """Rozszerza tablice dni tak, by obejmowały [first, last] z zapasem (bez przebudowy drzew)."""
+        if len(self._income):
+            first, last = min(first, self.base), max(last, self.base + len(self._income) - 1)
+        base = first - TIMELINE_SLACK_DAYS                              # zapas na wcześniejsze daty
+        size = last + TIMELINE_SLACK_DAYS - base + 1                    # i na późniejsze
+        shift = self.base - base if len(self._income) else 0
+        for name in ("_income", "_expense"):
+            old = getattr(self, name)
+            days = array('q', bytes(8 * size))                          # zera
+            days[shift:shift + len(old)] = old                          # stare dni na nowych pozycjach
+            setattr(self, name, days)
+        self.base = base
+
+    def _build(self):
+        """Buduje oba drzewa z tablic dni w O(dni)."""
+        for days, name in ((self._income, "_income_tree"), (self._expense, "_expense_tree")):
+            tree = array('q', [0])
+            tree.extend(days)                                           # liście na pozycjach 1..n
+            n = len(days)
+            for i in range(1, n + 1):
+                parent = i + (i & -i)                                   # węzeł obejmujący i
+                if parent <= n:
+                    tree[parent] += tree[i]
+            setattr(self, name, tree)
+
+    def add(self, ordinal, income, expense):
+        """Dolicza przychody/wydatki (grosze, także ujemne przy usuwaniu) do dnia; O(log dni)."""
+        pos = ordinal - self.base
+        if not 0 <= pos < len(self._income):
+            self._resize(ordinal, ordinal)                              # nowy zakres dni
+            self._build()
+            pos = ordinal - self.base
+        self._income[pos] += income
+        self._expense[pos] += expense
+        n, i = len(self._income), pos + 1
+        income_tree, expense_tree = self._income_tree, self._expense_tree
+        while i <= n:                                                   # węzły nad dniem
+            income_tree[i] += income
+            expense_tree[i] += expense
+            i += i & -i
+
+    def totals_through(self, ordinal):
+        """Zwraca (przychody, wydatki) od początku do dnia 'ordinal' włącznie; O(log dni)."""
+        i = min(ordinal - self.base + 1, len(self._income))             # liczba dni w sumie
+        income = expense = 0
+        income_tree, expense_tree = self._income_tree, self._expense_tree
+        while i > 0:
+            income += income_tree[i]
+            expense += expense_tree[i]
+            i -= i & -i
+        return income, expense
+
+    def balance(self, ordinal) -> int:
+        """Saldo (przychody - wydatki) na koniec dnia; O(log dni)."""
+        income, expense = self.totals_through(ordinal)
+        return income - expense
+
+    def range_totals(self, from_ord, to_ord):
+        """Zwraca (przychody, wydatki) w dniach [od, do]; dwa zapytania prefiksowe."""
+        income_to, expense_to = self.totals_through(to_ord)
+        income_before, expense_before = self.totals_through(from_ord - 1)
+        return income_to - income_before, expense_to - expense_before
+
+    def span(self):
+        """Zwraca (pierwszy, ostatni) dzień z ruchem albo None (zwykle szybko: zapas na brzegach jest mały)."""
+        income, expense = self._income, self._expense
+        first, last = 0, len(income) - 1
+        while first <= last and not (income[first] or expense[first]):  # od początku
+            first += 1
+        if first > last:
+            return None                                                 # brak ruchu
+        while not (income[last] or expense[last]):                      # od końca
+            last -= 1
+        return self.base + first, self.base + last
+
+    def daily_balance(self, from_ord, to_ord) -> list:
+        """Saldo na koniec każdego dnia [od, do] (grosze): jedno zapytanie prefiksowe + suma bieżąca."""
+        balance = self.balance(from_ord - 1)                            # stan przed zakresem
+        income, expense, base, size = self._income, self._expense, self.base, len(self._income)
+        series = []
+        for pos in range(from_ord - base, to_ord - base + 1):
+            if 0 <= pos < size:
+                balance += income[pos] - expense[pos]                   # ruch dnia
+            series.append(balance)
+        return series
+
+class UserAggregates(StoreIndex):
+    """Per-użytkownik sumy przychodów/wydatków, wydatki per kategoria i saldo per miesiąc."""
+
+    def __init__(self):
+        self._totals = {}          # kod użytkownika -> UserTotals
+
+    def _apply(self, store, idx, sign):
+        totals = self._totals.get(store._user[idx])                # sumy usera
+        if totals is None:
+            totals = self._totals[store._user[idx]] = UserTotals() # pierwszy wiersz usera
+        rodzaj = store.kinds.value(store._kind[idx])               # rodzaj wiersza
+        totals._apply(rodzaj == INCOME, rodzaj == EXPENSE, store._cat[idx],
+                      ordinal_to_month(store._date[idx]), store._amount[idx], sign)
+
+    def add(self, store, idx):
+        self._apply(store, idx, 1)                                 # dolicz wiersz
+
+    def remove(self, store, idx):
+        self._apply(store, idx, -1)                                # odlicz wiersz
+
+    def clear(self):
+        self._totals.clear()                                       # brak sum
+
+    def totals(self, user_code):
+        """Zwraca UserTotals użytkownika (puste, gdy brak wierszy)."""
+        return self._totals.get(user_code) or UserTotals()         # nigdy None
+
+class PeriodSpend(StoreIndex):
+    """Bieżące sumy wydatków per (użytkownik, okres) -> kategoria dla tygodni, miesięcy, kwartałów i lat."""
+    KINDS = (PERIOD_WEEK, PERIOD_MONTH, PERIOD_QUARTER, PERIOD_YEAR)  # okresy liczone tutaj ('all' jest w UserAggregates)
+
+    def __init__(self):
+        self._spent = {kind: {} for kind in self.KINDS}  # okres -> {(user, numer): {kat: grosze}}
+
+    def _apply(self, store, idx, sign):
+        if store.kinds.value(store._kind[idx]) != EXPENSE:  # tylko wydatki
+            return
+        ucode, ccode, ordinal = store._user[idx], store._cat[idx], store._date[idx]  # pola wiersza
+        delta = sign * store._amount[idx]                   # zmiana sumy
+        for kind in self.KINDS:                             # cztery liczniki na wiersz
+            spent = self._spent[kind]
+            key = (ucode, period_key(kind, ordinal))
+            cats = spent.get(key)
+            if cats is None:
+                cats = spent[key] = {}                      # pierwszy wydatek w okresie
+            total = cats.get(ccode, 0) + delta
+            if total:
+                cats[ccode] = total
+            else:
+                cats.pop(ccode, None)                       # zero -> bez wpisu
+                if not cats:
+                    del spent[key]                          # okres bez wydatków
+
+    def add(self, store, idx):
+        self._apply(store, idx, 1)                          # dolicz wydatek
+
+    def remove(self, store, idx):
+        self._apply(store, idx, -1)                         # odlicz wydatek
+
+    def clear(self):
+        for spent in self._spent.values():
+            spent.clear()                                   # brak sum
+
+    def spent(self, period, user_code, cat_code, key) -> int:
+        """Zwraca sumę wydatków (grosze) kategorii w danym okresie."""
+        return self._spent[period].get((user_code, key), {}).get(cat_code, 0)  # O(1)
+
+    def by_category(self, period, user_code, key) -> dict:
+        """Zwraca {kod kategorii: grosze} wydatków w danym okresie (kopia)."""
+        return dict(self._spent[period].get((user_code, key), {}))  # O(kategorii okresu)
+
+class BalanceIndex(StoreIndex):
+    """Per-użytkownik oś salda (BalanceTimeline) – przyrostowo przy każdej zmianie wiersza."""
+
+    def __init__(self):
+        self._timelines = {}       # kod użytkownika -> BalanceTimeline
+
+    def _apply(self, store, idx, sign):
+        timeline = self._timelines.get(store._user[idx])
+        if timeline is None:
+            timeline = self._timelines[store._user[idx]] = BalanceTimeline()  # pierwszy wiersz usera
+        rodzaj = store.kinds.value(store._kind[idx])               # rodzaj wiersza
+        grosze = sign * store._amount[idx]
+        if rodzaj == INCOME:
+            timeline.add(store._date[idx], grosze, 0)
+        elif rodzaj == EXPENSE:
+            timeline.add(store._date[idx], 0, grosze)
+
+    def add(self, store, idx):
+        self._apply(store, idx, 1)                                 # dolicz wiersz
+
+    def remove(self, store, idx):
+        self._apply(store, idx, -1)                                # odlicz wiersz
+
+    def clear(self):
+        self._timelines.clear()
+
+    def rebuild(self, store):
+        self.clear()                                               # wyzeruj
+        ucol, dcol, kcol, acol = store._user, store._date, store._kind, store._amount  # lokalne referencje
+        income, expense = store.kinds.lookup(INCOME), store.kinds.lookup(EXPENSE)  # kody rodzajów
+        per_user = {}                                              # kod usera -> {ordinal: [przychody, wydatki]}
+        for idx in store.live_indices():                           # jeden przebieg
+            kind = kcol[idx]
+            if kind != income and kind != expense:
+                continue
+            days = per_user.setdefault(ucol[idx], {})
+            day = days.get(dcol[idx])
+            if day is None:
+                day = days[dcol[idx]] = [0, 0]
+            day[kind == expense] += acol[idx]
+        for ucode, days in per_user.items():                       # jedno budowanie drzew na usera
+            self._timelines[ucode] = BalanceTimeline(days)
+
+    def timeline(self, user_code):
+        """Zwraca oś salda użytkownika (pustą, gdy brak wierszy)."""
+        return self._timelines.get(user_code) or BalanceTimeline()
+
+class DayIndex(StoreIndex):
+    """Per-użytkownik słownik dzień -> wiersze tego dnia i suma wydatków (dzień w kalendarzu bez wyszukiwania)."""
+
+    def __init__(self):
+        self._rows = {}            # kod użytkownika -> {ordinal: [indeksy wierszy w kolejności dodania]}
+        self._spent = {}           # kod użytkownika -> {ordinal: wydatki dnia w groszach}
+
+    def add(self, store, idx):
+        ucode, ordinal = store._user[idx], store._date[idx]        # klucz wiersza
+        rows = self._rows.setdefault(ucode, {})
+        day = rows.get(ordinal)
+        if day is None:
+            rows[ordinal] = [idx]                                  # pierwszy wiersz dnia
+        elif idx > day[-1]:
+            day.append(idx)                                        # zwykle najnowszy wiersz
+        else:
+            day.insert(bisect_left(day, idx), idx)                 # edycja starszego wiersza
+        if store.kinds.value(store._kind[idx]) == EXPENSE:
+            spent = self._spent.setdefault(ucode, {})
+            spent[ordinal] = spent.get(ordinal, 0) + store._amount[idx]  # suma wydatków dnia
+
+    def remove(self, store, idx):
+        ucode, ordinal = store._user[idx], store._date[idx]
+        rows = self._rows[ucode]
+        day = rows[ordinal]
+        day.remove(idx)                                            # kilka wierszy na dzień
+        spent = self._spent.get(ucode, {})
+        if not day:
+            del rows[ordinal]                                      # dzień bez wierszy
+            spent.pop(ordinal, None)                               # razem z sumą wydatków
+        elif store.kinds.value(store._kind[idx]) == EXPENSE:
+            spent[ordinal] -= store._amount[idx]                   # odlicz wydatek
+
+    def clear(self):
+        self._rows.clear()
+        self._spent.clear()
+
+    def rebuild(self, store):
+        self.clear()                                               # wyzeruj
+        ucol, dcol, kcol, acol = store._user, store._date, store._kind, store._amount  # lokalne referencje
+        expense = store.kinds.lookup(EXPENSE)                      # kod rodzaju 'Wydatek' (None = brak wydatków)
+        rows_of, spent_of = self._rows, self._spent
+        for idx in store.live_indices():                           # jeden przebieg, indeksy rosnąco
+            ucode, ordinal = ucol[idx], dcol[idx]
+            rows = rows_of.get(ucode)
+            if rows is None:
+                rows = rows_of[ucode] = {}
+                spent_of[ucode] = {}
+            day = rows.get(ordinal)
+            if day is None:
+                rows[ordinal] = [idx]
+            else:
+                day.append(idx)
+            if kcol[idx] == expense:
+                spent = spent_of[ucode]
+                spent[ordinal] = spent.get(ordinal, 0) + acol[idx]
+
+    def day(self, user_code, ordinal):
+        """Zwraca indeksy wierszy użytkownika z danego dnia; O(1)."""
+        return list(self._rows.get(user_code, {}).get(ordinal, ()))
+
+    def activity(self, user_code, from_ord, to_ord) -> dict:
+        """Zwraca {ordinal: (liczba wierszy, wydatki w groszach)} dla dni z wierszami w [od, do]; O(liczby dni)."""
+        rows, spent = self._rows.get(user_code, {}), self._spent.get(user_code, {})
+        return {d: (len(rows[d]), spent.get(d, 0)) for d in range(from_ord, to_ord + 1) if d in rows}
+
+class AnalyticsIndex(StoreIndex):
+    """
+    Ramki NumPy użytkowników (budget_analytics.AnalyticsFrame) budowane przy pierwszym zapytaniu
+    wektorowo z kolumn magazynu; późniejsze zmiany wierszy trafiają do listy zmian ramki (O(1)),
+    a ramka budowana jest od nowa dopiero, gdy ta lista urośnie (AnalyticsFrame.stale) albo po wsadzie.
+    """
+
+    def __init__(self):
+        self._frames = {}        # kod użytkownika -> AnalyticsFrame
+
+    def _apply(self, store, idx, sign):
+        ucode = store._user[idx]
+        frame = self._frames.get(ucode)
+        if frame is None:
+            return                                     # ramka jeszcze niezbudowana
+        frame.apply(store._date[idx], store.kinds.value(store._kind[idx]),
+                    store.categories.value(store._cat[idx]), store._amount[idx], sign)
+        if frame.stale:
+            del self._frames[ucode]                    # za dużo zmian – zbuduj od nowa przy zapytaniu
+
+    def add(self, store, idx):
+        self._apply(store, idx, 1)                     # dolicz wiersz
+
+    def remove(self, store, idx):
+        self._apply(store, idx, -1)                    # odlicz wiersz
+
+    def clear(self):
+        self._frames.clear()
+
+    def rebuild(self, store):
+        self._frames.clear()                           # leniwie – dopiero przy zapytaniu
+
+    def frame(self, store, ucode):
+        """Ramka użytkownika (z pamięci albo zbudowana teraz jednym przebiegiem po kolumnach)."""
+        frame = self._frames.get(ucode)
+        if frame is None:
+            from budget_analytics import AnalyticsFrame  # import odroczony (NumPy)
+            kinds, cats = store.kinds, store.categories
+            frame = self._frames[ucode] = AnalyticsFrame.from_columns(
+                store._user, store._date, store._kind, store._cat, store._amount, store._alive, ucode,
+                [kinds.value(c) for c in range(len(kinds))], [cats.value(c) for c in range(len(cats))])
+        return frame
+
+class TextIndex(StoreIndex):
+    """
+    Indeks odwrócony słów opisu i kategorii: słowo -> zbiór wierszy, plus posortowana lista słów,
+    więc prefiks to bisect + kolejne słowa z tym początkiem. Słowa liczone raz na parę (opis, kategoria) z pul napisów.
+    """
+
+    def __init__(self):
+        self._postings = {}        # słowo -> set(indeksów wierszy)
+        self._words = []           # posortowane słowa (wyszukiwanie prefiksów)
+        self._row_words = {}       # (kod opisu, kod kategorii) -> frozenset słów (pamięć tokenizacji)
+
+    def words_of(self, store, idx) -> frozenset:
+        """Słowa wiersza (opis + kategoria), tokenizowane raz na parę kodów."""
+        key = (store._desc[idx], store._cat[idx])
+        words = self._row_words.get(key)
+        if words is None:
+            words = self._row_words[key] = frozenset(
+                search_tokens(store.descriptions.value(key[0])) + search_tokens(store.categories.value(key[1])))
+        return words
+
+    def add(self, store, idx):
+        for word in self.words_of(store, idx):
+            rows = self._postings.get(word)
+            if rows is None:
+                rows = self._postings[word] = set()
+                insort(self._words, word)                          # nowe słowo na swoje miejsce
+            rows.add(idx)
+
+    def remove(self, store, idx):
+        for word in self.words_of(store, idx):
+            rows = self._postings[word]
+            rows.discard(idx)
+            if not rows:                                           # słowo bez wierszy
+                del self._postings[word]
+                del self._words[bisect_left(self._words, word)]
+
+    def clear(self):
+        self._postings.clear()
+        self._words.clear()
+
+    def rebuild(self, store):
+        self.clear()                                               # wyzeruj
+        postings = self._postings
+        for idx in store.live_indices():                           # jeden przebieg
+            for word in self.words_of(store, idx):
+                rows = postings.get(word)
+                if rows is None:
+                    rows = postings[word] = set()
+                rows.add(idx)
+        self._words = sorted(postings)                             # jedno sortowanie
+
+    def prefixed(self, prefix):
+        """Słowa zaczynające się od 'prefix' (bisect + kolejne słowa)."""
+        words = self._words
+        pos = bisect_left(words, prefix)
+        while pos < len(words) and words[pos].startswith(prefix):
+            yield words[pos]
+            pos += 1
+
+    def matches(self, tokens, within=None) -> set:
+        """
+        Wiersze, w których każdy token jest początkiem któregoś słowa: dla tokenu suma list wierszy słów
+        z tym prefiksem, potem przecięcie (od najmniejszego zbioru); 'within' (poprzedni wynik) zawęża od razu.
+        """
+        found = []
+        for token in set(tokens):
+            rows = set()
+            for word in self.prefixed(token):
+                rows |= self._postings[word]                       # suma list wierszy (w C)
+            found.append(rows)
+        found.sort(key=len)                                        # najmniejszy zbiór najpierw
+        result = found[0]
+        if within is not None:
+            result = result.intersection(within)
+        for rows in found[1:]:
+            result &= rows                                         # przecięcie (w C)
+        return result
+
+# --- MAGAZYN ---
+class TransactionStore:
+    """
+    Kolumnowy magazyn transakcji: data jako ordinal (int32), kwota w groszach (int64),
+    użytkownik/rodzaj/kategoria/opis jako kody z pul napisów. Usunięcie = znacznik (tombstone).
+    Indeksy pomocnicze (StoreIndex) rejestrowane przez add_index() dostają add/remove przy każdej zmianie.
+    """
+
+    def __init__(self):
+        self.users = StringPool()          # pula nazw użytkowników
+        self.kinds = StringPool()          # pula rodzajów (Przychód/Wydatek)
+        self.categories = StringPool()     # pula kategorii
+        self.descriptions = StringPool()   # pula opisów
+        self._user = array('I')            # kolumna: kod użytkownika
+        self._date = array('i')            # kolumna: data (ordinal)
+        self._kind = array('B')            # kolumna: kod rodzaju
+        self._cat = array('I')             # kolumna: kod kategorii
+        self._desc = array('I')            # kolumna: kod opisu
+        self._amount = array('q')          # kolumna: kwota w groszach
+        self._tid = array('q')             # kolumna: trwałe ID transakcji
+        self._alive = bytearray()          # kolumna: 1 = wiersz aktywny, 0 = usunięty
+        self._live = 0                     # liczba aktywnych wierszy
+        self._by_id = {}                   # ID transakcji -> indeks wiersza
+        self._indexes = []                 # zarejestrowane indeksy pomocnicze
+        self.by_date = self.add_index(UserDateIndex())  # indeks: user -> wiersze po dacie
+        self.aggregates = self.add_index(UserAggregates())  # sumy: user -> przychody/wydatki/kategorie/miesiące
+        self.period_spend = self.add_index(PeriodSpend())   # wydatki: (user, kategoria, tydzień/miesiąc/rok)
+        self.by_day = self.add_index(DayIndex())            # dzień -> wiersze i wydatki (kalendarz)
+        self.balances = self.add_index(BalanceIndex())      # oś salda: saldo na dzień, sumy w zakresie dat
+        self.text = self.add_index(TextIndex())             # słowa opisu i kategorii (wyszukiwanie)
+        self.analytics = self.add_index(AnalyticsIndex())   # ramki NumPy do zestawień krzyżowych
+
+    # --- INDEKSY ---
+    def add_index(self, index):
+        """Rejestruje indeks pomocniczy i wypełnia go istniejącymi wierszami."""
+        self._indexes.append(index)                    # zapamiętaj indeks
+        index.rebuild(self)                            # wypełnij aktywnymi wierszami
+        return index                                   # zwróć dla wygody
+
+    # --- ZAPIS / MODYFIKACJA ---
+    def append(self, user, data, rodzaj, kategoria, opis, kwota, tid=None) -> int:
+        """Dodaje wiersz (data jako 'YYYY-MM-DD', kwota w zł, tid=None -> nowe ID); zwraca indeks wiersza."""
+        ordinal = date_to_ordinal(data)                # najpierw walidacja daty
+        grosze = to_grosze(kwota)                      # i kwoty
+        if tid is None:                                # nowa transakcja?
+            tid = new_tid()                            # wylosuj ID
+        elif tid in self._by_id:                       # ID musi być unikalne
+            raise ValueError(f"Duplikat ID transakcji: {format_tid(tid)}")
+        row = (self.users.code(user), ordinal, self.kinds.code(rodzaj),
+               self.categories.code(kategoria), self.descriptions.code(opis), grosze)  # cały wiersz przed zapisem
+        idx = len(self._alive)                         # indeks nowego wiersza
+        for column, value in zip((self._user, self._date, self._kind, self._cat, self._desc, self._amount), row):
+            column.append(value)                       # kolumny rosną razem
+        self._tid.append(tid)                          # ID
+        self._alive.append(1)                          # aktywny
+        self._live += 1                                # licznik aktywnych
+        self._by_id[tid] = idx                         # ID -> wiersz
+        for index in self._indexes:                    # powiadom indeksy
+            index.add(self, idx)
+        return idx                                     # zwróć indeks
+
+    def append_row(self, row, tid=None) -> int:
+        """Dodaje wiersz z dict (np. z csv.DictReader); ID z argumentu albo z pola 'id'."""
+        if tid is None and row.get("id"):              # plik z ID?
+            tid = parse_tid(row["id"])                 # użyj zapisanego ID
+        return self.append(row["user"], row["data"], row["rodzaj"],
+                           row["kategoria"], row["opis"], row["kwota"], tid)  # rozpakuj pola
+
+    def update(self, idx, data=None, rodzaj=None, kategoria=None, opis=None, kwota=None):
+        """Zmienia wskazane pola aktywnego wiersza (None = bez zmian)."""
+        if not self._alive[idx]:                       # usunięty wiersz?
+            raise KeyError(idx)                        # nie ma czego edytować
+        ordinal = date_to_ordinal(data) if data is not None else None  # walidacja przed zmianą
+        grosze = to_grosze(kwota) if kwota is not None else None       # j.w.
+        for index in self._indexes:                    # wycofaj stary stan z indeksów
+            index.remove(self, idx)
+        if ordinal is not None:
+            self._date[idx] = ordinal                  # nowa data
+        if rodzaj is not None:
+            self._kind[idx] = self.kinds.code(rodzaj)  # nowy rodzaj
+        if kategoria is not None:
+            self._cat[idx] = self.categories.code(kategoria)  # nowa kategoria
+        if opis is not None:
+            self._desc[idx] = self.descriptions.code(opis)    # nowy opis
+        if grosze is not None:
+            self._amount[idx] = grosze                 # nowa kwota
+        for index in self._indexes:                    # wprowadź nowy stan do indeksów
+            index.add(self, idx)
+
+    def remove(self, idx):
+        """Usuwa wiersz (znacznik w kolumnie _alive, bez przesuwania danych)."""
+        if not self._alive[idx]:                       # już usunięty?
+            return                                     # nic do zrobienia
+        for index in self._indexes:                    # wycofaj z indeksów
+            index.remove(self, idx)
+        self._alive[idx] = 0                           # oznacz jako usunięty
+        self._live -= 1                                # licznik aktywnych
+        del self._by_id[self._tid[idx]]                # ID już nieaktywne
+
+    def clear(self):
+        """Usuwa wszystkie wiersze i czyści indeksy (pule napisów zostają)."""
+        for column in (self._user, self._date, self._kind, self._cat, self._desc, self._amount, self._tid):
+            del column[:]                              # wyczyść kolumny
+        self._alive.clear()                            # wyczyść znaczniki
+        self._live = 0                                 # brak wierszy
+        self._by_id.clear()                            # brak ID
+        for index in self._indexes:                    # wyzeruj indeksy
+            index.clear()
+
+    # --- ODCZYT ---
+    def __len__(self):
+        return self._live                              # liczba aktywnych wierszy
+
+    def live_indices(self):
+        """Zwraca generator indeksów aktywnych wierszy."""
+        alive = self._alive                            # lokalna referencja (szybciej)
+        return (i for i in range(len(alive)) if alive[i])  # tylko aktywne
+
+    def __iter__(self):
+        return (TransactionView(self, i) for i in self.live_indices())  # widoki wierszy
+
+    def view(self, idx) -> TransactionView:
+        """Zwraca widok wiersza o podanym indeksie."""
+        return TransactionView(self, idx)              # lekki obiekt
+
+    def index_of(self, tid):
+        """Zwraca indeks aktywnego wiersza o danym ID albo None."""
+        return self._by_id.get(tid)                    # słownik: O(1)
+
+    def user_indices(self, user, from_ord=None, to_ord=None):
+        """Zwraca indeksy wierszy użytkownika posortowane po dacie (opcjonalnie w zakresie dat)."""
+        code = self.users.lookup(user)                 # kod użytkownika (bez dodawania)
+        if code is None:                               # nieznany użytkownik
+            return []                                  # brak wierszy
+        return self.by_date.indices(code, from_ord, to_ord)  # dwa bisect + wycinek
+
+    def for_user(self, user, from_ord=None, to_ord=None):
+        """Zwraca listę widoków wierszy użytkownika posortowanych po dacie."""
+        return [TransactionView(self, i) for i in self.user_indices(user, from_ord, to_ord)]  # widoki
+
+    def for_day(self, user, ordinal):
+        """Zwraca widoki wierszy użytkownika z jednego dnia (słownik dni, bez wyszukiwania)."""
+        code = self.users.lookup(user)                 # kod użytkownika
+        if code is None:
+            return []
+        return [TransactionView(self, i) for i in self.by_day.day(code, ordinal)]
+
+    def day_activity(self, user, from_ord, to_ord) -> dict:
+        """Zwraca {ordinal: (liczba transakcji, wydatki w groszach)} dla aktywnych dni w [od, do] (np. miesiąc)."""
+        code = self.users.lookup(user)                 # kod użytkownika
+        if code is None:
+            return {}
+        return self.by_day.activity(code, from_ord, to_ord)
+
+    def balance_timeline(self, user) -> BalanceTimeline:
+        """Zwraca oś salda użytkownika (grosze): balance, range_totals, daily_balance, span w O(log dni)."""
+        return self.balances.timeline(self.users.lookup(user))
+
+    def balance_as_of(self, user, ordinal) -> int:
+        """Zwraca saldo użytkownika (grosze) na koniec dnia 'ordinal'; O(log dni)."""
+        return self.balance_timeline(user).balance(ordinal)
+
+    def range_totals(self, user, from_ord, to_ord):
+        """Zwraca (przychody, wydatki) użytkownika w groszach w dniach [od, do]; O(log dni)."""
+        return self.balance_timeline(user).range_totals(from_ord, to_ord)
+
+    def user_names(self):
+        """Zwraca nazwy użytkowników, którzy mają aktywne wiersze."""
+        return [self.users.value(code) for code in self.by_date.user_codes()]
+
+    def user_totals(self, user):
+        """Zwraca sumy użytkownika w zł: (przychody, wydatki, {kategoria: wydatki}, {'YYYY-MM': saldo})."""
+        code = self.users.lookup(user)                 # kod użytkownika
+        totals = self.aggregates.totals(code)          # sumy w groszach (O(1))
+        cats = self.categories.value                   # kod -> nazwa kategorii
+        expenses_by_cat = {cats(c): from_grosze(g) for c, g in totals.expense_by_cat.items()}  # O(kategorii)
+        monthly = {month_label(m): from_grosze(g) for m, g in sorted(totals.month_net.items())}  # O(miesięcy)
+        return from_grosze(totals.income), from_grosze(totals.expense), expenses_by_cat, monthly
+
+    def spent_in_period(self, user, kategoria, period, ordinal) -> int:
+        """Zwraca wydatki (grosze) kategorii usera w okresie zawierającym dzień 'ordinal'; O(1)."""
+        ucode, ccode = self.users.lookup(user), self.categories.lookup(kategoria)  # kody (bez dodawania)
+        if ucode is None or ccode is None:             # nieznany user/kategoria
+            return 0
+        if period == PERIOD_ALL:
+            return self.aggregates.totals(ucode).expense_by_cat.get(ccode, 0)  # cała historia
+        return self.period_spend.spent(period, ucode, ccode, period_key(period, ordinal))
+
+    def search(self, user, query, from_ord=None, to_ord=None, within=None) -> list:
+        """
+        Indeksy wierszy użytkownika (po dacie), których opis/kategoria zawiera słowa zaczynające się od
+        każdego słowa zapytania; opcjonalnie w zakresie dat i w obrębie 'within' (poprzedni wynik).
+        """
+        tokens = search_tokens(query)                  # słowa zapytania (bez wielkości liter i ogonków)
+        if not tokens:
+            return self.user_indices(user, from_ord, to_ord)  # puste zapytanie = bez filtra tekstu
+        ucode = self.users.lookup(user)
+        if ucode is None:
+            return []
+        found = self.text.matches(tokens, within)      # zbiory wierszy, operacje na zbiorach w C
+        ucol, dcol = self._user, self._date
+        if len(self.users) > 1:                        # shard jednego użytkownika – bez sprawdzania
+            found = [i for i in found if ucol[i] == ucode]
+        if from_ord is not None or to_ord is not None:
+            lo = -1 if from_ord is None else from_ord
+            hi = 1 << 31 if to_ord is None else to_ord
+            found = [i for i in found if lo <= dcol[i] <= hi]
+        return sorted(sorted(found), key=dcol.__getitem__)  # jak user_indices: data, potem kolejność dodania
+
+    def analytics_frame(self, user):
+        """Transakcje użytkownika jako kolumny NumPy (budget_analytics) – budowane raz, potem przyrostowo."""
+        from budget_analytics import AnalyticsFrame    # import odroczony (NumPy)
+        ucode = self.users.lookup(user)
+        if ucode is None:
+            return AnalyticsFrame.from_rows([])        # pusta ramka
+        return self.analytics.frame(self, ucode)
+
+    def spent_by_category(self, user, period, ordinal) -> dict:
+        """Zwraca {kategoria: grosze} wydatków usera w okresie (tydzień/miesiąc/kwartał/rok) zawierającym 'ordinal'."""
+        ucode = self.users.lookup(user)                # kod użytkownika
+        if ucode is None:
+            return {}
+        cats = self.categories.value                   # kod -> nazwa kategorii
+        return {cats(c): g for c, g in self.period_spend.by_category(period, ucode, period_key(period, ordinal)).items()}
+
+    @contextmanager
+    def deferred_indexes(self):
+        """Wsad zmian bez powiadamiania indeksów; na końcu (także po błędzie) jedna przebudowa zamiast N wstawień."""
+        indexes, self._indexes = self._indexes, []     # wstrzymaj powiadamianie indeksów
+        try:
+            yield self
+        finally:
+            self._indexes = indexes                    # przywróć indeksy
+            for index in indexes:                      # przebuduj z aktywnych wierszy
+                with span(f"store.rebuild.{type(index).__name__}"):
+                    index.rebuild(self)
+
+    # --- CSV ---
+    @timed("store.load_csv")
+    def load_csv(self, f):
+        """Wczytuje wiersze z otwartego pliku CSV (nagłówek jak FIELDNAMES); indeksy budowane raz na końcu."""
+        with self.deferred_indexes():                  # bez N wstawień do indeksów
+            for row in csv.DictReader(f):              # iteruj wiersze
+                self.append_row(row)                   # dodaj do kolumn
+
+    def _csv_rows(self, user=None):
+        """Zwraca generator wierszy CSV (krotki tekstów) aktywnych transakcji (albo tylko użytkownika), od nagłówka."""
+        yield STORE_FIELDNAMES                         # nagłówek
+        users, kinds = self.users.value, self.kinds.value            # lokalne referencje
+        cats, descs = self.categories.value, self.descriptions.value  # j.w.
+        for i in self.live_indices() if user is None else self.user_indices(user):  # aktywne wiersze
+            yield (users(self._user[i]), ordinal_to_date(self._date[i]),
+                   kinds(self._kind[i]), cats(self._cat[i]), descs(self._desc[i]),
+                   f"{from_grosze(self._amount[i]):.2f}", format_tid(self._tid[i]))  # wiersz jak w CSV
+
+    def write_csv(self, f):
+        """Zapisuje aktywne wiersze (z kolumną 'id') do otwartego pliku CSV."""
+        csv.writer(f).writerows(self._csv_rows())      # nagłówek + wiersze
+
+    def iter_csv_bytes(self, chunk_size, user=None):
+        """Zwraca generator kawałków CSV w UTF-8 (ok. chunk_size znaków) – bez budowania całości w pamięci."""
+        buf = io.StringIO(newline='')                  # bufor jednego kawałka
+        writer = csv.writer(buf)                       # pisarz CSV do bufora
+        for row in self._csv_rows(user):
+            writer.writerow(row)                       # dopisz wiersz
+            if buf.tell() >= chunk_size:               # kawałek pełny?
+                yield buf.getvalue().encode('utf-8')   # oddaj bajty
+                buf.seek(0)
+                buf.truncate()                         # zacznij nowy kawałek
+        if buf.tell():
+            yield buf.getvalue().encode('utf-8')       # reszta
+
+    def snapshot(self):
+        """Zwraca niezależną kopię kolumn (bez indeksów) do zapisu w innym wątku."""
+        snap = TransactionStore.__new__(TransactionStore)  # bez __init__ (bez indeksów)
+        for name in ("users", "kinds", "categories", "descriptions"):
+            setattr(snap, name, getattr(self, name).copy())  # kopie pul napisów
+        for name in ("_user", "_date", "_kind", "_cat", "_desc", "_amount", "_tid", "_alive"):
+            setattr(snap, name, getattr(self, name)[:])      # kopie kolumn (memcpy)
+        snap._live = self._live                        # liczba aktywnych
+        snap._by_id = {}                               # niepotrzebne przy zapisie
+        snap._indexes = []                             # kopia bez indeksów
+        return snap                                    # gotowa do write_csv()
+
+    # --- PAMIĘĆ ---
+    def nbytes(self) -> int:
+        """Przybliżony rozmiar kolumn w bajtach (bez pul napisów)."""
+        columns = (self._user, self._date, self._kind, self._cat, self._desc, self._amount, self._tid)
+        return sum(c.itemsize * len(c) for c in columns) + len(self._alive)  # bajty danych